@@ -0,0 +1,231 @@
+"""
+Headless command-line runner for the Execute and research pipelines, without Qt.
+
+Examples:
+    python cli.py execute --config execute.json --input papers/ --jobs 4 --output drafts.json
+    python cli.py research --config research.json --opml journals.opml --output suggestions.json
+
+The config is a JSON file with the run's model and texts. Every text may be given
+inline or as a file path relative to the config, and the API key may come from the
+environment instead of the file:
+    {
+        "model": "GPT-4o",
+        "api_key_env": "OPENAI_API_KEY",
+        "prompt_file": "prompt.txt",
+        "compliance_file": "compliance.md",
+        "proofread_file": "proofread.md",
+        "temperature": 0.7,
+        "max_tokens": 4000
+    }
+
+Results are written as JSON to --output, or to stdout; progress goes to stderr.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+TEXT_FIELDS = ("prompt", "compliance", "proofread")
+
+
+def load_config(path, require_api_key=True):
+    """
+    Load a run config, reading *_file texts relative to the config and resolving the API key
+
+    Args:
+        path (str): Config file
+        require_api_key (bool): Whether a missing API key is an error (not for --debug runs, which make no LLM calls)
+
+    Raises:
+        ValueError: If the config cannot be read or is incomplete
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as config_file:
+            config = json.load(config_file)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read config {path}: {e}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for field in TEXT_FIELDS:
+        file_name = config.pop(f"{field}_file", None)
+        if file_name and not config.get(field):
+            try:
+                with open(os.path.join(base_dir, file_name), "r", encoding="utf-8") as text_file:
+                    config[field] = text_file.read()
+            except OSError as e:
+                raise ValueError(f"Could not read {field} file {file_name}: {e}")
+
+    if not config.get("api_key"):
+        config["api_key"] = os.environ.get(config.get("api_key_env") or "COGITO_API_KEY")
+    required = ("model", "prompt", "compliance", "api_key") if require_api_key else ("model", "prompt", "compliance")
+    missing = [field for field in required if not config.get(field)]
+    if missing:
+        raise ValueError(f"Config {path} is missing: {', '.join(missing)}")
+    return config
+
+
+def collect_context_sets(paths):
+    """Turn --input paths into context sets: one per PDF file, and per sub-folder or PDF of a directory."""
+    from components.batch_runner import BatchRunner
+
+    context_sets = []
+    for path in paths:
+        if os.path.isdir(path):
+            context_sets.extend(BatchRunner.discover_context_sets(path))
+        elif path.lower().endswith(".pdf") and os.path.isfile(path):
+            context_sets.append({"label": os.path.basename(path), "file_paths": [path]})
+        else:
+            raise ValueError(f"Not a PDF file or directory: {path}")
+    return context_sets
+
+
+def run_execute(agent, args, config, cancel_token):
+    """Generate (and proof-read) one draft per context set, args.jobs at a time."""
+    from components import providers
+
+    context_sets = collect_context_sets(args.input)
+    if not context_sets:
+        raise ValueError("No PDFs found in the inputs")
+    proofread = not args.no_proofread and bool(config.get("proofread"))
+
+    base_inputs = {
+        "prompt": config["prompt"],
+        "compliance": config["compliance"],
+        "proofread": config.get("proofread") or "",
+        "model": config["model"],
+        "api_key": config["api_key"],
+        "token_limit": providers.get_context_window(config["model"])
+    }
+
+    def draft(context_set):
+        started = time.perf_counter()
+        result = {"label": context_set["label"], "files": context_set["file_paths"], "content": None, "flags": [], "error": None}
+        item = dict(context_set, inputs=base_inputs, cancel_token=cancel_token)
+        try:
+            # The same stages as a batch run in the app, minus the review queue
+            agent.batch_runner.run_draft_stage(item)
+            if proofread:
+                agent.run_proofread_stage(item)
+            result["content"] = item["content"]
+            result["flags"] = item.get("flags") or []
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = round(time.perf_counter() - started, 2)
+        return result
+
+    results = [None] * len(context_sets)
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(draft, context_set): index for index, context_set in enumerate(context_sets)}
+        for future in as_completed(futures):
+            result = results[futures[future]] = future.result()
+            print(f"{'FAILED' if result['error'] else 'Done'}: {result['label']} ({result['seconds']} s)")
+    return {"drafts": results}, any(result["error"] for result in results)
+
+
+def run_research(agent, args, config, cancel_token):
+    """Run one research pass over the configured feeds."""
+    from components import providers
+    from components.feed_store import FeedStore
+
+    if args.opml:
+        try:
+            feeds = FeedStore.parse_opml(args.opml)
+        except (OSError, ET.ParseError) as e:
+            raise ValueError(f"Could not read OPML file {args.opml}: {e}")
+    elif args.feeds:
+        feeds = FeedStore(args.feeds).load()
+    else:
+        feeds = config.get("feeds") or FeedStore().load()
+    if not feeds:
+        raise ValueError("No feeds: pass --feeds or --opml, list them in the config, or configure them in the app")
+
+    agent.research_batcher.max_workers = args.jobs
+    inputs = {
+        "prompt": config["prompt"],
+        "compliance": config["compliance"],
+        "model": config["model"],
+        "api_key": config["api_key"],
+        "temperature": config.get("temperature", 0.7),
+        "max_tokens": config.get("max_tokens", 4000),
+        "feeds": feeds,
+        "token_limit": providers.get_context_window(config["model"])
+    }
+    try:
+        suggestions = agent.run_research(inputs, cancel_token=cancel_token)
+        error = None
+    except RuntimeError as e:
+        suggestions, error = [], str(e)
+    return {
+        "suggestions": suggestions,
+        "feed_errors": agent.feed_errors,
+        "articles": agent.article_store.stats(),
+        "error": error
+    }, error is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Cogito pipelines without the GUI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    execute_parser = subparsers.add_parser("execute", help="Generate blog drafts from PDF context")
+    execute_parser.add_argument("--input", action="append", required=True, help="PDF file or directory of context sets (repeatable)")
+    execute_parser.add_argument("--no-proofread", action="store_true", help="Skip the automated proof-read pass")
+
+    research_parser = subparsers.add_parser("research", help="Judge new feed articles and suggest actions")
+    research_parser.add_argument("--feeds", help="Feed list JSON (as saved by the app)")
+    research_parser.add_argument("--opml", help="OPML file of feeds")
+
+    for command_parser in (execute_parser, research_parser):
+        command_parser.add_argument("--config", required=True, help="Run config JSON")
+        command_parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+        command_parser.add_argument("--jobs", type=int, default=3, help="Drafts, or research batches, processed in parallel")
+        command_parser.add_argument("--debug", action="store_true", help="Use the agent's debug mode instead of real LLM calls")
+        command_parser.add_argument("--profile", action="store_true", help="Profile the run to logs/")
+        command_parser.add_argument("--quiet", action="store_true", help="Suppress progress output")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config, require_api_key=not args.debug)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    # Imported after argument parsing so --help and config errors return immediately
+    from components.agent import Agent
+    from components.cancellation import CancellationToken
+
+    progress = io.StringIO() if args.quiet else sys.stderr
+    cancel_token = CancellationToken()
+    command = {"execute": run_execute, "research": run_research}[args.command]
+    try:
+        # The agent reports progress on stdout, which carries the JSON results here
+        with contextlib.redirect_stdout(progress):
+            agent = Agent(None)
+            agent.debug_mode = args.debug
+            agent.profiling_mode = args.profile
+            with agent._profile_run(args.command):
+                results, failed = command(agent, args, config, cancel_token)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        cancel_token.cancel()
+        print("Cancelled.", file=sys.stderr)
+        return 130
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
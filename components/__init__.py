@@ -1,8 +1,27 @@
 # Components package
-from .execute_workspace import ExecuteWorkspace
-from .research_workspace import ResearchWorkspace
-from .pdf_processor import PDFProcessor
-from .base_workspace import BaseWorkspace
-from .menu_widget import MenuWidget
-from .action_widget import ActionWidget
-from .agent import Agent 
\ No newline at end of file
+# The exports are imported on first access (PEP 562), so headless code such as
+# cli.py can import components.agent without loading the Qt widgets
+import importlib
+
+_EXPORTS = {
+    "ExecuteWorkspace": ".execute_workspace",
+    "ResearchWorkspace": ".research_workspace",
+    "PDFProcessor": ".pdf_processor",
+    "BaseWorkspace": ".base_workspace",
+    "MenuWidget": ".menu_widget",
+    "ActionWidget": ".action_widget",
+    "Agent": ".agent",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
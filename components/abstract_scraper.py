@@ -0,0 +1,258 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib import robotparser
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from .cancellation import CancelledError
+
+# lxml is optional: a faster parser for the article pages, html.parser otherwise
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+class AbstractScraper:
+    """
+    Politely scrapes abstracts from article pages for feed entries that have none.
+
+    - Each host gets its own pooled session and at most per_host_limit requests in flight,
+      spaced by the host's robots.txt Crawl-delay (or min_delay), on top of a global
+      max_workers cap.
+    - robots.txt is fetched once per host and disallowed pages are skipped.
+    - Only the page head is downloaded (publishers put the abstract in meta tags there),
+      and only <meta> tags are parsed, through a SoupStrainer.
+    - Results, including pages without an abstract, are cached per DOI or URL in
+      data/abstract_cache.json, so an article is scraped at most once.
+    """
+
+    # Meta tags carrying the abstract, most specific first
+    META_NAMES = (
+        "citation_abstract",
+        "dc.description",
+        "dcterms.abstract",
+        "dcterms.description",
+        "og:description",
+        "twitter:description",
+        "description",
+    )
+
+    def __init__(self, cache_path=os.path.join("data", "abstract_cache.json"), max_workers=8,
+                 per_host_limit=2, min_delay=1.0, timeout=15, max_bytes=512 * 1024,
+                 user_agent="Cogito research agent"):
+        """
+        Args:
+            cache_path (str): JSON file of scraped abstracts keyed by DOI or URL
+            max_workers (int): Pages downloaded concurrently across all hosts
+            per_host_limit (int): Pages downloaded concurrently from one host
+            min_delay (float): Minimum seconds between requests to one host
+            timeout (float): Connect and read timeout per request, in seconds
+            max_bytes (int): Most bytes read from a page when its </head> has not appeared
+            user_agent (str): User-Agent sent to publishers and matched against robots.txt
+        """
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.min_delay = min_delay
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+        self.stats = {"scraped": 0, "found": 0, "cached": 0, "disallowed": 0, "errors": 0}
+        self._cache = self._load_cache()
+        self._hosts = {}  # host -> {"session", "slots", "lock", "next_time", "robots"}
+        self._lock = threading.Lock()
+
+    def fill_missing(self, articles, cancel_token=None):
+        """
+        Scrape the abstracts of the articles that have none, in place
+
+        Args:
+            articles (list): Article dicts with 'link', 'abstract' and optional 'doi' keys
+            cancel_token (CancellationToken, optional): Stops scraping once cancelled
+
+        Returns:
+            int: Number of abstracts filled in
+
+        Raises:
+            CancelledError: If cancel_token is cancelled
+        """
+        missing = [article for article in articles if not article.get("abstract") and article.get("link")]
+        if not missing:
+            return 0
+
+        filled = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.get_abstract, article["link"], article.get("doi"), cancel_token): article for article in missing}
+            try:
+                for future in as_completed(futures):
+                    abstract = future.result()
+                    if abstract:
+                        futures[future]["abstract"] = abstract
+                        filled += 1
+            except CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                self._save_cache()
+
+        print(f"Research: scraped {filled} of {len(missing)} missing abstracts.")
+        return filled
+
+    def get_abstract(self, url, doi=None, cancel_token=None):
+        """
+        Get the abstract of one article page, from the cache when it was scraped before
+
+        Returns:
+            str: The abstract, or "" if the page has none or could not be read
+        """
+        key = f"doi:{doi.lower()}" if doi else url
+        with self._lock:
+            if key in self._cache:
+                self.stats["cached"] += 1
+                return self._cache[key]["abstract"]
+
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        host = self._host(url)
+        if not self._allowed(host, url):
+            with self._lock:
+                self.stats["disallowed"] += 1
+            return ""
+
+        try:
+            with host["slots"]:
+                self._wait_turn(host, cancel_token)
+                html = self._download_head(host["session"], url)
+        except requests.exceptions.RequestException as e:
+            print(f"Could not scrape abstract from {url}: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+            return ""  # Not cached, so the next run retries
+
+        abstract = self.extract_abstract(html)
+        with self._lock:
+            self.stats["scraped"] += 1
+            if abstract:
+                self.stats["found"] += 1
+            self._cache[key] = {"abstract": abstract, "url": url, "scraped_at": time.time()}
+        return abstract
+
+    def extract_abstract(self, html):
+        """
+        Find the abstract in the meta tags of an article page
+
+        Returns:
+            str: The longest abstract of the most specific meta tag present, or ""
+        """
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer("meta"))
+        found = {}
+        for meta in soup.find_all("meta"):
+            name = (meta.get("name") or meta.get("property") or "").lower()
+            content = (meta.get("content") or "").strip()
+            if name in self.META_NAMES and len(content) > len(found.get(name, "")):
+                found[name] = content
+
+        for name in self.META_NAMES:
+            if found.get(name):
+                text = found[name]
+                if "<" in text:
+                    text = BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+                return text
+        return ""
+
+    def _download_head(self, session, url):
+        """Download a page up to the end of its <head> (or max_bytes)."""
+        with session.get(url, headers={"User-Agent": self.user_agent}, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            data = b""
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                data += chunk
+                if b"</head>" in data.lower() or len(data) >= self.max_bytes:
+                    break
+        return data.decode(response.encoding or "utf-8", errors="replace")
+
+    def _host(self, url):
+        """Get the pooled session, concurrency slots and pacing state of a URL's host."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            host = self._hosts.get(origin)
+            if host is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                host = self._hosts[origin] = {
+                    "origin": origin,
+                    "session": session,
+                    "slots": threading.BoundedSemaphore(self.per_host_limit),
+                    "lock": threading.Lock(),
+                    "next_time": 0.0,
+                    "robots": None,
+                    "delay": self.min_delay
+                }
+            return host
+
+    def _allowed(self, host, url):
+        """Check robots.txt, fetching it on the first request to the host."""
+        with host["lock"]:
+            if host["robots"] is None:
+                robots = robotparser.RobotFileParser()
+                try:
+                    response = host["session"].get(host["origin"] + "/robots.txt", headers={"User-Agent": self.user_agent}, timeout=self.timeout)
+                    if response.status_code in (401, 403):
+                        robots.disallow_all = True
+                    elif response.ok:
+                        robots.parse(response.text.splitlines())
+                    else:
+                        robots.allow_all = True
+                except requests.exceptions.RequestException:
+                    robots.allow_all = True
+                host["robots"] = robots
+                host["delay"] = max(self.min_delay, float(robots.crawl_delay(self.user_agent) or 0))
+            return host["robots"].can_fetch(self.user_agent, url)
+
+    def _wait_turn(self, host, cancel_token=None):
+        """Sleep until the host's crawl delay since the previous request has passed."""
+        with host["lock"]:
+            now = time.monotonic()
+            start = max(now, host["next_time"])
+            host["next_time"] = start + host["delay"]
+        wait = start - time.monotonic()
+        if wait > 0:
+            if cancel_token:
+                cancel_token.wait(wait)
+                cancel_token.raise_if_cancelled()
+            else:
+                time.sleep(wait)
+
+    def _load_cache(self):
+        """Load the abstract cache, starting empty if it is missing or unreadable."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable abstract cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self):
+        """Write the abstract cache atomically."""
+        with self._lock:
+            data = json.dumps(self._cache)
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving abstract cache: {e}")
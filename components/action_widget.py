@@ -1,9 +1,17 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QScrollArea, QTextEdit, QDialog, QDialogButtonBox, QMessageBox
-from PySide6.QtCore import Qt
+from html import escape
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QTextEdit, QDialog, QDialogButtonBox, QMessageBox, QFrame, QCheckBox
+from PySide6.QtCore import Qt, Signal
 
 class ActionWidget(QWidget):
+    # Carries callables from worker threads to the GUI thread (queued connection)
+    ui_call = Signal(object)
+    # Desktop notification (title, message) for the tray icon, shown without the window having focus
+    notification_requested = Signal(str, str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.ui_call.connect(self._run_ui_call)
+        self.review_cards = {}  # Review queue cards keyed by item id
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
@@ -29,6 +37,10 @@ class ActionWidget(QWidget):
             }
             QPushButton:pressed {
                 background-color: #71717a; /* zinc-500 */
+            }
+            QFrame#ReviewCard {
+                border: 1px solid #3f3f46; /* zinc-700 */
+                border-radius: 4px;
             }
              QTextEdit {
                 background-color: #27272a; /* zinc-800 */
@@ -52,15 +64,59 @@ class ActionWidget(QWidget):
         self.discard_button = QPushButton("Discard")
         self.review_button = QPushButton("Edit")
         self.publish_button = QPushButton("Publish")
+        self.regenerate_button = QPushButton("Regenerate Sections")
 
         self.layout.addWidget(self.discard_button)
         self.layout.addWidget(self.review_button)
+        self.layout.addWidget(self.regenerate_button)
         self.layout.addWidget(self.publish_button)
 
         # Initially hide buttons until we have content to act on
         self.discard_button.setVisible(False)
         self.review_button.setVisible(False)
         self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
+
+        # Cancels the in-flight generation and queued batch items, shown while work is running
+        self.cancel_button = QPushButton("Cancel")
+        self.layout.addWidget(self.cancel_button)
+        self.cancel_button.setVisible(False)
+
+        # Opens the per-stage timing breakdown of the last runs
+        self.timings_button = QPushButton("Run Timings")
+        self.layout.addWidget(self.timings_button)
+
+        # Batch pipeline stage depths, hidden until a batch is running
+        self.pipeline_status_label = QLabel()
+        self.layout.addWidget(self.pipeline_status_label)
+        self.pipeline_status_label.setVisible(False)
+
+        # Review queue for batch drafts, kept separate so messages don't clear it
+        self.review_queue_label = QLabel("Review Queue (0):")
+        self.review_scroll_area = QScrollArea()
+        self.review_scroll_area.setWidgetResizable(True)
+        self.review_scroll_content = QWidget()
+        self.review_queue_layout = QVBoxLayout(self.review_scroll_content)
+        self.review_queue_layout.addStretch(1)
+        self.review_scroll_area.setWidget(self.review_scroll_content)
+
+        self.layout.addWidget(self.review_queue_label)
+        self.layout.addWidget(self.review_scroll_area)
+
+        self.review_queue_label.setVisible(False)
+        self.review_scroll_area.setVisible(False)
+
+    def run_on_ui_thread(self, callback):
+        """Schedule a callable to run on the GUI thread; safe to call from worker threads."""
+        self.ui_call.emit(callback)
+
+    def _run_ui_call(self, callback):
+        """Slot that executes callables posted through run_on_ui_thread."""
+        callback()
+
+    def notify(self, title, message):
+        """Request a desktop notification, e.g. for suggestions found by background research."""
+        self.notification_requested.emit(title, message)
 
     def display_output_card(self, action_card):
         """Display a compact card with the LLM output and action options."""
@@ -68,8 +124,12 @@ class ActionWidget(QWidget):
         self.clear_suggestions()
         
         # Create card content
+        sections = ""
+        if "sections" in action_card:
+            sections = f"<p>{action_card['sections']} sections, {action_card['locked_sections']} locked by your edits</p>"
         card_label = QLabel(
             f"<h3>Generated Blog Article</h3>"
+            f"{sections}"
             f"<p><b>Preview:</b></p>"
             f"<p>{action_card['content']}</p>"
             f"<p><i>Choose an action below:</i></p>"
@@ -82,6 +142,7 @@ class ActionWidget(QWidget):
         self.discard_button.setVisible(True)
         self.review_button.setVisible(True)
         self.publish_button.setVisible(True)
+        self.regenerate_button.setVisible(True)
 
     def open_text_editor(self, content):
         """Open a full-featured text editor dialog for editing the content."""
@@ -108,6 +169,160 @@ class ActionWidget(QWidget):
             return text_edit.toPlainText()
         return None
 
+    def choose_rework_sections(self, document):
+        """Let the user pick which unlocked sections of a draft to regenerate.
+
+        Returns:
+            list: Ids of the selected sections, or None if cancelled
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Regenerate Sections")
+        dialog.setModal(True)
+        dialog.resize(600, 500)
+
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Select the sections to regenerate. Sections you edited are locked."))
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_content = QWidget()
+        scroll_layout = QVBoxLayout(scroll_content)
+        scroll_area.setWidget(scroll_content)
+        layout.addWidget(scroll_area)
+
+        checkboxes = {}
+        for section in document.sections:
+            first_line = section["text"].splitlines()[0]
+            preview = first_line[:80] + "..." if len(first_line) > 80 else first_line
+            checkbox = QCheckBox(f"{preview} (locked)" if section["locked"] else preview)
+            checkbox.setChecked(not section["locked"])
+            checkbox.setEnabled(not section["locked"])
+            scroll_layout.addWidget(checkbox)
+            checkboxes[section["id"]] = checkbox
+        scroll_layout.addStretch(1)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(dialog.accept)
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+
+        if dialog.exec() == QDialog.Accepted:
+            return [section_id for section_id, checkbox in checkboxes.items() if checkbox.isChecked()]
+        return None
+
+    def show_run_timings(self, runs):
+        """Show the per-stage timing breakdown of the last runs.
+
+        Args:
+            runs (list): (title, rows) pairs, newest first, where rows are
+                (depth, stage name, duration_ms, status) tuples
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Run Timings")
+        dialog.resize(700, 600)
+
+        layout = QVBoxLayout(dialog)
+        html = ""
+        for title, rows in runs:
+            total = rows[0][2] if rows else 0
+            html += f"<h3>{title}</h3><table width='100%'>"
+            for depth, name, duration_ms, status in rows:
+                share = f"{duration_ms / total * 100:.0f}%" if total else ""
+                status_text = "" if status == "ok" else f" <span style='color: #f87171;'>({status})</span>"
+                html += (
+                    f"<tr><td style='padding-left: {depth * 16}px;'>{name}{status_text}</td>"
+                    f"<td align='right'>{duration_ms:.0f} ms</td><td align='right'>{share}</td></tr>"
+                )
+            html += "</table>"
+        if not runs:
+            html = "<p>No runs recorded yet.</p>"
+
+        text_view = QTextEdit()
+        text_view.setReadOnly(True)
+        text_view.setHtml(html)
+        layout.addWidget(text_view)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+        dialog.exec()
+
+    def show_feed_report(self, reports):
+        """Show the validation report of imported feeds.
+
+        Args:
+            reports (list): FeedValidator report dicts
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Feed Import Report")
+        dialog.resize(700, 500)
+
+        layout = QVBoxLayout(dialog)
+        scraping = sum(1 for report in reports if report["needs_scraping"])
+        html = (
+            f"<p>{sum(1 for report in reports if report['ok'])} of {len(reports)} feeds added. "
+            f"{scraping} will need abstract scraping (their items carry no abstracts).</p>"
+            "<table width='100%'><tr><th align='left'>Feed</th><th align='left'>Status</th>"
+            "<th align='right'>Items</th><th align='right'>With abstracts</th><th align='left'>Abstracts</th></tr>"
+        )
+        for report in reports:
+            if report["ok"]:
+                status = "OK"
+                abstracts = "<span style='color: #fbbf24;'>Scraped</span>" if report["needs_scraping"] else "In feed"
+            else:
+                status = f"<span style='color: #f87171;'>Not added: {escape(str(report['error']))}</span>"
+                abstracts = ""
+            html += (
+                f"<tr><td>{escape(report['feed']['name'])}</td><td>{status}</td><td align='right'>{report['items']}</td>"
+                f"<td align='right'>{report['with_abstracts']}</td><td>{abstracts}</td></tr>"
+            )
+        html += "</table>"
+
+        text_view = QTextEdit()
+        text_view.setReadOnly(True)
+        text_view.setHtml(html)
+        layout.addWidget(text_view)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+        dialog.exec()
+
+    def display_budget(self, plan, map_reduce=False):
+        """Display the pre-flight token budget breakdown of the next request."""
+        self.clear_suggestions()
+
+        rows = ""
+        for section in plan["sections"]:
+            tokens = f"{section['tokens']}"
+            if section["trimmed"]:
+                tokens += f" <span style='color: #fbbf24;'>(trimmed from {section['original_tokens']})</span>"
+            rows += f"<tr><td>{section['name']}</td><td align='right'>{tokens}</td></tr>"
+        rows += f"<tr><td>reserved output</td><td align='right'>{plan['reserved_output']}</td></tr>"
+
+        total = plan["total_input"] + plan["reserved_output"] + plan["message_overhead"]
+        status_color = "#4ade80" if plan["fits"] else "#f87171"
+        notes = ""
+        if map_reduce:
+            notes = "<p><i>The full context exceeds the window and will be reduced with map-reduce before the final call.</i></p>"
+
+        budget_label = QLabel(
+            f"<h3>Token Budget</h3>"
+            f"<p>{plan['model']} ({'exact' if plan['exact'] else 'estimated'} counts)</p>"
+            f"<table width='100%'>{rows}</table>"
+            f"<p style='color: {status_color};'><b>Total:</b> {total} / {plan['context_window']}</p>"
+            f"{notes}"
+        )
+        budget_label.setWordWrap(True)
+        budget_label.setTextFormat(Qt.RichText)
+        self.scroll_area_layout.addWidget(budget_label)
+
+        # Hide action buttons
+        self.discard_button.setVisible(False)
+        self.review_button.setVisible(False)
+        self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
+
     def display_error(self, message):
         """Display an error message."""
         self.clear_suggestions()
@@ -120,6 +335,7 @@ class ActionWidget(QWidget):
         self.discard_button.setVisible(False)
         self.review_button.setVisible(False)
         self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
 
     def display_success(self, message):
         """Display a success message."""
@@ -133,6 +349,7 @@ class ActionWidget(QWidget):
         self.discard_button.setVisible(False)
         self.review_button.setVisible(False)
         self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
 
     def display_info(self, message):
         """Display an info message."""
@@ -146,6 +363,25 @@ class ActionWidget(QWidget):
         self.discard_button.setVisible(False)
         self.review_button.setVisible(False)
         self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
+
+    def display_progress(self, message):
+        """Display a progress message for a running job."""
+        self.clear_suggestions()
+        progress_label = QLabel(f"<p style='color: #a1a1aa;'><i>{message}</i></p>")
+        progress_label.setWordWrap(True)
+        progress_label.setTextFormat(Qt.RichText)
+        self.scroll_area_layout.addWidget(progress_label)
+
+        # Hide action buttons
+        self.discard_button.setVisible(False)
+        self.review_button.setVisible(False)
+        self.publish_button.setVisible(False)
+        self.regenerate_button.setVisible(False)
+
+    def set_cancel_visible(self, visible):
+        """Show the Cancel button while there is work that can be cancelled."""
+        self.cancel_button.setVisible(visible)
 
     def clear_suggestions(self):
         """Clear all suggestions from the scroll area."""
@@ -164,18 +400,101 @@ class ActionWidget(QWidget):
         # Display new suggestions
         if suggested_actions:
             for suggestion in suggested_actions:
-                suggestion_label = QLabel(
-                    f"<b>Title:</b> {suggestion.get('title', 'N/A')}<br>"
-                    f"<b>Action:</b> {suggestion.get('action', 'N/A')}<br>"
-                    f"<b>Justification:</b> {suggestion.get('justification', 'N/A')}"
-                )
-                suggestion_label.setWordWrap(True)
-                suggestion_label.setTextFormat(Qt.RichText)
-                self.scroll_area_layout.addWidget(suggestion_label)
+                self.add_suggestion(suggestion)
         else:
             no_suggestions_label = QLabel("No suggestions available.")
             self.scroll_area_layout.addWidget(no_suggestions_label)
 
+    def add_suggestion(self, suggestion):
+        """Append one suggestion card, e.g. as soon as it is parsed from a streamed response.
+
+        A topic suggestion lists the articles it draws on, linked to their pages.
+        """
+        text = (
+            f"<b>Title:</b> {escape(str(suggestion.get('title', 'N/A')))}<br>"
+            f"<b>Action:</b> {escape(str(suggestion.get('action', 'N/A')))}<br>"
+            f"<b>Justification:</b> {escape(str(suggestion.get('justification', 'N/A')))}"
+        )
+        if suggestion.get("articles"):
+            sources = "".join(
+                f"<li><a href=\"{escape(article['link'], quote=True)}\">{escape(article['title'])}</a></li>"
+                for article in suggestion["articles"]
+            )
+            text += f"<br><b>Sources ({len(suggestion['articles'])} articles):</b><ul>{sources}</ul>"
+        suggestion_label = QLabel(text)
+        suggestion_label.setWordWrap(True)
+        suggestion_label.setTextFormat(Qt.RichText)
+        suggestion_label.setOpenExternalLinks(True)
+        self.scroll_area_layout.addWidget(suggestion_label)
+
+    def add_review_card(self, item, on_publish, on_edit, on_discard):
+        """Add a card for a queued draft with its own Publish/Edit/Discard buttons."""
+        card = QFrame()
+        card.setObjectName("ReviewCard")
+        card_layout = QVBoxLayout(card)
+
+        card_label = QLabel()
+        card_label.setWordWrap(True)
+        card_label.setTextFormat(Qt.RichText)
+        card_layout.addWidget(card_label)
+
+        buttons_layout = QHBoxLayout()
+        for text, callback in (("Discard", on_discard), ("Edit", on_edit), ("Publish", on_publish)):
+            button = QPushButton(text)
+            button.clicked.connect(callback)
+            # Failed drafts can only be discarded
+            button.setEnabled(item["error"] is None or text == "Discard")
+            buttons_layout.addWidget(button)
+        card_layout.addLayout(buttons_layout)
+
+        # Insert above the trailing stretch
+        self.review_queue_layout.insertWidget(self.review_queue_layout.count() - 1, card)
+        self.review_cards[item["id"]] = (card, card_label)
+        self.update_review_card(item)
+        self._update_review_queue_label()
+
+    def update_review_card(self, item):
+        """Refresh the preview and status of a queued draft card."""
+        if item["id"] not in self.review_cards:
+            return
+        _, card_label = self.review_cards[item["id"]]
+
+        if item["error"]:
+            body = f"<p style='color: #f87171;'><b>Failed:</b> {item['error']}</p>"
+        else:
+            content = item["content"]
+            preview = content[:300] + "..." if len(content) > 300 else content
+            body = f"<p>{preview}</p>"
+            if item.get("flags"):
+                flags = "".join(f"<li>{flag}</li>" for flag in item["flags"])
+                body += f"<p style='color: #fbbf24;'><b>Proof-read flags:</b></p><ul>{flags}</ul>"
+
+        card_label.setText(
+            f"<b>{item['label']}</b> <i>({item['status']})</i>"
+            f"{body}"
+        )
+
+    def remove_review_card(self, item_id):
+        """Remove a queued draft card."""
+        card, _ = self.review_cards.pop(item_id, (None, None))
+        if card is not None:
+            card.deleteLater()
+        self._update_review_queue_label()
+
+    def update_pipeline_status(self, depths):
+        """Show how many batch items are queued or in progress at each pipeline stage."""
+        self.pipeline_status_label.setText(
+            " · ".join(f"{name.capitalize()}: {count}" for name, count in depths.items())
+        )
+        self.pipeline_status_label.setVisible(any(depths.values()))
+
+    def _update_review_queue_label(self):
+        """Show the review queue only when it holds drafts."""
+        count = len(self.review_cards)
+        self.review_queue_label.setText(f"Review Queue ({count}):")
+        self.review_queue_label.setVisible(count > 0)
+        self.review_scroll_area.setVisible(count > 0)
+
     def handle_discard(self):
         print("Discard button clicked.")
         # TODO: Implement discard logic
@@ -1,18 +1,135 @@
 import requests
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
 import json
-import os
+import re
+import itertools
+import hashlib
+import threading
+import contextlib
+from datetime import datetime
+from .map_reduce import MapReduceGenerator
+from .batch_runner import BatchRunner
+from .pipeline import StagedPipeline
+from .draft_document import DraftDocument
+from .single_flight import SingleFlight
+from .cancellation import CancellationToken, CancelledError
+from .jsonl_logger import JSONLLogger
+from .blob_store import BlobStore
+from .telemetry import telemetry
+from .profiler import RunProfiler
+from .feed_fetcher import FeedFetcher
+from .feed_parser import StreamingFeedParser
+from .abstract_scraper import AbstractScraper
+from .article_store import ArticleStore
+from .feed_store import FeedStore
+from .feed_validator import FeedValidator
+from .relevance_filter import RelevanceFilter
+from .research_batcher import ResearchBatcher
+from .topic_clusterer import TopicClusterer
+from .research_scheduler import ResearchScheduler
+from . import providers
+from .providers import ProviderError
+from .token_budget import TokenCounter, BudgetPlanner, BudgetExceededError
 # No PySide6 import needed here for the fixes requested
 
 class Agent:
+    EXECUTE_MAX_TOKENS = 2000  # Output tokens reserved for the final blog article
+    EXECUTE_SYSTEM_PROMPT = "You are a professional blog writer. Generate high-quality blog articles based on the provided prompt, context, compliance requirements, and proofread document."
+    EXECUTE_INSTRUCTION = "Please generate a blog article based on the above information, following the compliance requirements and incorporating the provided context.\n"
+    MAP_MAX_TOKENS = 600  # Output tokens per map-reduce extraction call
+    PROOFREAD_SYSTEM_PROMPT = "You are a meticulous editor. Correct the draft blog article so that it follows the proof-read guide and the compliance requirements, changing as little as possible."
+    PROOFREAD_INSTRUCTION = "Reply with the corrected article only, then a line containing exactly === FLAGS === followed by one line per issue a human reviewer should check (leave it empty if there are none).\n"
+    FLAGS_MARKER = "=== FLAGS ==="
+    RESEARCH_SYSTEM_PROMPT = "You are a research assistant for a blog. Review each numbered journal article against the research prompt and compliance requirements, and report a judgment for every article by calling the judge_articles function."
+    JUDGMENT_TOOL = {
+        "name": "judge_articles",
+        "description": "Report one judgment per reviewed article, in list order, with a suggested action for the relevant ones.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer", "description": "Number of the article in the list"},
+                            "relevant": {"type": "boolean", "description": "Whether the article is relevant to the research prompt"},
+                            "action": {"type": "string", "description": "Suggested next step for a relevant article, e.g. write a blog article about it"},
+                            "justification": {"type": "string", "description": "Why the article is relevant (one sentence)"}
+                        },
+                        "required": ["index", "relevant"]
+                    }
+                }
+            },
+            "required": ["results"]
+        }
+    }
+    TOPIC_SYSTEM_PROMPT = "You are a research assistant for a blog. The numbered journal articles were all judged relevant and cover a related topic. Suggest a single blog post that draws on all of them, following the research prompt and compliance requirements, by calling the suggest_post function."
+    POST_TOOL = {
+        "name": "suggest_post",
+        "description": "Suggest one blog post covering the related articles.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "Working title of the blog post"},
+                "action": {"type": "string", "description": "Suggested next step, e.g. write a blog article comparing the findings"},
+                "justification": {"type": "string", "description": "What ties the articles together and why it matters to the blog (one or two sentences)"}
+            },
+            "required": ["title", "action", "justification"]
+        }
+    }
+    REGENERATE_INSTRUCTION = "The current draft of the article follows, split into marked sections. Rewrite only the sections marked REWRITE so that they read well next to the others. Reply with each rewritten section preceded by its exact marker line (=== SECTION n ===) and nothing else; do not reply with KEEP or LOCKED sections.\n"
+
     # Correct the constructor name from init to __init__
     def __init__(self, action_widget):
         print("Agent initialized.")
         self.action_widget = action_widget
         self.current_output = None  # Store current LLM output for editing
+        self.current_document = None  # Sectioned DraftDocument of the current output, tracks locked edits
+        self.current_inputs = None  # Execute inputs of the current output, reused by regeneration
+        self.execute_cancel_token = None  # Token of the Execute (Produce) run in flight, if any
+        self.research_cancel_token = None  # Token of the manual research run in flight, if any
+        self.regenerate_cancel_token = None  # Token of the section regeneration in flight, if any
+        self.active_workspace = "execute"  # Workspace shown, whose runs the Cancel button stops
+        self._run_keys = {}  # Token of each run in flight -> identity of its request
+        self._superseded_runs = {"execute": set(), "research": set(), "regenerate": set()}  # Kept alive for identical newer runs
+        self.current_suggestions = []  # Suggestions of the last research run
+        self.batch_cancel_token = CancellationToken()  # Shared by queued batch items; replaced on cancel
         self.current_loop_active = False  # Track if we're in the execute loop
         self.debug_mode = False  # Initialize debug mode flag as added in the previous turn
+        self.profiling_mode = False  # Profile Execute and research runs (cProfile + tracemalloc)
+        self.profiler = RunProfiler()
+        self.token_counter = TokenCounter()  # Shared, cached token counts for budget planning
+        self.budget_planner = BudgetPlanner(self.token_counter)
+        self.prompt_caching = True  # Mark the stable prompt prefix for provider-side caching
+        self.logger = JSONLLogger(blob_store=BlobStore())  # Structured logs with documents stored once by hash
+        self.telemetry = telemetry  # Stage spans, latency histograms and counters (shared with PDFProcessor)
+        self.single_flight = SingleFlight()  # Coalesces identical in-flight LLM requests
+        self.feed_fetcher = FeedFetcher()  # Concurrent feed downloads with conditional GET caching
+        self.feed_parser = StreamingFeedParser()
+        self.abstract_scraper = AbstractScraper()  # Fills in abstracts missing from the feeds
+        self.article_store = ArticleStore()  # Articles seen by research runs and their judgments
+        self.feed_validator = FeedValidator()  # Concurrent checks of imported feeds
+        self.relevance_filter = RelevanceFilter()  # Local TF-IDF ranking before the LLM judges articles
+        self.research_batcher = ResearchBatcher(self)  # Concurrent LLM judgments of packed article batches
+        self.topic_clusterer = TopicClusterer(self)  # One suggestion per topic of related relevant articles
+        self.research_lock = threading.Lock()  # One research run at a time, manual or scheduled
+        self.feed_errors = {}  # Feeds that could not be read in the last research run, name -> error
+        self.research_scheduler = ResearchScheduler(self, on_suggestions=self._on_scheduled_suggestions)  # Background research for tray mode
+        self.map_reduce = MapReduceGenerator(self)  # Fallback for context larger than the model window
+        self.batch_runner = BatchRunner(self)  # Drafting stage of batch Execute runs
+        self.review_queue = {}  # Batch drafts awaiting review, keyed by item id
+        self._review_ids = itertools.count(1)
+        # Batch runs flow draft -> automated proof-read -> review queue, overlapping across items
+        self.pipeline = StagedPipeline(
+            [
+                ("drafting", self.batch_runner.run_draft_stage, self.batch_runner.max_workers),
+                ("proofreading", self.run_proofread_stage, 2)
+            ],
+            on_complete=self._on_pipeline_complete,
+            on_error=self._on_pipeline_error,
+            on_depth_change=self._on_pipeline_depths
+        )
 
         # Connect action widget buttons to our handlers
         if self.action_widget:
@@ -23,6 +140,9 @@ class Agent:
                 self.action_widget.publish_button.clicked.disconnect()  # Remove existing connections
                 self.action_widget.review_button.clicked.disconnect()
                 self.action_widget.discard_button.clicked.disconnect()
+                self.action_widget.regenerate_button.clicked.disconnect()
+                self.action_widget.cancel_button.clicked.disconnect()
+                self.action_widget.timings_button.clicked.disconnect()
             except RuntimeError:
                 # Ignore errors if there are no connections to disconnect
                 pass
@@ -30,14 +150,31 @@ class Agent:
             self.action_widget.publish_button.clicked.connect(self.handle_publish)
             self.action_widget.review_button.clicked.connect(self.handle_edit)
             self.action_widget.discard_button.clicked.connect(self.handle_discard)
+            self.action_widget.regenerate_button.clicked.connect(self.handle_regenerate)
+            self.action_widget.cancel_button.clicked.connect(self.handle_cancel)
+            self.action_widget.timings_button.clicked.connect(self.handle_show_timings)
 
     def set_debug_mode(self, enabled):
         """Set the debug mode flag"""
         self.debug_mode = enabled
         print(f"Debug mode {'enabled' if enabled else 'disabled'}")
 
-    def validate_preconditions(self, main_workspace):
-        """Validate that all required preconditions are met before executing."""
+    def set_profiling_mode(self, enabled):
+        """Set the profiling mode flag; while set, each Execute and research run is profiled to logs/."""
+        self.profiling_mode = enabled
+        print(f"Profiling mode {'enabled' if enabled else 'disabled'}")
+
+    def _profile_run(self, label):
+        """Profile the enclosed run when profiling mode is on, otherwise do nothing."""
+        if self.profiling_mode:
+            return self.profiler.capture(label)
+        return contextlib.nullcontext(False)
+
+    def validate_preconditions(self, main_workspace, require_context=True):
+        """Validate that all required preconditions are met before executing.
+
+        Batch runs bring their own context sets, so they skip the uploaded context check.
+        """
         errors = []
 
         # Check if compliance document is uploaded
@@ -53,7 +190,7 @@ class Agent:
             errors.append("API key not provided in Prompt Definition")
 
         # Check if context is uploaded
-        if not hasattr(main_workspace, 'context_content') or not main_workspace.context_content:
+        if require_context and (not hasattr(main_workspace, 'context_content') or not main_workspace.context_content):
             errors.append("Context not uploaded")
 
         # Check if document is proofread
@@ -78,28 +215,69 @@ class Agent:
         print("All preconditions met. Starting Execute loop...")
         self.current_loop_active = True
 
-        # Step 2: Assemble input
-        combined_input = self.assemble_input(
-            main_workspace.prompt_content,
-            main_workspace.context_content,
-            main_workspace.compliance_content,
-            main_workspace.proofread_content
-        )
+        # Step 2: Collect inputs and generate the draft off the GUI thread
+        inputs = self.collect_execute_inputs(main_workspace)
+        cancel_token = self._start_run("execute", self._request_key(inputs, inputs["api_key"], inputs["model"]))
+        if self.action_widget:
+            self.action_widget.display_progress("Generating blog article...")
+            self._show_pipeline_status()
+        threading.Thread(
+            target=self._run_execute,
+            args=(inputs, cancel_token, getattr(main_workspace, 'pdf_processor', None)),
+            name="cogito-execute",
+            daemon=True
+        ).start()
+
+    def _run_execute(self, inputs, cancel_token, pdf_processor=None):
+        """Generate an Execute draft on a worker thread and post the outcome to the GUI thread.
+
+        The context PDFs are extracted and chunked here too (see get_context_chunks), so
+        uploads not processed yet do not block the GUI thread.
+        """
+        llm_response, error = None, None
+        try:
+            with self._profile_run("execute"), self.telemetry.span("execute", model=inputs["model"]):
+                inputs["chunks"] = self.get_context_chunks(pdf_processor, inputs["context_files"])
+                llm_response = self.generate_draft(inputs, cancel_token)
+        except (BudgetExceededError, CancelledError) as e:
+            error = e
+        except Exception as e:
+            # Anything else (provider, map-reduce, parsing) must still reach the GUI thread to end the run
+            print(f"Execute run failed: {type(e).__name__}: {e}")
+            error = e
+        self._post_to_ui(self._on_execute_result, inputs, cancel_token, llm_response, error)
+
+    def _on_execute_result(self, inputs, cancel_token, llm_response, error):
+        """Present the outcome of an Execute run."""
+        if not self._finish_run("execute", cancel_token):
+            return  # Superseded by a newer Produce click
+
+        if isinstance(error, CancelledError) or cancel_token.is_cancelled:
+            print("Execute run cancelled.")
+            self.current_loop_active = False
+            if self.action_widget:
+                self.action_widget.display_info("Generation cancelled.")
+            return
 
-        # Step 3: LLM Invocation
-        payload = self.prepare_execute_payload(
-            combined_input,
-            main_workspace.selected_model,
-            main_workspace.api_key
-        )
+        if isinstance(error, BudgetExceededError):
+            print(str(error))
+            self.current_loop_active = False
+            if self.action_widget:
+                self.action_widget.display_error(str(error))
+            return
 
-        # This calls the modified _call_llm_api which respects debug_mode
-        llm_response = self._call_llm_api(payload, main_workspace.api_key, main_workspace.selected_model)
+        if error:
+            self.current_loop_active = False
+            if self.action_widget:
+                self.action_widget.display_error(f"Generation failed: {type(error).__name__}: {error}")
+            return
 
-        # Step 4: Present output with action options
+        # Step 3: Present output with action options
         if llm_response:
             self.current_output = self.extract_blog_content(llm_response)
             if self.current_output:
+                self.current_inputs = inputs
+                self.current_document = DraftDocument(self.current_output)
                 self.present_output_actions(self.current_output)
             else:
                 print("Failed to extract blog content from LLM response.")
@@ -110,44 +288,885 @@ class Agent:
             if self.action_widget:
                 self.action_widget.display_error("LLM API call failed. Please check your API key and try again.")
 
+    def _start_run(self, workflow, request_key=None):
+        """Install the cancellation token of a new run of a workflow ("execute", "research" or "regenerate").
+
+        Each workflow has its own token, so runs of different workflows never cancel each
+        other. A run still in flight in the same workflow is superseded: its result would be
+        discarded anyway, and cancelling it releases any LLM call it leads, so no request
+        is left running without a Cancel button. A superseded run with the same request_key
+        (e.g. a double-clicked Produce) is kept running instead, so the new run joins its
+        in-flight LLM call (see SingleFlight) rather than aborting and resending it; Cancel
+        still stops both.
+
+        Args:
+            workflow (str): Workflow of the run
+            request_key (str, optional): Identity of the run's request; None never matches
+        """
+        attribute = f"{workflow}_cancel_token"
+        previous = getattr(self, attribute)
+        if previous:
+            if request_key is not None and self._run_keys.get(previous) == request_key:
+                print(f"Superseding the identical {workflow} run in flight; the new run shares its request.")
+                self._superseded_runs[workflow].add(previous)
+            else:
+                print(f"Cancelling the {workflow} run in flight, which the new run supersedes...")
+                previous.cancel()
+        cancel_token = CancellationToken()
+        self._run_keys[cancel_token] = request_key
+        setattr(self, attribute, cancel_token)
+        return cancel_token
+
+    def _cancel_runs(self, workflow):
+        """Cancel the current run of a workflow and the identical runs it superseded."""
+        for cancel_token in [getattr(self, f"{workflow}_cancel_token"), *self._superseded_runs[workflow]]:
+            if cancel_token:
+                cancel_token.cancel()
+
+    def _finish_run(self, workflow, cancel_token):
+        """Clear the token of a finished run on the GUI thread.
+
+        Returns:
+            bool: Whether the run is still the workflow's current run, i.e. its outcome should be shown
+        """
+        attribute = f"{workflow}_cancel_token"
+        self._run_keys.pop(cancel_token, None)
+        self._superseded_runs[workflow].discard(cancel_token)
+        if cancel_token is not getattr(self, attribute):
+            print(f"Dropping the outcome of a superseded {workflow} run.")
+            return False
+        setattr(self, attribute, None)
+        self._show_pipeline_status()
+        return True
+
+    def set_active_workspace(self, workspace):
+        """Track the workspace shown ("execute" or "research"), which the Cancel button acts on."""
+        self.active_workspace = workspace
+        self._show_pipeline_status()
+
+    def handle_cancel(self):
+        """Handle the Cancel button - abort the runs of the active workspace.
+
+        In the Execute workspace that is the Produce run, the section regeneration and all
+        queued batch items; in the research workspace, the manual research run.
+        """
+        if self.active_workspace == "research":
+            if self.research_cancel_token:
+                print("Cancelling research run...")
+            self._cancel_runs("research")
+            return
+
+        if self.execute_cancel_token:
+            print("Cancelling Execute run...")
+        if self.regenerate_cancel_token:
+            print("Cancelling section regeneration...")
+        self._cancel_runs("execute")
+        self._cancel_runs("regenerate")
+
+        if any(self.pipeline.queue_depths().values()):
+            print("Cancelling batch items in the pipeline...")
+        # Queued items hold the old token and are dropped when a stage picks them up
+        self.batch_cancel_token.cancel()
+        self.batch_cancel_token = CancellationToken()
+
+    def validate_research_preconditions(self, research_workspace):
+        """Validate that a research run has everything it needs.
+
+        Returns:
+            list: List of error messages (empty if all preconditions are met)
+        """
+        errors = []
+        if not research_workspace.get_rss_feeds():
+            errors.append("No RSS feeds configured")
+        if not getattr(research_workspace, 'research_compliance_content', None):
+            errors.append("Research compliancy document not uploaded")
+        if not getattr(research_workspace, 'research_prompt_content', None):
+            errors.append("Research prompt not defined and saved")
+        if not getattr(research_workspace, 'research_api_key', None):
+            errors.append("API key not provided")
+        return errors
+
+    def handle_research(self, research_workspace):
+        """Handle the Research button - stream suggested actions for new articles into the action widget."""
+        print("Research requested - validating preconditions...")
+
+        validation_errors = self.validate_research_preconditions(research_workspace)
+        if validation_errors:
+            error_message = "Cannot proceed. Please complete the following:\n" + "\n".join([f"• {error}" for error in validation_errors])
+            print(error_message)
+            if self.action_widget:
+                self.action_widget.display_error(error_message)
+            return
+
+        inputs = self.collect_research_inputs(research_workspace)
+        cancel_token = self._start_run("research")
+        self.current_suggestions = []
+        if self.action_widget:
+            self.action_widget.display_progress(f"Reading {len(inputs['feeds'])} RSS feeds...")
+            self._show_pipeline_status()
+        threading.Thread(
+            target=self._run_research,
+            args=(inputs, cancel_token),
+            name="cogito-research",
+            daemon=True
+        ).start()
+
+    def _run_research(self, inputs, cancel_token):
+        """Run a research pass on a worker thread, posting each suggestion to the GUI thread as it arrives."""
+        suggestions, error = None, None
+        try:
+            with self.research_lock, self._profile_run("research"), self.telemetry.span("research", model=inputs["model"]):
+                suggestions = self.run_research(
+                    inputs,
+                    lambda suggestion: self._post_to_ui(self._on_research_suggestion, cancel_token, suggestion),
+                    cancel_token
+                )
+        except (CancelledError, RuntimeError) as e:
+            error = e
+        except Exception as e:
+            # Anything else (feed fetcher, batcher, provider) must still reach the GUI thread to end the run
+            error = RuntimeError(f"{type(e).__name__}: {e}")
+        self._post_to_ui(self._on_research_done, cancel_token, suggestions, error)
+
+    def _on_research_suggestion(self, cancel_token, suggestion):
+        """Show one streamed suggestion card."""
+        if cancel_token is not self.research_cancel_token:
+            return
+        self.current_suggestions.append(suggestion)
+        if self.action_widget:
+            if len(self.current_suggestions) == 1:
+                self.action_widget.clear_suggestions()
+            self.action_widget.add_suggestion(suggestion)
+
+    def _on_research_done(self, cancel_token, suggestions, error):
+        """Finish a research run."""
+        if not self._finish_run("research", cancel_token):
+            return
+
+        if isinstance(error, CancelledError) or cancel_token.is_cancelled:
+            print("Research run cancelled.")
+            if self.action_widget and not self.current_suggestions:
+                self.action_widget.display_info("Research cancelled.")
+            return
+        if error:
+            print(f"Research failed: {error}")
+            if self.action_widget:
+                self.action_widget.display_error(f"Research failed: {error}")
+            return
+
+        if suggestions is not None:
+            # The streamed per-article cards give way to one card per topic
+            self.current_suggestions = suggestions
+        print(f"Research completed with {len(self.current_suggestions)} suggestions.")
+        if self.action_widget:
+            self.action_widget.display_suggestions(self.current_suggestions)
+
+    def handle_background_research(self, research_workspace, enabled, interval_minutes=60):
+        """Start or stop scheduled background research over the configured feeds.
+
+        Starting again while the scheduler runs refreshes its inputs and feeds.
+        """
+        if not enabled:
+            self.research_scheduler.stop()
+            if self.action_widget:
+                self.action_widget.display_info("Background research stopped.")
+            return True
+
+        validation_errors = self.validate_research_preconditions(research_workspace)
+        if validation_errors:
+            error_message = "Cannot start background research. Please complete the following:\n" + "\n".join([f"• {error}" for error in validation_errors])
+            print(error_message)
+            if self.action_widget:
+                self.action_widget.display_error(error_message)
+            return False
+
+        self.research_scheduler.default_interval = interval_minutes * 60
+        self.research_scheduler.start(self.collect_research_inputs(research_workspace))
+        if self.action_widget:
+            self.action_widget.display_info(f"Background research runs every {interval_minutes} minutes per feed.")
+        return True
+
+    def _on_scheduled_suggestions(self, suggestions):
+        """Receive the suggestions of a scheduled research run on its worker thread."""
+        self._post_to_ui(self._show_scheduled_suggestions, suggestions)
+
+    def _show_scheduled_suggestions(self, suggestions):
+        """Add scheduled research suggestions to the cards and raise a desktop notification."""
+        self.current_suggestions.extend(suggestions)
+        if not self.action_widget:
+            return
+        for suggestion in suggestions:
+            self.action_widget.add_suggestion(suggestion)
+        titles = "\n".join(f"• {suggestion['title']}" for suggestion in suggestions[:3])
+        more = f"\n… and {len(suggestions) - 3} more" if len(suggestions) > 3 else ""
+        self.action_widget.notify(f"{len(suggestions)} new research suggestions", titles + more)
+
+    def handle_import_opml(self, research_workspace, path):
+        """Handle Import OPML - validate the new feeds of an OPML file concurrently, then add the valid ones."""
+        try:
+            feeds = FeedStore.parse_opml(path)
+        except (OSError, ET.ParseError) as e:
+            print(f"Could not read OPML file {path}: {e}")
+            if self.action_widget:
+                self.action_widget.display_error(f"Could not read OPML file: {e}")
+            return
+
+        known = {feed["url"] for feed in research_workspace.get_rss_feeds()}
+        new_feeds = [feed for feed in feeds if feed["url"] not in known]
+        print(f"OPML import: {len(feeds)} feeds, {len(new_feeds)} new.")
+        if not new_feeds:
+            if self.action_widget:
+                self.action_widget.display_info(f"All {len(feeds)} feeds of the OPML file are already configured.")
+            return
+
+        if self.action_widget:
+            self.action_widget.display_progress(f"Validating {len(new_feeds)} imported feeds...")
+        threading.Thread(
+            target=self._run_feed_validation,
+            args=(research_workspace, new_feeds),
+            name="cogito-feed-validation",
+            daemon=True
+        ).start()
+
+    def _run_feed_validation(self, research_workspace, feeds):
+        """Validate imported feeds on a worker thread."""
+        reports, error = None, None
+        with self.telemetry.span("feed_validation", feeds=len(feeds)):
+            try:
+                reports = self.feed_validator.validate(feeds)
+            except Exception as e:
+                print(f"Feed validation failed: {e}")
+                error = e
+        self._post_to_ui(self._on_feeds_validated, research_workspace, reports, error)
+
+    def _on_feeds_validated(self, research_workspace, reports, error):
+        """Add the valid imported feeds and show the validation report."""
+        if error:
+            if self.action_widget:
+                self.action_widget.display_error(f"Feed validation failed: {error}")
+            return
+        # Remember whether each feed carries abstracts; the others rely on the abstract scraper
+        valid = [dict(report["feed"], has_abstracts=not report["needs_scraping"]) for report in reports if report["ok"]]
+        research_workspace.add_feeds(valid)
+        if self.action_widget:
+            self.action_widget.display_info(f"Imported {len(valid)} of {len(reports)} feeds.")
+            self.action_widget.show_feed_report(reports)
+
+    def collect_research_inputs(self, research_workspace):
+        """Collect everything a research run needs into a plain dict, so it can run off the GUI thread."""
+        model = research_workspace.research_model
+        return {
+            "prompt": research_workspace.research_prompt_content,
+            "compliance": research_workspace.research_compliance_content,
+            "model": model,
+            "api_key": research_workspace.research_api_key,
+            "temperature": research_workspace.research_temperature,
+            "max_tokens": research_workspace.research_max_tokens,
+            "feeds": research_workspace.get_rss_feeds(),
+            "token_limit": providers.get_context_window(model)
+        }
+
+    def run_research(self, inputs, on_suggestion=None, cancel_token=None):
+        """Read the feeds and ask the LLM for suggested actions through function calling.
+
+        Only new or changed articles that the local relevance filter ranks close to the
+        compliance document and research prompt are sent to the LLM, packed into
+        concurrent batched requests (see ResearchBatcher). The tool call arguments are
+        streamed and parsed incrementally, so on_suggestion is called with each per-article
+        suggestion as soon as it is complete. Related relevant articles are then clustered
+        and summarized into one suggestion per topic (see TopicClusterer).
+
+        Returns:
+            list: The suggestions of the run, one per topic
+
+        Raises:
+            RuntimeError: If no articles could be read or the LLM call fails
+            CancelledError: If cancel_token is cancelled
+        """
+        query_hash = ArticleStore.query_hash(inputs["compliance"], inputs["prompt"])
+        if self.article_store.get_meta("query_hash") != query_hash:
+            # Stored judgments were made against another query; unchanged feeds must be read again too
+            print("Research: the research prompt or compliance document changed; reading all feeds in full.")
+            self.feed_fetcher.forget()
+            self.article_store.set_meta("query_hash", query_hash)
+        with self.telemetry.span("feed_fetch", feeds=len(inputs["feeds"])):
+            articles = self.fetch_feed_articles(inputs["feeds"], cancel_token, query_hash)
+        # Only articles that are new or changed since they were judged against this query go to the LLM
+        articles = self.article_store.triage(articles, query_hash)
+        if not articles:
+            print("Research: no new or changed articles since the last run.")
+            self.feed_fetcher.commit()
+            return []
+        with self.telemetry.span("abstract_scrape"):
+            self.abstract_scraper.fill_missing(articles, cancel_token)
+
+        with self.telemetry.span("relevance_filter", articles=len(articles)) as span:
+            candidates, deferred, rejected = self.relevance_filter.select(articles, [inputs["compliance"], inputs["prompt"]])
+            span["attributes"]["candidates"] = len(candidates)
+        # Rejections are kept per query and abstract, so later runs neither re-score them nor read
+        # their feeds in full; a changed query or abstract makes them pending again
+        self.article_store.record_rejections(rejected, query_hash)
+        print(f"Research: {len(candidates)} of {len(articles)} articles passed the relevance filter ({len(rejected)} rejected, {len(deferred)} deferred).")
+        if not candidates:
+            self.feed_fetcher.commit()
+            return []
+
+        suggestions, judged = self.research_batcher.score(inputs, candidates, on_suggestion, cancel_token)
+        if not judged:
+            raise RuntimeError("LLM API call failed. Please check your API key and try again.")
+        if not suggestions:
+            print("Research: no article was judged relevant.")
+        if judged == len(candidates) and not deferred:
+            # Articles not judged yet are only in the downloaded feeds, so those are read again next run
+            self.feed_fetcher.commit()
+        # Judgments are stored per article above; related relevant articles become one suggestion
+        return self.topic_clusterer.summarize(inputs, candidates, suggestions, cancel_token)
+
+    def fetch_feed_articles(self, feeds, cancel_token=None, query_hash=None):
+        """Fetch the configured RSS/Atom feeds concurrently and extract their articles.
+
+        Feeds that answer 304 Not Modified have no new articles since the last run and
+        are skipped. Changed feeds are parsed incrementally, stopping at articles that
+        were already judged or rejected with the same abstract against the same research query
+        (see ArticleStore.query_hash).
+
+        Returns:
+            list: Article dicts with 'id', 'doi', 'title', 'link', 'abstract', 'published' and 'feed' keys
+        """
+        articles = []
+        unchanged = 0
+        self.feed_errors = {}
+        judged = self.article_store.judged_hashes(query_hash)
+        seen = lambda article: judged.get(article["id"]) == ArticleStore.abstract_hash(article)
+        unjudged = self.article_store.unjudged_feeds(query_hash)
+        for result in self.feed_fetcher.fetch_all(feeds, cancel_token):
+            feed = result["feed"]
+            if result["not_modified"]:
+                unchanged += 1
+            elif result["error"]:
+                print(f"Could not read feed '{feed['name']}': {result['error']}")
+                self.feed_errors[feed["name"]] = str(result["error"])
+            else:
+                try:
+                    # Feeds with unjudged older articles are read in full instead of stopping at the first judged ones
+                    stop_after_seen = 0 if feed["name"] in unjudged else None
+                    for article in self.feed_parser.iter_entries(result["content"], feed["name"], seen, stop_after_seen):
+                        articles.append(article)
+                except ET.ParseError as e:
+                    print(f"Could not parse feed '{feed['name']}': {e}")
+                    self.feed_errors[feed["name"]] = f"Malformed feed: {e}"
+        print(f"Research: read {len(articles)} articles from {len(feeds)} feeds ({unchanged} unchanged since the last run).")
+        return articles
+
+    def research_guide_text(self, inputs):
+        """Text of the compliance document and research prompt block shared by research requests."""
+        return f"Research compliance requirements:\n{inputs['compliance']}\n\nResearch prompt:\n{inputs['prompt']}\n\n"
+
+    def format_research_entry(self, index, article):
+        """Format one article for a research request."""
+        return f"[{index}] {article['title']} ({article['feed']})\nLink: {article['link']}\nAbstract: {article['abstract'] or 'not available'}\n\n"
+
+    def prepare_research_payload(self, inputs, articles):
+        """Prepare the function-calling payload judging one batch of research articles.
+
+        The compliance document and research prompt lead as a cacheable block shared by
+        every batch, followed by the numbered articles (see ResearchBatcher).
+        """
+        guide = {"type": "text", "text": self.research_guide_text(inputs)}
+        if self.prompt_caching:
+            guide["cache"] = True
+        entries = [self.format_research_entry(index, article) for index, article in enumerate(articles, 1)]
+
+        return {
+            "model": inputs["model"],
+            "messages": [
+                {"role": "system", "content": self.RESEARCH_SYSTEM_PROMPT},
+                {"role": "user", "content": [guide, {"type": "text", "text": "New articles:\n\n" + "".join(entries)}]}
+            ],
+            "temperature": inputs["temperature"],
+            "max_tokens": inputs["max_tokens"],
+            "tools": [self.JUDGMENT_TOOL],
+            "tool_choice": self.JUDGMENT_TOOL["name"]
+        }
+
+    def prepare_topic_payload(self, inputs, articles):
+        """Prepare the function-calling payload summarizing a cluster of related research articles into one suggestion."""
+        guide = {"type": "text", "text": self.research_guide_text(inputs)}
+        if self.prompt_caching:
+            guide["cache"] = True
+        entries = [self.format_research_entry(index, article) for index, article in enumerate(articles, 1)]
+
+        return {
+            "model": inputs["model"],
+            "messages": [
+                {"role": "system", "content": self.TOPIC_SYSTEM_PROMPT},
+                {"role": "user", "content": [guide, {"type": "text", "text": "Related articles:\n\n" + "".join(entries)}]}
+            ],
+            "temperature": inputs["temperature"],
+            "max_tokens": inputs["max_tokens"],
+            "tools": [self.POST_TOOL],
+            "tool_choice": self.POST_TOOL["name"]
+        }
+
+    def handle_batch_produce(self, main_workspace, context_sets):
+        """Handle a batch Execute run - generate one draft per context set into the review queue."""
+        print(f"Batch Produce requested for {len(context_sets)} context sets - validating preconditions...")
+
+        validation_errors = self.validate_preconditions(main_workspace, require_context=False)
+        if not context_sets:
+            validation_errors.append("No context sets found in the selected folder")
+        if validation_errors:
+            error_message = "Cannot proceed. Please complete the following:\n" + "\n".join([f"• {error}" for error in validation_errors])
+            print(error_message)
+            if self.action_widget:
+                self.action_widget.display_error(error_message)
+            return
+
+        base_inputs = self.collect_execute_inputs(main_workspace)
+        base_inputs["context"] = None
+        base_inputs["context_files"] = []
+        base_inputs["chunks"] = []
+
+        self.batch_runner.submit(context_sets, base_inputs, self.batch_cancel_token)
+
+        if self.action_widget:
+            self.action_widget.display_info(f"Batch started: {len(context_sets)} drafts queued. Proof-read drafts will appear in the review queue.")
+
+    def run_proofread_stage(self, item):
+        """Pipeline proof-reading stage: correct a generated draft and collect reviewer flags."""
+        item['cancel_token'].raise_if_cancelled()
+        print(f"Batch: proof-reading draft for '{item['label']}'...")
+        with self.telemetry.span("batch_proofread", label=item['label'], model=item['inputs']['model']):
+            content, flags = self.proofread_draft(item['content'], item['inputs'], item['cancel_token'])
+        item['content'] = content
+        item['flags'] = flags
+        return item
+
+    def _on_pipeline_complete(self, item):
+        """Receive a proof-read batch draft from a pipeline worker."""
+        self._post_to_ui(self.add_review_item, item['label'], item['content'], None, item.get('flags'))
+
+    def _on_pipeline_error(self, item, stage_name, error):
+        """Receive a batch draft that failed in a pipeline stage."""
+        if isinstance(error, CancelledError):
+            print(f"Batch: '{item['label']}' cancelled during {stage_name}.")
+            return
+        self._post_to_ui(self.add_review_item, item['label'], item.get('content'), f"{stage_name} failed: {error}")
+
+    def _on_pipeline_depths(self, depths):
+        """Forward pipeline queue depths to the action widget."""
+        if self.action_widget:
+            self._post_to_ui(self._show_pipeline_status, depths)
+
+    def _show_pipeline_status(self, depths=None):
+        """Show stage depths plus the number of drafts awaiting approval."""
+        if not self.action_widget:
+            return
+        depths = dict(depths or self.pipeline.queue_depths())
+        if self.active_workspace == "research":
+            cancellable = self.research_cancel_token is not None
+        else:
+            cancellable = self.execute_cancel_token is not None or self.regenerate_cancel_token is not None or any(depths.values())
+        self.action_widget.set_cancel_visible(cancellable)
+        depths["awaiting approval"] = sum(1 for item in self.review_queue.values() if item["status"] != "failed")
+        self.action_widget.update_pipeline_status(depths)
+
+    def add_review_item(self, label, content, error=None, flags=None):
+        """Add a generated draft (or a failed one) to the review queue."""
+        item_id = next(self._review_ids)
+        item = {
+            "id": item_id,
+            "label": label,
+            "content": content,
+            "error": error,
+            "flags": flags or [],
+            "status": "failed" if error else "pending"
+        }
+        self.review_queue[item_id] = item
+        print(f"Review queue: added '{label}' ({item['status']}).")
+
+        if self.action_widget:
+            self.action_widget.add_review_card(
+                item,
+                on_publish=lambda: self.handle_review_publish(item_id),
+                on_edit=lambda: self.handle_review_edit(item_id),
+                on_discard=lambda: self.handle_review_discard(item_id)
+            )
+            self._show_pipeline_status()
+        return item
+
+    def handle_review_publish(self, item_id):
+        """Handle the Publish action for a queued draft - publish it and drop it from the queue."""
+        item = self.review_queue.get(item_id)
+        if not item or not item["content"]:
+            return
+
+        if not self._publish(item["content"], item["label"]):
+            return
+
+        item["status"] = "published"
+        del self.review_queue[item_id]
+        if self.action_widget:
+            self.action_widget.remove_review_card(item_id)
+            self._show_pipeline_status()
+            self.action_widget.display_success(f"Blog article '{item['label']}' published successfully!")
+
+    def handle_review_edit(self, item_id):
+        """Handle the Edit action for a queued draft - open the text editor on it."""
+        item = self.review_queue.get(item_id)
+        if not item or not item["content"] or not self.action_widget:
+            return
+
+        edited_content = self.action_widget.open_text_editor(item["content"])
+        if edited_content is not None:
+            item["content"] = edited_content
+            item["status"] = "edited"
+            self.action_widget.update_review_card(item)
+
+    def handle_review_discard(self, item_id):
+        """Handle the Discard action for a queued draft - drop it from the queue."""
+        item = self.review_queue.pop(item_id, None)
+        if not item:
+            return
+
+        print(f"Discarding queued blog article '{item['label']}'...")
+        if self.action_widget:
+            self.action_widget.remove_review_card(item_id)
+            self._show_pipeline_status()
+
+    def handle_show_timings(self):
+        """Handle the Run Timings button - show where the last runs spent their time."""
+        runs = []
+        for trace in self.telemetry.recent_traces():
+            started = datetime.fromtimestamp(trace["start"]).strftime("%H:%M:%S")
+            model = trace["attributes"].get("model")
+            title = f"{trace['name']} at {started}" + (f" ({model})" if model else "")
+            runs.append((title, self.telemetry.breakdown(trace)))
+        if self.action_widget:
+            self.action_widget.show_run_timings(runs)
+
+    def _post_to_ui(self, callback, *args):
+        """Run a callback on the GUI thread when an action widget is attached, directly otherwise."""
+        if self.action_widget:
+            self.action_widget.run_on_ui_thread(lambda: callback(*args))
+        else:
+            callback(*args)
+
+    def collect_execute_inputs(self, main_workspace):
+        """Collect everything an Execute generation needs into a plain dict, so it can run off the GUI thread.
+
+        The context is listed by file; its chunks are loaded by the run (see get_context_chunks).
+        """
+        model = getattr(main_workspace, 'selected_model', None)
+        return {
+            "prompt": main_workspace.prompt_content,
+            "context": getattr(main_workspace, 'context_content', None),
+            "compliance": main_workspace.compliance_content,
+            "proofread": main_workspace.proofread_content,
+            "model": model,
+            "api_key": main_workspace.api_key,
+            "context_files": list(getattr(main_workspace, 'uploaded_pdf_paths', None) or []),
+            "token_limit": providers.get_context_window(model)
+        }
+
+    def generate_draft(self, inputs, cancel_token=None):
+        """Generate a blog draft from collected Execute inputs.
+
+        Switches to map-reduce when the full context does not fit the model window, then
+        plans the token budget of the final request, trimming low-priority sections to fit.
+
+        Returns:
+            dict: The LLM response, or None if the call failed
+
+        Raises:
+            BudgetExceededError: If the request cannot fit the model window even after trimming
+            RuntimeError: If map-reduce could extract only part of the context
+            CancelledError: If cancel_token is cancelled
+        """
+        context = inputs["context"]
+        chunks = inputs.get("chunks") or []
+        with self.telemetry.span("token_count", chunks=len(chunks)):
+            notes_budget = self.get_notes_budget(inputs)
+            context_tokens = sum(self._estimate_token_count(chunk, inputs["model"]) for _, chunk in chunks)
+
+        if chunks and context_tokens > notes_budget:
+            print(f"Context ({context_tokens} tokens) exceeds the available window ({notes_budget} tokens). Using map-reduce mode...")
+            with self.telemetry.span("map_reduce", chunks=len(chunks)):
+                context = self.map_reduce.reduce_context(
+                    chunks,
+                    inputs["prompt"],
+                    inputs["model"],
+                    inputs["api_key"],
+                    notes_budget,
+                    cancel_token
+                )
+            if context is None:
+                return None
+
+        with self.telemetry.span("budget_plan"):
+            plan = self.plan_budget(inputs, context)
+        print(self.format_budget(plan))
+        if not plan["fits"]:
+            raise BudgetExceededError("The request does not fit the model context window even after trimming the context.\n" + self.format_budget(plan), plan)
+
+        with self.telemetry.span("payload_assembly"):
+            texts = {section["name"]: section["text"] for section in plan["sections"]}
+            segments = self.assemble_segments(
+                texts["prompt"],
+                texts["context"],
+                texts["compliance"],
+                texts["proofread"]
+            )
+            payload = self.prepare_execute_payload(segments, inputs["model"], inputs["api_key"])
+
+        # This calls the modified _call_llm_api which respects debug_mode
+        return self._call_llm_api(payload, inputs["api_key"], inputs["model"], cancel_token=cancel_token)
+
+    def plan_budget(self, inputs, context=None):
+        """Plan the token budget of an Execute request.
+
+        Sections are counted with the model's tokenizer where available, the output tokens
+        are reserved, and sections are trimmed lowest priority first: context, then the
+        proof-read document, then the compliance document. The prompt is never trimmed.
+
+        Returns:
+            dict: Budget plan (see BudgetPlanner.plan)
+        """
+        sections = [
+            {"name": "system", "text": self.EXECUTE_SYSTEM_PROMPT, "priority": 0, "trimmable": False},
+            {"name": "prompt", "text": inputs["prompt"] or "", "priority": 0, "trimmable": False},
+            {"name": "instruction", "text": self.EXECUTE_INSTRUCTION, "priority": 0, "trimmable": False},
+            {"name": "compliance", "text": inputs["compliance"] or "", "priority": 1, "trimmable": True},
+            {"name": "proofread", "text": inputs["proofread"] or "", "priority": 2, "trimmable": True},
+            {"name": "context", "text": context or "", "priority": 3, "trimmable": True},
+        ]
+        return self.budget_planner.plan(
+            sections,
+            inputs["token_limit"],
+            self.EXECUTE_MAX_TOKENS,
+            model=providers.get_model_spec(inputs["model"]).api_model
+        )
+
+    def format_budget(self, plan):
+        """Format a budget plan as a plain-text breakdown."""
+        lines = [f"Token budget for {plan['model']} ({'exact' if plan['exact'] else 'estimated'} counts):"]
+        for section in plan["sections"]:
+            line = f"  {section['name']}: {section['tokens']}"
+            if section["trimmed"]:
+                line += f" (trimmed from {section['original_tokens']})"
+            lines.append(line)
+        lines.append(f"  reserved output: {plan['reserved_output']}")
+        lines.append(f"  total: {plan['total_input'] + plan['reserved_output'] + plan['message_overhead']}/{plan['context_window']}")
+        return "\n".join(lines)
+
+    def validate_budget_preconditions(self, main_workspace):
+        """Validate the inputs a budget preview needs.
+
+        Tokens are counted locally, so no API key is required; documents not uploaded yet
+        are counted as empty.
+
+        Returns:
+            list: List of error messages (empty if all preconditions are met)
+        """
+        errors = []
+        if not getattr(main_workspace, 'prompt_content', None):
+            errors.append("Prompt Definition not completed")
+        elif not getattr(main_workspace, 'selected_model', None):
+            errors.append("LLM model not selected in Prompt Definition")
+        return errors
+
+    def handle_budget_preview(self, main_workspace):
+        """Handle the Check Budget button - show the token budget of the next Produce without sending it."""
+        validation_errors = self.validate_budget_preconditions(main_workspace)
+        if validation_errors:
+            error_message = "Cannot plan the budget. Please complete the following:\n" + "\n".join([f"• {error}" for error in validation_errors])
+            if self.action_widget:
+                self.action_widget.display_error(error_message)
+            return
+
+        inputs = self.collect_execute_inputs(main_workspace)
+        chunks = self.get_context_chunks(getattr(main_workspace, 'pdf_processor', None), inputs["context_files"])
+        notes_budget = self.get_notes_budget(inputs)
+        context_tokens = sum(self._estimate_token_count(chunk, inputs["model"]) for _, chunk in chunks)
+        map_reduce = bool(chunks) and context_tokens > notes_budget
+
+        plan = self.plan_budget(inputs, inputs["context"])
+        print(self.format_budget(plan))
+        if self.action_widget:
+            self.action_widget.display_budget(plan, map_reduce=map_reduce)
+
+    def assemble_segments(self, prompt, context, compliance, proofread):
+        """Assemble all inputs into ordered prompt segments, from most stable to most volatile.
+
+        The compliance and proof-read documents rarely change between runs, so they come first
+        and form a prefix that providers can cache. The context changes per article and the
+        user prompt per run, so they come last.
+
+        Returns:
+            list: Segment dicts with 'name', 'text', 'stable' and 'hash' keys
+        """
+        sections = [
+            ("compliance", "Compliance Document", compliance, True),
+            ("proofread", "Proof-read Document", proofread, True),
+            ("context", "Uploaded Context", context, False),
+            ("prompt", "User-defined Prompt", prompt, False),
+        ]
+
+        segments = []
+        for name, title, content, stable in sections:
+            text = f"{title}:\n{content or ''}\n\n"
+            segments.append({
+                "name": name,
+                "text": text,
+                "stable": stable,
+                "hash": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+            })
+
+        segments.append({
+            "name": "instruction",
+            "text": self.EXECUTE_INSTRUCTION,
+            "stable": False,
+            "hash": None
+        })
+        return segments
+
     def assemble_input(self, prompt, context, compliance, proofread):
         """Assemble all inputs into a combined prompt for the LLM."""
-        combined_input = f"""
-User-defined Prompt:
-{prompt}
+        return "".join(segment["text"] for segment in self.assemble_segments(prompt, context, compliance, proofread))
+
+    def get_context_chunks(self, pdf_processor, file_paths):
+        """Get all (source_name, chunk_text) pairs of the context files, untrimmed by the token limit.
+
+        Files the processor has not seen yet are extracted and chunked first, so call this off the GUI thread.
+        """
+        if not pdf_processor or not file_paths:
+            return []
+        return pdf_processor.get_chunks(file_paths)
+
+    def get_notes_budget(self, inputs):
+        """Get the tokens left for context once the other sections and the output are reserved."""
+        fixed_tokens = sum(
+            self._estimate_token_count(inputs.get(name) or '', inputs.get("model"))
+            for name in ('prompt', 'compliance', 'proofread')
+        )
+        fixed_tokens += self._estimate_token_count(self.EXECUTE_SYSTEM_PROMPT + self.EXECUTE_INSTRUCTION, inputs.get("model"))
+        return inputs["token_limit"] - fixed_tokens - self.EXECUTE_MAX_TOKENS
+
+    def _estimate_token_count(self, text, model=None):
+        """Count tokens with the shared TokenCounter (exact where the model's tokenizer is available)."""
+        return self.token_counter.count(text, providers.get_model_spec(model).api_model if model else None)
 
-Uploaded Context:
-{context}
+    def prepare_map_payload(self, chunk, prompt, model):
+        """Prepare the payload for a map-reduce extraction call over a single context chunk.
+
+        The writing brief is shared by every chunk of a run, so it leads the user message
+        as a cacheable block ahead of the per-chunk excerpt.
+        """
+        brief = {"type": "text", "text": f"Writing brief:\n{prompt}\n\n"}
+        if self.prompt_caching:
+            brief["cache"] = True
 
-Compliance Document:
-{compliance}
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a research assistant. Extract the facts, findings, figures and quotable statements from the provided excerpt that are relevant to the writing brief. Reply with concise bullet-point notes only."
+                },
+                {
+                    "role": "user",
+                    "content": [brief, {"type": "text", "text": f"Excerpt:\n{chunk}"}]
+                }
+            ],
+            "temperature": 0.2,
+            "max_tokens": self.MAP_MAX_TOKENS
+        }
+        return payload
 
-Proof-read Document:
-{proofread}
+    def prepare_execute_payload(self, segments, model, api_key):
+        """Prepare the payload for the Execute LLM API call.
 
-Please generate a blog article based on the above information, following the compliance requirements and incorporating the provided context.
-"""
-        return combined_input
+        The user message is a list of text blocks in segment order. When prompt caching is
+        enabled, the last stable block carries a "cache" marker and the payload a "cache_key"
+        derived from the stable prefix hashes; the provider adapters translate both into
+        their native prompt-caching controls.
+        """
+        system_prompt = self.EXECUTE_SYSTEM_PROMPT
+        blocks = [{"type": "text", "text": segment["text"]} for segment in segments]
 
-    def prepare_execute_payload(self, combined_input, model, api_key):
-        """Prepare the payload for the Execute LLM API call."""
         payload = {
             "model": model,
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are a professional blog writer. Generate high-quality blog articles based on the provided prompt, context, compliance requirements, and proofread document."
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
-                    "content": combined_input
+                    "content": blocks
                 }
             ],
             "temperature": 0.7,
-            "max_tokens": 2000
+            "max_tokens": self.EXECUTE_MAX_TOKENS
         }
+
+        stable_indexes = [index for index, segment in enumerate(segments) if segment["stable"]]
+        if self.prompt_caching and stable_indexes:
+            blocks[stable_indexes[-1]]["cache"] = True
+            prefix = system_prompt + "".join(segments[index]["hash"] for index in stable_indexes)
+            payload["cache_key"] = "cogito-" + hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:24]
         return payload
 
+    def proofread_draft(self, draft, inputs, cancel_token=None):
+        """Run the automated proof-read pass over a generated draft.
+
+        Returns:
+            tuple: (corrected article, list of flags for the reviewer)
+
+        Raises:
+            RuntimeError: If the proof-read call fails
+        """
+        payload = self.prepare_proofread_payload(draft, inputs["proofread"], inputs["compliance"], inputs["model"])
+        llm_response = self._call_llm_api(payload, inputs["api_key"], inputs["model"], cancel_token=cancel_token)
+        reply = self.extract_blog_content(llm_response) if llm_response else None
+        if not reply:
+            raise RuntimeError("Proof-read LLM call failed")
+        return self.parse_proofread_reply(reply, draft)
+
+    def prepare_proofread_payload(self, draft, proofread, compliance, model):
+        """Prepare the payload for the proof-read pass.
+
+        The proof-read guide and compliance document are the same for every draft of a
+        batch, so they lead the user message as a cacheable block ahead of the draft.
+        """
+        guide = {"type": "text", "text": f"Proof-read guide:\n{proofread or ''}\n\nCompliance requirements:\n{compliance or ''}\n\n"}
+        if self.prompt_caching:
+            guide["cache"] = True
+
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.PROOFREAD_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": [guide, {"type": "text", "text": f"Draft:\n{draft}\n\n{self.PROOFREAD_INSTRUCTION}"}]
+                }
+            ],
+            "temperature": 0.2,
+            "max_tokens": self.EXECUTE_MAX_TOKENS
+        }
+        return payload
+
+    def parse_proofread_reply(self, reply, draft):
+        """Split a proof-read reply into the corrected article and its reviewer flags."""
+        article, _, flags_text = reply.partition(self.FLAGS_MARKER)
+        article = article.strip() or draft
+        flags = [line.strip().lstrip("-•* ").strip() for line in flags_text.splitlines()]
+        return article, [flag for flag in flags if flag]
+
     def extract_blog_content(self, llm_response):
         """Extract the blog content from the LLM response."""
         try:
@@ -166,18 +1185,37 @@ Please generate a blog article based on the above information, following the com
                 "type": "blog_output",
                 "content": output[:500] + "..." if len(output) > 500 else output,  # Show preview
                 "full_content": output,
-                "actions": ["Publish", "Edit", "Discard"]
+                "actions": ["Publish", "Edit", "Regenerate", "Discard"]
             }
+            if self.current_document:
+                action_card["sections"] = len(self.current_document.sections)
+                action_card["locked_sections"] = len(self.current_document.locked_sections())
             self.action_widget.display_output_card(action_card)
 
+    def _publish(self, content, label=None):
+        """Publish a blog article to the CMS.
+
+        Shared by the Publish action of the current draft and of queued batch drafts. No
+        CMS (Sanity) connection is configured in this version, so publishing reports that
+        and fails, keeping the draft (and the Execute loop or review queue entry) as it is.
+
+        Returns:
+            bool: Whether the article was published
+        """
+        name = f"'{label}'" if label else "the blog article"
+        message = f"Could not publish {name}: publishing is not configured (no Sanity connection is set up)."
+        print(message)
+        if self.action_widget:
+            self.action_widget.display_error(message)
+        return False
+
     def handle_publish(self):
-        """Handle the Publish action - placeholder for future Sanity API integration."""
+        """Handle the Publish action - publish the current draft and end the loop."""
         if not self.current_loop_active or not self.current_output:
             return
 
-        print("Publishing blog article...")
-        # TODO: Implement Sanity API call here
-        print("Blog article published successfully! (Placeholder)")
+        if not self._publish(self.current_output):
+            return
 
         if self.action_widget:
             self.action_widget.display_success("Blog article published successfully!")
@@ -185,6 +1223,8 @@ Please generate a blog article based on the above information, following the com
         # End the loop
         self.current_loop_active = False
         self.current_output = None
+        self.current_document = None
+        self.current_inputs = None
 
     def handle_edit(self):
         """Handle the Edit action - open text editor for the output."""
@@ -197,10 +1237,141 @@ Please generate a blog article based on the above information, following the com
             # Open a full-featured text editor with the current output
             edited_content = self.action_widget.open_text_editor(self.current_output)
             if edited_content is not None:  # User saved the edited content
-                self.current_output = edited_content
+                # Lock the sections the user changed so regeneration leaves them alone
+                if self.current_document is None:
+                    self.current_document = DraftDocument(self.current_output)
+                locked = self.current_document.apply_edit(edited_content)
+                print(f"Edit saved: {len(locked)} section(s) locked.")
+                self.current_output = self.current_document.render()
                 # Present the edited content for another round of actions
                 self.present_output_actions(self.current_output)
 
+    def handle_regenerate(self):
+        """Handle the Regenerate action - rewrite selected unlocked sections, keeping locked edits."""
+        if not self.current_loop_active or not self.current_document or not self.current_inputs:
+            return
+
+        unlocked = self.current_document.unlocked_sections()
+        if not unlocked:
+            if self.action_widget:
+                self.action_widget.display_info("Every section has been edited and is locked. Nothing to regenerate.")
+            return
+
+        section_ids = [section["id"] for section in unlocked]
+        if self.action_widget:
+            section_ids = self.action_widget.choose_rework_sections(self.current_document)
+            if not section_ids:
+                return
+
+        print(f"Regenerating {len(section_ids)} of {len(self.current_document.sections)} sections...")
+        document, inputs = self.current_document, self.current_inputs
+        # The marked draft is captured here; the reply is applied back on the GUI thread
+        payload = self.prepare_regenerate_payload(document, section_ids, inputs)
+        cancel_token = self._start_run("regenerate", self._request_key(payload, inputs["api_key"], inputs["model"]))
+        if self.action_widget:
+            self.action_widget.display_progress(f"Regenerating {len(section_ids)} section(s)...")
+            self._show_pipeline_status()
+        threading.Thread(
+            target=self._run_regenerate,
+            args=(document, section_ids, payload, inputs, cancel_token),
+            name="cogito-regenerate",
+            daemon=True
+        ).start()
+
+    def _run_regenerate(self, document, section_ids, payload, inputs, cancel_token):
+        """Request a section regeneration on a worker thread and post the reply to the GUI thread."""
+        reply, error = None, None
+        try:
+            with self.telemetry.span("regenerate", model=inputs["model"], sections=len(section_ids)):
+                reply = self.request_regeneration(payload, inputs, cancel_token)
+        except (CancelledError, RuntimeError) as e:
+            error = e
+        except Exception as e:
+            error = RuntimeError(f"Section regeneration failed: {type(e).__name__}: {e}")
+        self._post_to_ui(self._on_regenerate_result, document, section_ids, cancel_token, reply, error)
+
+    def _on_regenerate_result(self, document, section_ids, cancel_token, reply, error):
+        """Apply a regeneration reply to the draft, unless it was cancelled or superseded."""
+        if not self._finish_run("regenerate", cancel_token):
+            return  # Superseded by a newer regeneration
+        if document is not self.current_document:
+            return  # The draft was discarded or replaced meanwhile
+
+        if isinstance(error, CancelledError) or cancel_token.is_cancelled:
+            print("Section regeneration cancelled.")
+            if self.action_widget:
+                self.action_widget.display_info("Regeneration cancelled.")
+        elif error:
+            print(str(error))
+            if self.action_widget:
+                self.action_widget.display_error(str(error))
+        else:
+            # Sections the user edited while the request ran are locked and kept
+            replaced = document.apply_regeneration(reply, section_ids)
+            print(f"Regenerated {len(replaced)} section(s).")
+            self.current_output = document.render()
+        self.present_output_actions(self.current_output)
+
+    def regenerate_sections(self, document, section_ids, inputs, cancel_token=None):
+        """Rewrite the given unlocked sections of a draft document in place.
+
+        Only the sections to rework are requested as output, so the response is a fraction
+        of a full article; the rest of the draft is sent as input for coherence.
+
+        Returns:
+            list: Ids of the sections that were replaced
+
+        Raises:
+            RuntimeError: If the LLM call fails
+            CancelledError: If cancel_token is cancelled
+        """
+        payload = self.prepare_regenerate_payload(document, section_ids, inputs)
+        return document.apply_regeneration(self.request_regeneration(payload, inputs, cancel_token), section_ids)
+
+    def request_regeneration(self, payload, inputs, cancel_token=None):
+        """Send a section regeneration request (see prepare_regenerate_payload).
+
+        Returns:
+            str: The reply, made of section markers each followed by its new text
+
+        Raises:
+            RuntimeError: If the LLM call fails
+            CancelledError: If cancel_token is cancelled
+        """
+        llm_response = self._call_llm_api(payload, inputs["api_key"], inputs["model"], cancel_token=cancel_token)
+        reply = self.extract_blog_content(llm_response) if llm_response else None
+        if not reply:
+            raise RuntimeError("Section regeneration failed. Please check your API key and try again.")
+        return reply
+
+    def prepare_regenerate_payload(self, document, section_ids, inputs):
+        """Prepare the payload for a section regeneration call.
+
+        Reuses the Execute segments, so the cached compliance and proof-read prefix is shared
+        with the original generation, and replaces the final instruction with the marked draft.
+        Output tokens are reserved for the reworked sections only.
+        """
+        segments = self.assemble_segments(
+            inputs["prompt"],
+            inputs["context"],
+            inputs["compliance"],
+            inputs["proofread"]
+        )[:-1]
+        segments.append({
+            "name": "draft",
+            "text": f"{self.REGENERATE_INSTRUCTION}\n{document.render_for_rework(section_ids)}\n",
+            "stable": False,
+            "hash": None
+        })
+        payload = self.prepare_execute_payload(segments, inputs["model"], inputs["api_key"])
+
+        rework_tokens = sum(
+            self._estimate_token_count(document.get_section(section_id)["text"], inputs["model"])
+            for section_id in section_ids
+        )
+        payload["max_tokens"] = min(self.EXECUTE_MAX_TOKENS, int(rework_tokens * 1.5) + 50 * len(section_ids))
+        return payload
+
     def handle_discard(self):
         """Handle the Discard action - terminate the process."""
         if not self.current_loop_active:
@@ -215,32 +1386,132 @@ Please generate a blog article based on the above information, following the com
         # End the loop
         self.current_loop_active = False
         self.current_output = None
+        self.current_document = None
+        self.current_inputs = None
 
-    def _call_llm_api(self, payload, api_key=None, model=None):
-        """Calls the LLM API with the prepared payload."""
-        # Determine API endpoint based on model for logging purposes
-        if model and model.startswith('gpt'):
-            LLM_API_ENDPOINT = "[https://api.openai.com/v1/chat/completions](https://api.openai.com/v1/chat/completions)"
-        elif model and model.startswith('claude'):
-            LLM_API_ENDPOINT = "[https://api.anthropic.com/v1/messages](https://api.anthropic.com/v1/messages)"
-        else:
-            LLM_API_ENDPOINT = "[https://api.openai.com/v1/chat/completions](https://api.openai.com/v1/chat/completions)"  # Default to OpenAI
+    def _call_llm_api(self, payload, api_key=None, model=None, on_delta=None, cancel_token=None):
+        """Calls the LLM API, coalescing identical requests that are already in flight.
 
-        # Log the payload regardless of debug mode
-        # Use the determined endpoint in the log message
-        log_content = f"API Call Simulation/Payload:\nEndpoint: {LLM_API_ENDPOINT}\nPayload:\n{json.dumps(payload, indent=2)}"
-        self._log_to_file(log_content, prefix="api_call")
-        print(f"Logged API call details to file. Simulating call to endpoint: {LLM_API_ENDPOINT}")
+        Requests with the same payload, model and API key share one underlying call
+        (see SingleFlight); a coalesced streaming caller receives the full text as a
+        single delta when the shared call completes.
+
+        Args:
+            payload (dict): OpenAI-shaped payload
+            api_key (str): Provider API key
+            model (str): Model display name or API id
+            on_delta (callable, optional): Stream the response, calling on_delta(text) per text delta
+            cancel_token (CancellationToken, optional): Withdraws this caller and stops its streaming;
+                the connection is aborted once no coalesced caller is left
+
+        Returns:
+            dict: Normalized response (see ProviderAdapter), or None if the call failed
+
+        Raises:
+            CancelledError: If cancel_token is cancelled
+        """
+        key = self._request_key(payload, api_key, model)
+        stream = None
+        if on_delta:
+            # A leader cancelled while waiters keep its call running stops receiving deltas
+            stream = lambda text: None if cancel_token and cancel_token.is_cancelled else on_delta(text)
+        response, coalesced = self.single_flight.do(
+            key,
+            lambda call_token: self._send_llm_request(payload, api_key, model, stream, call_token),
+            cancel_token
+        )
+        if coalesced:
+            stats = self.single_flight.get_stats()
+            print(f"Coalesced duplicate LLM request onto the in-flight call ({stats['coalesced']} coalesced so far).")
+            if on_delta and response:
+                content = self.extract_blog_content(response)
+                if content:
+                    on_delta(content)
+        return response
+
+    def _request_key(self, payload, api_key, model):
+        """Hash the identity of an LLM request: payload, model and API key."""
+        identity = json.dumps({"payload": payload, "model": model, "api_key": api_key or ""}, sort_keys=True)
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get_llm_call_stats(self):
+        """Get LLM request counters: calls made, calls executed, calls coalesced, calls in flight."""
+        return self.single_flight.get_stats()
+
+    def _debug_tool_arguments(self, payload):
+        """Sample arguments for the forced tool of a debug mode request, built from its parameter schema.
+
+        Arrays hold one item per numbered article of the request ([1], [2], ...), and integer
+        fields of an item hold its number, so judge_articles gets a judgment per article and
+        suggest_post a single suggestion.
+        """
+        tool = next((tool for tool in payload["tools"] if tool["name"] == payload.get("tool_choice")), payload["tools"][0])
+        text = "\n".join(
+            message["content"] if isinstance(message["content"], str) else "".join(block.get("text", "") for block in message["content"])
+            for message in payload.get("messages", [])
+        )
+        count = len(re.findall(r"^\[\d+\] ", text, re.MULTILINE)) or 1
+
+        def build(node, name="", position=None):
+            node_type = node.get("type")
+            if "enum" in node:
+                return node["enum"][0]
+            if node_type == "object":
+                return {key: build(child, key, position) for key, child in node.get("properties", {}).items()}
+            if node_type == "array":
+                return [build(node.get("items", {}), name, number) for number in range(1, count + 1)]
+            if node_type == "integer":
+                return position or 1
+            if node_type == "number":
+                return 0
+            if node_type == "boolean":
+                return True
+            return f"[DEBUG MODE] Sample {name.replace('_', ' ')}"
+
+        return build(tool["parameters"])
+
+    def _send_llm_request(self, payload, api_key=None, model=None, on_delta=None, cancel_token=None):
+        """Sends the prepared payload through the provider adapter for the model.
+
+        Args:
+            payload (dict): OpenAI-shaped payload
+            api_key (str): Provider API key
+            model (str): Model display name or API id
+            on_delta (callable, optional): Stream the response, calling on_delta(text) per text delta
+            cancel_token (CancellationToken, optional): Aborts the connection and stops streaming
+
+        Returns:
+            dict: Normalized response (see ProviderAdapter), or None if the call failed
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        # Resolve the model to its native endpoint for the call and for logging purposes
+        try:
+            spec, adapter = providers.resolve(model)
+            LLM_API_ENDPOINT = adapter.endpoint(spec, stream=on_delta is not None)
+        except ProviderError as e:
+            spec, adapter = None, None
+            LLM_API_ENDPOINT = f"unavailable ({e})"
+
+        # Log the payload regardless of debug mode; serialization happens on the log writer thread
+        self._log_record("api_call", endpoint=LLM_API_ENDPOINT, model=model, debug=self.debug_mode, payload=payload)
 
 
         # If debug mode is enabled, return a mock response immediately
         if self.debug_mode:
             print("Debug mode enabled. Using mock response instead of actual API call.")
+            content = "[DEBUG MODE] This is a sample blog article generated for testing purposes. The actual LLM API call was skipped. Payload received:\n\n" + json.dumps(payload, indent=2)
+            if payload.get("tools"):
+                # Function-calling requests get sample arguments in the tool's shape
+                content = json.dumps(self._debug_tool_arguments(payload))
+            if on_delta:
+                on_delta(content)
             return {
                 "choices": [
                     {
                         "message": {
-                            "content": "[DEBUG MODE] This is a sample blog article generated for testing purposes. The actual LLM API call was skipped. Payload received:\n\n" + json.dumps(payload, indent=2)
+                            "content": content
                         }
                     }
                 ]
@@ -261,24 +1532,50 @@ Please generate a blog article based on the above information, following the com
                 ]
             }
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        if adapter is None:
+            print(f"Cannot call LLM API: endpoint {LLM_API_ENDPOINT}")
+            return None
 
         try:
             print(f"Making actual API call to {LLM_API_ENDPOINT}...")
-            response = requests.post(LLM_API_ENDPOINT, json=payload, headers=headers, timeout=60)
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            print("API call successful.")
-            return response.json()
+            with self.telemetry.span("llm_call", provider=spec.provider, model=spec.api_model, stream=on_delta is not None) as span:
+                response = adapter.complete(payload, api_key, spec, timeout=60, on_delta=on_delta, cancel_token=cancel_token)
+                span["attributes"].update(response["usage"])
+            self._record_llm_metrics(spec.provider, "ok", response)
+            usage = response["usage"]
+            latency = response["latency"]
+            print(
+                f"API call successful ({response['provider']}/{response['model']}): "
+                f"{usage['input_tokens']} input tokens ({usage['cached_input_tokens']} cached), "
+                f"{usage['output_tokens']} output tokens, {latency['total_ms']} ms"
+                + (f", first token after {latency['ttft_ms']} ms" if latency['ttft_ms'] is not None else "")
+            )
+            self._log_record("api_response", endpoint=LLM_API_ENDPOINT, model=model, usage=usage, latency=latency)
+            return response
+        except CancelledError:
+            print(f"LLM API call to {LLM_API_ENDPOINT} cancelled.")
+            self._record_llm_metrics(spec.provider, "cancelled")
+            raise
         except requests.exceptions.RequestException as e:
             print(f"Error calling LLM API: {e}")
+            self._record_llm_metrics(spec.provider, "error")
             return None
         except Exception as e:
             print(f"An unexpected error occurred during LLM API call: {e}")
+            self._record_llm_metrics(spec.provider, "error")
             return None
 
+    def _record_llm_metrics(self, provider, outcome, response=None):
+        """Count an LLM call by outcome, with its token usage and time to first token."""
+        self.telemetry.increment("cogito_llm_requests_total", provider=provider, outcome=outcome)
+        if not response:
+            return
+        for direction in ("input_tokens", "output_tokens", "cached_input_tokens"):
+            self.telemetry.increment("cogito_llm_tokens_total", response["usage"][direction] or 0, provider=provider, kind=direction)
+        self.telemetry.increment("cogito_llm_retries_total", response["latency"]["retries"] or 0, provider=provider)
+        if response["latency"]["ttft_ms"] is not None:
+            self.telemetry.observe("cogito_llm_ttft_seconds", response["latency"]["ttft_ms"] / 1000, provider=provider)
+
     # The pack_contexts method is unchanged as it's for logging, not the API call payload assembly
     def pack_contexts(self, main_workspace):
         """Pack all contexts (compliance document, prompt, context, proofread document) into a single digestible content for API call.
@@ -299,30 +1596,8 @@ Please generate a blog article based on the above information, following the com
             "timestamp": self._get_timestamp()
         }
 
-        # Create a formatted string representation for logging
-        log_content = f"""=== COGITO CONTEXT PACK ===
-        Timestamp: {contexts['timestamp']}
-        Model: {contexts['model']}
-        Temperature: {contexts['temperature']}
-        Max Tokens: {contexts['max_tokens']}
-
-        === COMPLIANCE DOCUMENT ===
-        {contexts['compliance_document']}
-
-        === PROMPT ===
-        {contexts['prompt']}
-
-        === CONTEXT ===
-        {contexts['context']}
-
-        === PROOFREAD DOCUMENT ===
-        {contexts['proofread_document']}
-
-        === END OF CONTEXT PACK ===
-        """
-
-        # Log to file
-        self._log_to_file(log_content)
+        # Log the structured context pack
+        self._log_record("context_pack", **contexts)
 
         print("Context pack created and logged to file.")
         return contexts
@@ -332,68 +1607,46 @@ Please generate a blog article based on the above information, following the com
         from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
-    def _log_to_file(self, content, prefix="context_pack"):
-        """Log content to a file in the project directory.
+    def _log_record(self, kind, **fields):
+        """Queue a structured record on the JSONL logger.
 
         Args:
-            content (str): The content to log
-            prefix (str): A prefix for the log filename
-        """
-        try:
-            # Create logs directory if it doesn't exist
-            if not os.path.exists("logs"):
-                os.makedirs("logs")
-
-            # Create log file with timestamp
-            filename = f"logs/cogito_{prefix}_{self._get_timestamp()}.txt"
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(content)
+            kind (str): Record type
+            **fields: Record fields
 
-            print(f"Log file created: {filename}")
-            return filename
-        except Exception as e:
-            print(f"Error writing log file: {e}")
-            return None
+        Returns:
+            str: Path of the log file the record goes to, or None if it was dropped
+        """
+        filename = self.logger.log(kind, **fields)
+        if filename is None:
+            print(f"Log record '{kind}' dropped: log queue is full.")
+        return filename
 
-    # Log methods remain unchanged as they are for logging data inputs
+    # Log methods for the data inputs, one structured record each
     def log_compliance_document(self, content):
         """Log compliance document content"""
-        log_content = f"=== COGITO COMPLIANCE DOCUMENT ===\nTimestamp: {self._get_timestamp()}\n\n{content}\n\n=== END OF COMPLIANCE DOCUMENT ==="
-        filename = self._log_to_file(log_content, prefix="compliance")
-        return filename
+        return self._log_record("compliance", content=content)
 
     def log_prompt_definition(self, content, model, temperature, max_tokens):
         """Log prompt definition content"""
-        log_content = f"=== COGITO PROMPT DEFINITION ===\nTimestamp: {self._get_timestamp()}\nModel: {model}\nTemperature: {temperature}\nMax Tokens: {max_tokens}\n\n{content}\n\n=== END OF PROMPT DEFINITION ==="
-        filename = self._log_to_file(log_content, prefix="prompt")
-        return filename
+        return self._log_record("prompt", content=content, model=model, temperature=temperature, max_tokens=max_tokens)
 
     def log_context_upload(self, content):
         """Log context upload content"""
-        log_content = f"=== COGITO CONTEXT UPLOAD ===\nTimestamp: {self._get_timestamp()}\n\n{content}\n\n=== END OF CONTEXT UPLOAD ==="
-        filename = self._log_to_file(log_content, prefix="context")
-        return filename
+        return self._log_record("context", content=content)
 
     def log_proofread_document(self, content):
         """Log proofread document content"""
-        log_content = f"=== COGITO PROOFREAD DOCUMENT ===\nTimestamp: {self._get_timestamp()}\n\n{content}\n\n=== END OF PROOFREAD DOCUMENT ==="
-        filename = self._log_to_file(log_content, prefix="proofread")
-        return filename
+        return self._log_record("proofread", content=content)
 
     def log_research_compliance(self, content):
         """Log research compliance document content"""
-        log_content = f"=== COGITO RESEARCH COMPLIANCE DOCUMENT ===\nTimestamp: {self._get_timestamp()}\n\n{content}\n\n=== END OF RESEARCH COMPLIANCE DOCUMENT ==="
-        filename = self._log_to_file(log_content, prefix="research_compliance")
-        return filename
+        return self._log_record("research_compliance", content=content)
 
     def log_research_prompt(self, content, model, temperature, max_tokens):
         """Log research prompt definition content"""
-        log_content = f"=== COGITO RESEARCH PROMPT DEFINITION ===\nTimestamp: {self._get_timestamp()}\nModel: {model}\nTemperature: {temperature}\nMax Tokens: {max_tokens}\n\n{content}\n\n=== END OF RESEARCH PROMPT DEFINITION ==="
-        filename = self._log_to_file(log_content, prefix="research_prompt")
-        return filename
+        return self._log_record("research_prompt", content=content, model=model, temperature=temperature, max_tokens=max_tokens)
 
     def log_rss_feeds(self, feeds):
         """Log RSS feeds content"""
-        log_content = f"=== COGITO RSS FEEDS ===\nTimestamp: {self._get_timestamp()}\n\n{feeds}\n\n=== END OF RSS FEEDS ==="
-        filename = self._log_to_file(log_content, prefix="rss_feeds")
-        return filename
\ No newline at end of file
+        return self._log_record("rss_feeds", content=feeds)
\ No newline at end of file
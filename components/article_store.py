@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ArticleStore:
+    """
+    SQLite store of the feed articles seen by research runs and their LLM judgments.
+
+    Articles are keyed by their DOI or feed GUID (the parser's entry id) and keep their
+    first and last seen times, a hash of their feed abstract, and the relevance judgment
+    of the run that reviewed them, tagged with a hash of the research query (compliance
+    document and research prompt) it was judged against. Articles the local relevance
+    filter rejected are never judged; they get a separate rejection marker tagged the
+    same way. A research run only sends articles that are new, whose abstract changed,
+    or that were judged or rejected against another query to the LLM; everything else
+    reuses its stored outcome.
+    """
+
+    # The latest of an article's judgment and rejection decides whether it is settled
+    SETTLED_HASH = "CASE WHEN COALESCE(rejected_at, 0) > COALESCE(judged_at, 0) THEN rejected_hash ELSE judged_hash END"
+    SETTLED_QUERY = "CASE WHEN COALESCE(rejected_at, 0) > COALESCE(judged_at, 0) THEN rejected_query ELSE judged_query END"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id TEXT PRIMARY KEY,
+            doi TEXT,
+            title TEXT,
+            link TEXT,
+            feed TEXT,
+            abstract_hash TEXT,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            relevance REAL,
+            judgment TEXT,
+            judged_hash TEXT,
+            judged_query TEXT,
+            judged_at REAL,
+            rejected_hash TEXT,
+            rejected_query TEXT,
+            rejected_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS articles_feed ON articles (feed);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path=os.path.join("data", "articles.db")):
+        """
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """Open the database on first use (callers hold the lock)."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Research runs use the store from worker threads; the lock serializes access
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(articles)")}
+            # Stores created before judgments were tied to a query, or rejections were recorded;
+            # their judgments count as stale
+            for column, kind in (("judged_query", "TEXT"), ("rejected_hash", "TEXT"), ("rejected_query", "TEXT"), ("rejected_at", "REAL")):
+                if column not in columns:
+                    self._connection.execute(f"ALTER TABLE articles ADD COLUMN {column} {kind}")
+        return self._connection
+
+    @staticmethod
+    def abstract_hash(article):
+        """Hash of an article's feed abstract and title, to detect changed entries."""
+        text = f"{article.get('title', '')}\n{article.get('abstract', '')}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def query_hash(compliance, prompt):
+        """Hash of the research query (compliance document and research prompt) articles are judged against."""
+        text = f"{compliance or ''}\n{prompt or ''}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def judged_hashes(self, query_hash=None):
+        """
+        Get the abstract hash each judged or rejected article had when it was last judged or rejected
+
+        Args:
+            query_hash (str, optional): Only judgments and rejections made against this research query
+
+        Returns:
+            dict: Article id -> judged abstract hash
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT id, {self.SETTLED_HASH} FROM articles WHERE {self.SETTLED_HASH} IS NOT NULL AND {self.SETTLED_QUERY} IS ?",
+                (query_hash,)
+            ).fetchall()
+        return dict(rows)
+
+    def get_meta(self, key):
+        """Get a stored setting of the research runs, or None."""
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        """Store a setting of the research runs."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def unjudged_feeds(self, query_hash=None):
+        """
+        Get the feeds with articles that were seen but not judged yet (deferred or left out of a run)
+
+        Articles rejected against the same research query count as settled.
+
+        Args:
+            query_hash (str, optional): Research query of the run (see query_hash)
+
+        Returns:
+            set: Feed names
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT DISTINCT feed FROM articles WHERE judged_at IS NULL AND rejected_query IS NOT ?",
+                (query_hash,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def triage(self, articles, query_hash=None):
+        """
+        Record the articles of a run and pick out those that need a judgment
+
+        New articles are inserted with their first-seen time; every article's last-seen
+        time and current abstract hash are updated. Each article dict gets its
+        'abstract_hash', so a judgment stays tied to the feed abstract even after a
+        scraped abstract is filled in.
+
+        Args:
+            articles (list): Parsed feed entries (see StreamingFeedParser)
+            query_hash (str, optional): Research query of the run (see query_hash)
+
+        Returns:
+            list: Articles that are new or changed since they were last judged or rejected, or
+                were judged or rejected against another query, in input order
+        """
+        now = time.time()
+        pending = []
+        with self._lock:
+            connection = self._connect()
+            known = {}
+            ids = [article["id"] for article in articles]
+            # Look the ids up in chunks to stay under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in connection.execute(f"SELECT id, {self.SETTLED_HASH}, {self.SETTLED_QUERY} FROM articles WHERE id IN ({placeholders})", chunk):
+                    known[row[0]] = (row[1], row[2])
+
+            with connection:
+                for article in articles:
+                    digest = article["abstract_hash"] = self.abstract_hash(article)
+                    if article["id"] in known:
+                        connection.execute(
+                            "UPDATE articles SET last_seen = ?, abstract_hash = ?, title = ?, link = ? WHERE id = ?",
+                            (now, digest, article.get("title"), article.get("link"), article["id"])
+                        )
+                    else:
+                        connection.execute(
+                            "INSERT INTO articles (id, doi, title, link, feed, abstract_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (article["id"], article.get("doi"), article.get("title"), article.get("link"), article.get("feed"), digest, now, now)
+                        )
+                    if known.get(article["id"]) != (digest, query_hash):
+                        pending.append(article)
+                        known[article["id"]] = (digest, query_hash)  # Duplicates across feeds are judged once
+        return pending
+
+    def record_judgments(self, articles, suggestions, query_hash=None):
+        """
+        Store the outcome of judging a set of articles
+
+        Articles matched by a suggestion (by link, then title) are stored as relevant with
+        the suggestion as their judgment; the others as not relevant.
+
+        Args:
+            articles (list): The articles that were sent to the LLM
+            suggestions (list): The suggestions it returned
+            query_hash (str, optional): Research query they were judged against (see query_hash)
+        """
+        by_link = {suggestion.get("link"): suggestion for suggestion in suggestions if suggestion.get("link")}
+        by_title = {(suggestion.get("title") or "").strip().lower(): suggestion for suggestion in suggestions}
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for article in articles:
+                    suggestion = by_link.get(article.get("link")) or by_title.get((article.get("title") or "").strip().lower())
+                    connection.execute(
+                        "UPDATE articles SET relevance = ?, judgment = ?, judged_hash = ?, judged_query = ?, judged_at = ? WHERE id = ?",
+                        (1.0 if suggestion else 0.0, json.dumps(suggestion) if suggestion else None, article.get("abstract_hash") or self.abstract_hash(article),
+                         query_hash, now, article["id"])
+                    )
+
+    def record_rejections(self, articles, query_hash=None):
+        """
+        Mark articles the relevance filter rejected, so later runs against the same query skip them
+
+        Their abstract hash is kept like a judgment's: a changed abstract or query makes them
+        pending again. Any earlier judgment is left in place.
+
+        Args:
+            articles (list): The rejected articles (see triage)
+            query_hash (str, optional): Research query they were rejected for (see query_hash)
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "UPDATE articles SET rejected_hash = ?, rejected_query = ?, rejected_at = ? WHERE id = ?",
+                    [(article.get("abstract_hash") or self.abstract_hash(article), query_hash, now, article["id"]) for article in articles]
+                )
+
+    def get(self, article_id):
+        """
+        Get the stored record of an article
+
+        Returns:
+            dict: The article row with its judgment decoded, or None if unknown
+        """
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        if row is None:
+            return None
+        record = dict(zip(columns, row))
+        record["judgment"] = json.loads(record["judgment"]) if record["judgment"] else None
+        return record
+
+    def stats(self):
+        """Get the number of stored, judged, relevant and rejected articles."""
+        with self._lock:
+            total, judged, relevant, rejected = self._connect().execute(
+                "SELECT COUNT(*), COUNT(judged_at), COALESCE(SUM(relevance > 0), 0), COALESCE(SUM(rejected_at > COALESCE(judged_at, 0)), 0) FROM articles"
+            ).fetchone()
+        return {"articles": total, "judged": judged, "relevant": relevant, "rejected": rejected}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
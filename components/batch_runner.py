@@ -0,0 +1,107 @@
+import os
+from .pdf_processor import PDFProcessor
+
+
+class BatchRunner:
+    """
+    Generates Execute drafts for a queue of context sets.
+
+    A context set is a dict with a 'label' and the 'file_paths' of the PDFs
+    that make up its context. Each set becomes one item of the Agent's staged
+    pipeline, whose drafting stage is run_draft_stage below.
+    """
+
+    def __init__(self, agent, max_workers=3):
+        """
+        Initialize the batch runner
+
+        Args:
+            agent (Agent): Agent used to generate each draft
+            max_workers (int): Maximum number of drafts generated concurrently
+        """
+        self.agent = agent
+        self.max_workers = max_workers
+
+    @staticmethod
+    def discover_context_sets(directory):
+        """
+        Build context sets from a directory: one per sub-folder containing PDFs,
+        plus one per PDF placed directly in the directory
+
+        Args:
+            directory (str): Directory to scan
+
+        Returns:
+            list: List of context set dicts
+        """
+        context_sets = []
+
+        for entry in sorted(os.listdir(directory)):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path):
+                file_paths = [
+                    os.path.join(path, name) for name in sorted(os.listdir(path))
+                    if name.lower().endswith('.pdf')
+                ]
+                if file_paths:
+                    context_sets.append({'label': entry, 'file_paths': file_paths})
+            elif entry.lower().endswith('.pdf'):
+                context_sets.append({'label': entry, 'file_paths': [path]})
+
+        return context_sets
+
+    def submit(self, context_sets, base_inputs, cancel_token):
+        """
+        Queue context sets on the Agent's pipeline
+
+        Args:
+            context_sets (list): List of context set dicts
+            base_inputs (dict): Execute inputs shared by every set (prompt, compliance, model...)
+            cancel_token (CancellationToken): Cancels the items of this submission
+        """
+        for context_set in context_sets:
+            self.agent.pipeline.submit({
+                'label': context_set['label'],
+                'file_paths': context_set['file_paths'],
+                'inputs': base_inputs,
+                'cancel_token': cancel_token
+            })
+
+        print(f"Batch: queued {len(context_sets)} context sets on {self.max_workers} drafting workers.")
+
+    def run_draft_stage(self, item):
+        """
+        Pipeline drafting stage: process one context set and generate its draft
+
+        Args:
+            item (dict): Pipeline item with 'label', 'file_paths', 'inputs' and 'cancel_token'
+
+        Returns:
+            dict: The item with its 'content' set to the generated draft
+
+        Raises:
+            CancelledError: If the item's cancellation token is cancelled
+        """
+        item['cancel_token'].raise_if_cancelled()
+        print(f"Batch: generating draft for '{item['label']}'...")
+
+        with self.agent.telemetry.span("batch_draft", label=item['label'], model=item['inputs']['model']):
+            # Each job gets its own processor so workers never share processing state
+            pdf_processor = PDFProcessor(cancel_token=item['cancel_token'])
+            chunks = pdf_processor.get_chunks(item['file_paths'])
+            context, _, _ = pdf_processor.get_combined_text(
+                item['file_paths'],
+                max_tokens=item['inputs']['token_limit']
+            )
+
+            inputs = dict(item['inputs'], context=context, chunks=chunks)
+            llm_response = self.agent.generate_draft(inputs, item['cancel_token'])
+            if not llm_response:
+                raise RuntimeError("LLM API call failed")
+
+        content = self.agent.extract_blog_content(llm_response)
+        if not content:
+            raise RuntimeError("Failed to extract blog content from LLM response")
+
+        item['content'] = content
+        return item
@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+
+class BlobStore:
+    """
+    Content-addressed store for large logged documents.
+
+    Each distinct text body is stored once, gzip-compressed, under its SHA-256
+    hash (logs/blobs/ab/abcdef....gz). Log records keep only a {"$blob": ref}
+    reference, so the same compliance document or PDF text logged by many calls
+    takes its space on disk once.
+
+    Garbage collection (log_reader --gc) may run in another process, so put() checks
+    the disk instead of trusting an in-memory index, and refreshes a reused blob's
+    modification time; remove_unreferenced() leaves recently written or reused blobs
+    alone, since the record referencing them may not be written yet.
+    """
+
+    REF_KEY = "$blob"
+
+    def __init__(self, directory=os.path.join("logs", "blobs"), min_size=1024):
+        """
+        Args:
+            directory (str): Root directory of the blobs
+            min_size (int): Strings shorter than this (in characters) stay inline in records
+        """
+        self.directory = directory
+        self.min_size = min_size
+        self.stats = {"stored": 0, "deduplicated": 0, "bytes_written": 0}
+        self._lock = threading.Lock()
+
+    def put(self, text):
+        """
+        Store a text body once
+
+        Args:
+            text (str): Document body
+
+        Returns:
+            str: Blob reference ("sha256:<hex>")
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+
+        try:
+            # Touching the blob both checks it still exists and shields it from a concurrent GC
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        else:
+            with self._lock:
+                self.stats["deduplicated"] += 1
+            return f"sha256:{digest}"
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary name first, so readers never see a partial blob
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wb") as blob_file:
+            blob_file.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self.stats["stored"] += 1
+            self.stats["bytes_written"] += os.path.getsize(path)
+        return f"sha256:{digest}"
+
+    def get(self, ref):
+        """
+        Read a blob back
+
+        Args:
+            ref (str): Blob reference returned by put()
+
+        Returns:
+            str: The document body
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        digest = ref.split(":", 1)[-1]
+        with gzip.open(self._path(digest), "rb") as blob_file:
+            return blob_file.read().decode("utf-8")
+
+    def externalize(self, value):
+        """
+        Replace large strings in a JSON-like structure with blob references
+
+        Returns:
+            A copy of value where every string of min_size characters or more is {"$blob": ref}
+        """
+        if isinstance(value, str):
+            if len(value) >= self.min_size:
+                return {self.REF_KEY: self.put(value)}
+            return value
+        if isinstance(value, dict):
+            return {key: self.externalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(item) for item in value]
+        return value
+
+    def resolve(self, value):
+        """
+        Reassemble a structure produced by externalize(), reading back every referenced blob
+
+        Missing blobs are replaced by a "[missing blob ...]" placeholder.
+        """
+        if isinstance(value, dict):
+            if set(value) == {self.REF_KEY}:
+                try:
+                    return self.get(value[self.REF_KEY])
+                except FileNotFoundError:
+                    return f"[missing blob {value[self.REF_KEY]}]"
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def references(self, value):
+        """Yield every blob reference contained in a structure."""
+        if isinstance(value, dict):
+            if set(value) == {self.REF_KEY}:
+                yield value[self.REF_KEY]
+                return
+            for item in value.values():
+                yield from self.references(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from self.references(item)
+
+    def remove_unreferenced(self, referenced, grace_seconds=3600):
+        """
+        Delete blobs that no log record references any more
+
+        Args:
+            referenced (set): Blob references still in use
+            grace_seconds (float): Blobs written or reused more recently than this are kept,
+                as a running logger may not have written the record referencing them yet
+
+        Returns:
+            int: Number of blobs deleted
+        """
+        keep = {ref.split(":", 1)[-1] for ref in referenced}
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".gz") and name[:-3] not in keep:
+                    path = os.path.join(root, name)
+                    try:
+                        if os.path.getmtime(path) >= cutoff:
+                            continue
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+        return removed
+
+    def _path(self, digest):
+        """File path of a blob hash."""
+        return os.path.join(self.directory, digest[:2], f"{digest}.gz")
@@ -0,0 +1,86 @@
+import threading
+
+
+class CancelledError(Exception):
+    """Raised inside a job when its cancellation token has been cancelled."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation for LLM calls and processing jobs.
+
+    Jobs check the token between steps (raise_if_cancelled) and use wait()
+    instead of sleeping. Resources that block - an open HTTP response, for
+    instance - register a callback that releases them when cancel() is called,
+    so a blocked read fails immediately instead of running to its timeout.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def is_cancelled(self):
+        """Whether cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the token and run the registered callbacks (once)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancellation callback failed: {e}")
+
+    def raise_if_cancelled(self):
+        """Raise CancelledError if the token has been cancelled."""
+        if self._event.is_set():
+            raise CancelledError("Operation cancelled")
+
+    def add_callback(self, callback):
+        """
+        Register a callable to run on cancel; runs immediately if already cancelled
+
+        Returns:
+            callable: The callback, for remove_callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+        callback()
+        return callback
+
+    def remove_callback(self, callback):
+        """Unregister a callback once the resource it releases is closed."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout):
+        """
+        Sleep for up to timeout seconds, waking early on cancel
+
+        Returns:
+            bool: True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+    def wait_for(self, event, poll_interval=0.05):
+        """
+        Wait until a threading.Event is set or the token is cancelled
+
+        Returns:
+            bool: True if the event was set, False if the token was cancelled first
+        """
+        while not event.wait(poll_interval):
+            if self._event.is_set():
+                return False
+        return True
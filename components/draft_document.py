@@ -0,0 +1,231 @@
+import difflib
+import itertools
+import re
+
+
+class DraftDocument:
+    """
+    A generated article split into sections that can be locked and regenerated individually.
+
+    Sections start at Markdown headings; a draft without headings is split into
+    paragraphs. Sections the user changes in the editor are locked: regeneration
+    only rewrites the unlocked sections selected for rework and leaves locked
+    sections exactly as the user wrote them.
+    """
+
+    HEADING_PATTERN = re.compile(r"^#{1,6}\s", re.MULTILINE)
+    SECTION_MARKER = "=== SECTION {id} ==="
+    SECTION_MARKER_PATTERN = re.compile(r"^=== SECTION (\d+) ===.*$", re.MULTILINE)
+
+    def __init__(self, text):
+        """
+        Args:
+            text (str): Generated article text
+        """
+        self._ids = itertools.count(1)
+        self.sections = [self._new_section(part) for part in self.split_sections(text)]
+
+    def _new_section(self, text, locked=False):
+        """Create a section dict with a fresh id."""
+        return {"id": next(self._ids), "text": text, "locked": locked}
+
+    @classmethod
+    def split_sections(cls, text):
+        """
+        Split article text into sections
+
+        Args:
+            text (str): Article text
+
+        Returns:
+            list: Section texts, stripped and without empty parts
+        """
+        text = (text or "").strip()
+        if not text:
+            return []
+
+        if cls.HEADING_PATTERN.search(text):
+            starts = [match.start() for match in cls.HEADING_PATTERN.finditer(text)]
+            if starts[0] != 0:
+                starts.insert(0, 0)  # Introduction before the first heading
+            parts = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+        else:
+            parts = cls.split_paragraphs(text)
+
+        return [part.strip() for part in parts if part.strip()]
+
+    def render(self):
+        """Join the sections back into the article text."""
+        return "\n\n".join(section["text"] for section in self.sections)
+
+    def get_section(self, section_id):
+        """Get a section by id, or None."""
+        for section in self.sections:
+            if section["id"] == section_id:
+                return section
+        return None
+
+    def locked_sections(self):
+        """Get the sections edited by the user."""
+        return [section for section in self.sections if section["locked"]]
+
+    def unlocked_sections(self):
+        """Get the sections that may be regenerated."""
+        return [section for section in self.sections if not section["locked"]]
+
+    @staticmethod
+    def split_paragraphs(text):
+        """Split text at blank lines into stripped, non-empty paragraphs."""
+        return [part.strip() for part in re.split(r"\n\s*\n", (text or "").strip()) if part.strip()]
+
+    def apply_edit(self, edited_text):
+        """
+        Diff an edited article against the current sections and lock what the user changed
+
+        The diff runs paragraph by paragraph, and each paragraph of the edited text stays
+        with the section its unchanged or rewritten counterpart belongs to, so a section
+        spanning several paragraphs (such as a regenerated one) keeps its boundaries.
+        Inserted paragraphs start a new section when they open with a heading, or when
+        the article has no headings; otherwise they extend the section before them.
+        Unchanged sections keep their id and lock state; changed or added sections are
+        locked; deleted sections are dropped.
+
+        Args:
+            edited_text (str): Article text returned by the editor
+
+        Returns:
+            list: Ids of the sections locked by this edit
+        """
+        old_paragraphs = []  # (section index, paragraph text)
+        section_starts = set()
+        for index, section in enumerate(self.sections):
+            section_starts.add(len(old_paragraphs))
+            old_paragraphs.extend((index, paragraph) for paragraph in self.split_paragraphs(section["text"]))
+        edited_paragraphs = self.split_paragraphs(edited_text)
+        matcher = difflib.SequenceMatcher(
+            a=[paragraph for _, paragraph in old_paragraphs],
+            b=edited_paragraphs,
+            autojunk=False
+        )
+
+        # Old paragraph each edited one is aligned with (None if inserted), and whether it is unchanged
+        aligned = []
+        for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+            for offset in range(b_end - b_start):
+                old = a_start + offset if tag in ("equal", "replace") and offset < a_end - a_start else None
+                aligned.append((old, tag == "equal"))
+
+        has_headings = bool(self.HEADING_PATTERN.search(edited_text or ""))
+        groups = []
+        owner = None  # Section index of the last aligned paragraph
+        for paragraph, (old, unchanged) in zip(edited_paragraphs, aligned):
+            if old is not None:
+                # Also when the paragraphs before it in its section were deleted
+                starts_section = old in section_starts or old_paragraphs[old][0] != owner
+                owner = old_paragraphs[old][0]
+            else:
+                starts_section = not has_headings or bool(self.HEADING_PATTERN.match(paragraph))
+            if starts_section or not groups:
+                groups.append([])
+            groups[-1].append((paragraph, old, unchanged))
+
+        sections = []
+        used_ids = set()
+        newly_locked = []
+        for group in groups:
+            owners = [old_paragraphs[old][0] for _, old, _ in group if old is not None]
+            owner = self.sections[owners[0]] if owners else None
+            if (owner and owner["id"] not in used_ids and all(unchanged for _, _, unchanged in group)
+                    and [old for _, old, _ in group] == [position for position, (index, _) in enumerate(old_paragraphs) if index == owners[0]]):
+                sections.append(owner)
+                used_ids.add(owner["id"])
+                continue
+
+            text = "\n\n".join(paragraph for paragraph, _, _ in group)
+            # Rewritten sections keep the id of the section they replace
+            owner = next((self.sections[index] for index in owners if self.sections[index]["id"] not in used_ids), None)
+            section = dict(owner, text=text, locked=True) if owner else self._new_section(text, locked=True)
+            sections.append(section)
+            used_ids.add(section["id"])
+            newly_locked.append(section["id"])
+
+        self.sections = sections
+        return newly_locked
+
+    def unlock(self, section_id):
+        """Allow a previously edited section to be regenerated again."""
+        section = self.get_section(section_id)
+        if section:
+            section["locked"] = False
+
+    def render_for_rework(self, section_ids):
+        """
+        Render the article with every section marked, for a regeneration request
+
+        Args:
+            section_ids (list): Ids of the sections to be rewritten
+
+        Returns:
+            str: Marked article text, with locked and kept sections labelled as fixed
+        """
+        rendered = []
+        for section in self.sections:
+            if section["id"] in section_ids:
+                label = "REWRITE"
+            elif section["locked"]:
+                label = "LOCKED - edited by the user, do not change"
+            else:
+                label = "KEEP"
+            rendered.append(f"{self.SECTION_MARKER.format(id=section['id'])} ({label})\n{section['text']}")
+        return "\n\n".join(rendered)
+
+    def apply_regeneration(self, reply, section_ids):
+        """
+        Replace the reworked sections with the text of a regeneration reply
+
+        Only sections listed in section_ids and still unlocked are replaced; anything
+        else in the reply is ignored.
+
+        Args:
+            reply (str): LLM reply made of SECTION markers, each followed by the new text
+            section_ids (list): Ids of the sections that were sent for rework
+
+        Returns:
+            list: Ids of the sections that were replaced
+        """
+        markers = list(self.SECTION_MARKER_PATTERN.finditer(reply or ""))
+        replaced = []
+        for marker, next_marker in zip(markers, markers[1:] + [None]):
+            section_id = int(marker.group(1))
+            end = next_marker.start() if next_marker else len(reply)
+            text = reply[marker.end():end].strip()
+            section = self.get_section(section_id)
+            if section_id not in section_ids or not section or section["locked"] or not text:
+                continue
+            section["text"] = text
+            replaced.append(section_id)
+        return replaced
+
+
+def check_section_boundaries():
+    """
+    Regression check: a regenerated multi-paragraph section survives an editor round trip
+
+    Run with: python -m components.draft_document
+
+    Raises:
+        AssertionError: If sections are re-split or locked without a change
+    """
+    document = DraftDocument("Intro.\n\nBody.\n\nOutro.")
+    document.apply_regeneration("=== SECTION 2 ===\nFirst paragraph.\n\nSecond paragraph.", [2])
+    sections = [dict(section) for section in document.sections]
+    assert document.apply_edit(document.render()) == [], "an unchanged round trip locked sections"
+    assert document.sections == sections, "an unchanged round trip re-split the sections"
+    assert document.apply_edit(document.render().replace("Second", "Edited second")) == [2]
+    assert [section["id"] for section in document.sections] == [1, 2, 3]
+    assert document.sections[1]["text"] == "First paragraph.\n\nEdited second paragraph."
+    print("Section boundaries are stable.")
+
+
+if __name__ == "__main__":
+    check_section_boundaries()
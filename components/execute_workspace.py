@@ -10,6 +10,8 @@ import os
 from datetime import datetime
 from .base_workspace import BaseWorkspace
 from .pdf_processor import PDFProcessor
+from .batch_runner import BatchRunner
+from .providers import get_context_window
 
 class ExecuteWorkspace(BaseWorkspace):
     """
@@ -63,14 +65,18 @@ class ExecuteWorkspace(BaseWorkspace):
         prompt_btn = self._create_nav_button("Prompt Definition", lambda: self.stacked_widget.setCurrentWidget(self.prompt_definition_widget))
         context_btn = self._create_nav_button("Upload Context", lambda: self.stacked_widget.setCurrentWidget(self.context_upload_widget))
         proofread_btn = self._create_nav_button("Proof-read Document", lambda: self.stacked_widget.setCurrentWidget(self.proofread_widget))
+        budget_btn = self._create_nav_button("Check Budget", self._handle_check_budget)
         produce_btn = self._create_nav_button("Produce", self._handle_produce)
+        batch_produce_btn = self._create_nav_button("Batch Produce...", self._handle_batch_produce)
         
         # Add buttons to layout
         layout.addWidget(compliance_btn)
         layout.addWidget(prompt_btn)
         layout.addWidget(context_btn)
         layout.addWidget(proofread_btn)
+        layout.addWidget(budget_btn)
         layout.addWidget(produce_btn)
+        layout.addWidget(batch_produce_btn)
         
         # Add stretch to push buttons toward the top
         layout.addStretch()
@@ -195,10 +201,10 @@ class ExecuteWorkspace(BaseWorkspace):
         form_layout.addRow("", self.token_limit_label)
         
         # API Key
-        self.api_key = QLineEdit()
-        self.api_key.setPlaceholderText("Enter your API key")
-        self.api_key.setEchoMode(QLineEdit.Password)
-        form_layout.addRow("API Key:", self.api_key)
+        self.api_key_input = QLineEdit()
+        self.api_key_input.setPlaceholderText("Enter your API key")
+        self.api_key_input.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("API Key:", self.api_key_input)
         
         # Temperature
         temp_layout = QHBoxLayout()
@@ -237,6 +243,7 @@ class ExecuteWorkspace(BaseWorkspace):
         
         # Add save button
         save_btn = QPushButton("Save Configuration")
+        save_btn.clicked.connect(self._save_prompt_configuration)
         layout.addWidget(save_btn)
         
         # Add stretch
@@ -247,6 +254,14 @@ class ExecuteWorkspace(BaseWorkspace):
         
         return widget
         
+    def _save_prompt_configuration(self):
+        """Store the prompt definition so the Agent receives plain values instead of widgets"""
+        self.prompt_content = self.prompt_text.toPlainText()
+        self.selected_model = self.model_combo.currentText()
+        self.api_key = self.api_key_input.text()
+        self.temperature = self.temp_value.value()
+        QMessageBox.information(self, "Configuration Saved", f"Prompt configuration saved for {self.selected_model}.")
+
     def _create_context_upload_widget(self):
         """Create widget for context upload with PDF processing capabilities"""
         widget = QWidget()
@@ -502,6 +517,24 @@ class ExecuteWorkspace(BaseWorkspace):
         else:
             print("Agent not available for Execute loop.")
 
+    def _handle_check_budget(self):
+        """Handle the check budget button - show the token budget of the next Produce"""
+        if self.agent:
+            self.agent.handle_budget_preview(self)
+        else:
+            print("Agent not available for budget planning.")
+
+    def _handle_batch_produce(self):
+        """Handle the batch produce button - generate one draft per PDF or sub-folder of a folder"""
+        if not self.agent:
+            print("Agent not available for Execute loop.")
+            return
+
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder of Context Sets")
+        if directory:
+            context_sets = BatchRunner.discover_context_sets(directory)
+            self.agent.handle_batch_produce(self, context_sets)
+
     def _update_token_limit(self, model_name):
         """Update token limit based on selected model and refresh token counter"""
         token_limit = self._get_token_limit(model_name)
@@ -526,39 +559,11 @@ class ExecuteWorkspace(BaseWorkspace):
     
     def _get_token_limit(self, model_name=None):
         """Get token limit for the specified model"""
-        # Map model display names to their token limits
-        token_limits = {
-            "Claude 3 Opus": 200000,
-            "Claude 3.5 Haiku": 150000,
-            "Claude 3.5 Sonnet": 180000,
-            "Claude 3.7 Sonnet": 180000,
-            "Claude 4 Opus": 200000,
-            "Claude 4 Sonnet": 180000,
-            "Cursor Small": 32000,
-            "Deepseek R1": 64000,
-            "Deepseek V3": 128000,
-            "Gemini 2.0 Pro (exp)": 32000,
-            "Gemini 2.5 Flash": 1000000,
-            "Gemini 2.5 Pro": 1000000,
-            "GPT 4.1": 128000,
-            "GPT 4.5 Preview": 256000,
-            "GPT-4o": 128000,
-            "GPT-4o mini": 128000,
-            "Grok 2": 128000,
-            "Grok 3 Beta": 128000,
-            "Grok 3 Mini Beta": 64000,
-            "o1": 128000,
-            "o1 Mini": 64000,
-            "o3": 128000,
-            "o3-mini": 64000,
-            "o4-mini": 64000
-        }
-
         if not model_name:
             # If model_name is not provided, try to get it from the combo box
             model_name = self.model_combo.currentText() if hasattr(self, 'model_combo') else None
 
-        return token_limits.get(model_name, 8192)  # Default if model not found
+        return get_context_window(model_name)  # Falls back to a default if model not found
 
     def _log_compliance_document(self):
         """Log compliance document content"""
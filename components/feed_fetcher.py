@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class FeedFetcher:
+    """
+    Fetches the research RSS/Atom feeds concurrently with conditional GET caching.
+
+    Feeds are downloaded on an asyncio event loop with at most max_concurrency requests
+    in flight overall and per_host_limit per host, so journals hosted by the same
+    publisher are not hit in parallel bursts. The ETag and Last-Modified validators of
+    every feed are kept in a small JSON cache and sent back as If-None-Match and
+    If-Modified-Since, so a feed that has not changed since the last run costs a
+    304 Not Modified instead of a full download. New validators only take effect once
+    commit() is called, so a run that fails before processing the downloaded feeds
+    downloads them again next time.
+    """
+
+    def __init__(self, cache_path=os.path.join("data", "feed_cache.json"), max_concurrency=8,
+                 per_host_limit=2, timeout=20, user_agent="Cogito research agent"):
+        """
+        Args:
+            cache_path (str): JSON file holding each feed's validators
+            max_concurrency (int): Requests in flight across all hosts
+            per_host_limit (int): Requests in flight per host
+            timeout (float): Connect and read timeout per request, in seconds
+            user_agent (str): User-Agent header sent to the publishers
+        """
+        self.cache_path = cache_path
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.stats = {"requests": 0, "downloaded": 0, "not_modified": 0, "errors": 0, "bytes": 0}
+        self._validators = self._load_cache()
+        self._pending = {}  # url -> validators of downloads not yet committed
+        self._sessions = {}  # host -> requests.Session, each pooling that host's connections
+        self._lock = threading.Lock()
+
+    def fetch_all(self, feeds, cancel_token=None, conditional=True):
+        """
+        Fetch every feed, blocking until all have answered
+
+        Args:
+            feeds (list): Feed dicts with 'name' and 'url' keys
+            cancel_token (CancellationToken, optional): Stops starting new requests once cancelled
+            conditional (bool): Send the cached validators; False downloads every feed in full
+                and leaves the cache untouched (e.g. to validate feeds)
+
+        Returns:
+            list: One result dict per feed, in feed order, with 'feed', 'status' (HTTP status,
+                or None on a connection error), 'content' (bytes, None unless downloaded),
+                'not_modified' and 'error' keys
+
+        Raises:
+            CancelledError: If cancel_token is cancelled
+        """
+        results = asyncio.run(self.fetch_all_async(feeds, cancel_token, conditional))
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        return results
+
+    def commit(self):
+        """Keep the validators of the feeds downloaded so far, once their content has been processed."""
+        with self._lock:
+            for url, validators in self._pending.items():
+                if validators:
+                    self._validators[url] = validators
+                else:
+                    self._validators.pop(url, None)
+            self._pending.clear()
+        self._save_cache()
+
+    async def fetch_all_async(self, feeds, cancel_token=None, conditional=True):
+        """Coroutine version of fetch_all()."""
+        overall = asyncio.Semaphore(self.max_concurrency)
+        per_host = {}
+        for feed in feeds:
+            per_host.setdefault(urlsplit(feed["url"]).netloc, asyncio.Semaphore(self.per_host_limit))
+
+        tasks = [
+            self._fetch(feed, overall, per_host[urlsplit(feed["url"]).netloc], cancel_token, conditional)
+            for feed in feeds
+        ]
+        return await asyncio.gather(*tasks)
+
+    async def _fetch(self, feed, overall, host_limit, cancel_token, conditional=True):
+        """Fetch one feed once a global and a per-host slot are free."""
+        result = {"feed": feed, "status": None, "content": None, "not_modified": False, "error": None}
+        async with host_limit, overall:
+            if cancel_token and cancel_token.is_cancelled:
+                result["error"] = "cancelled"
+                return result
+            try:
+                # requests is blocking, so each download runs on the default thread pool
+                response = await asyncio.to_thread(self._get, feed["url"], conditional)
+            except requests.exceptions.RequestException as e:
+                with self._lock:
+                    self.stats["errors"] += 1
+                result["error"] = str(e)
+                return result
+
+        result["status"] = response.status_code
+        if response.status_code == 304:
+            result["not_modified"] = True
+            with self._lock:
+                self.stats["not_modified"] += 1
+        elif response.ok:
+            result["content"] = response.content
+            if conditional:
+                self._remember(feed["url"], response)
+            with self._lock:
+                self.stats["downloaded"] += 1
+                self.stats["bytes"] += len(response.content)
+        else:
+            result["error"] = f"HTTP {response.status_code}"
+            with self._lock:
+                self.stats["errors"] += 1
+        return result
+
+    def _get(self, url, conditional=True):
+        """Send a conditional GET for a feed (runs on a worker thread)."""
+        headers = {"User-Agent": self.user_agent}
+        validators = self._validators.get(url, {}) if conditional else {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        with self._lock:
+            self.stats["requests"] += 1
+        return self._session(url).get(url, headers=headers, timeout=self.timeout)
+
+    def _session(self, url):
+        """Get the session pooling connections to a URL's host."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _remember(self, url, response):
+        """Hold the validators of a downloaded feed until commit()."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            if etag or last_modified:
+                self._pending[url] = {"etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+            else:
+                self._pending[url] = None
+
+    def forget(self, url=None):
+        """Drop the cached validators of one feed (or all feeds), forcing a full download next time."""
+        with self._lock:
+            if url is None:
+                self._validators.clear()
+            else:
+                self._validators.pop(url, None)
+        self._save_cache()
+
+    def _load_cache(self):
+        """Load the validator cache, starting empty if it is missing or unreadable."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable feed cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self):
+        """Write the validator cache atomically."""
+        with self._lock:
+            data = json.dumps(self._validators, indent=2)
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving feed cache: {e}")
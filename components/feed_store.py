@@ -0,0 +1,127 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+
+class FeedStore:
+    """
+    Persistent list of the research feeds, with OPML import and export.
+
+    Feeds are kept in data/feeds.json as dicts with 'name', 'topic' and 'url' keys, plus
+    whatever a feed has learned since it was added (e.g. 'interval_minutes', or
+    'has_abstracts' from validation). OPML outlines map onto feeds through their text
+    (name) and xmlUrl (url); a feed's topic is the text of the outline folder it sits in,
+    or its category attribute.
+    """
+
+    def __init__(self, path=os.path.join("data", "feeds.json")):
+        """
+        Args:
+            path (str): JSON file holding the feeds
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Load the saved feeds
+
+        Returns:
+            list: Feed dicts, or None if no feeds were ever saved (or the file is unreadable)
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as feeds_file:
+                return json.load(feeds_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable feed list {self.path}: {e}")
+            return None
+
+    def save(self, feeds):
+        """Write the feeds atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as feeds_file:
+                json.dump(feeds, feeds_file, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving feed list: {e}")
+
+    @staticmethod
+    def parse_opml(source):
+        """
+        Read the feeds of an OPML document
+
+        Args:
+            source (str | bytes | file): OPML file path, document bytes, or binary file-like object
+
+        Returns:
+            list: Feed dicts in document order, without duplicate URLs
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the document is malformed
+        """
+        root = ET.fromstring(source) if isinstance(source, (bytes, bytearray)) else ET.parse(source).getroot()
+        body = root.find("body")
+        feeds = []
+        urls = set()
+
+        def walk(element, folder):
+            for outline in element.findall("outline"):
+                url = (outline.get("xmlUrl") or outline.get("xmlurl") or "").strip()
+                text = (outline.get("text") or outline.get("title") or "").strip()
+                if url:
+                    if url not in urls:
+                        urls.add(url)
+                        feeds.append({"name": text or url, "topic": outline.get("category") or folder or "", "url": url})
+                else:
+                    walk(outline, text or folder)
+
+        walk(body if body is not None else root, "")
+        return feeds
+
+    @staticmethod
+    def to_opml(feeds, title="Cogito research feeds"):
+        """
+        Write feeds as an OPML 2.0 document, grouped into one folder per topic
+
+        Returns:
+            bytes: The document
+        """
+        topics = {}
+        for feed in feeds:
+            topics.setdefault(feed.get("topic") or "", []).append(feed)
+
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<opml version="2.0">', f"  <head><title>{escape(title)}</title></head>", "  <body>"]
+        for topic, topic_feeds in topics.items():
+            indent = "    "
+            if topic:
+                lines.append(f"    <outline text={quoteattr(topic)}>")
+                indent = "      "
+            for feed in topic_feeds:
+                lines.append(
+                    f"{indent}<outline type=\"rss\" text={quoteattr(feed['name'])} title={quoteattr(feed['name'])} "
+                    f"xmlUrl={quoteattr(feed['url'])} category={quoteattr(topic)}/>"
+                )
+            if topic:
+                lines.append("    </outline>")
+        lines += ["  </body>", "</opml>", ""]
+        return "\n".join(lines).encode("utf-8")
+
+    @staticmethod
+    def write_opml(path, feeds):
+        """
+        Export feeds to an OPML file
+
+        Returns:
+            bool: Whether the file was written
+        """
+        try:
+            with open(path, "wb") as opml_file:
+                opml_file.write(FeedStore.to_opml(feeds))
+            return True
+        except OSError as e:
+            print(f"Error exporting feeds to {path}: {e}")
+            return False
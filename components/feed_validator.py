@@ -0,0 +1,64 @@
+import xml.etree.ElementTree as ET
+from .feed_fetcher import FeedFetcher
+from .feed_parser import StreamingFeedParser
+
+
+class FeedValidator:
+    """
+    Checks feeds before they are added, e.g. a whole OPML import at once.
+
+    All feeds are downloaded concurrently (unconditionally, without touching the research
+    runs' validator cache) and each one is reported as reachable or not, parseable or
+    not, with its item count and how many items carry an abstract. A feed whose items
+    mostly lack an abstract of at least min_abstract_words words relies on the abstract
+    scraper during research runs.
+    """
+
+    def __init__(self, fetcher=None, parser=None, min_abstract_words=30):
+        """
+        Args:
+            fetcher (FeedFetcher, optional): Fetcher used for the downloads
+            parser (StreamingFeedParser, optional): Parser used to read the feeds
+            min_abstract_words (int): Words an item description needs to count as an abstract (teasers do not)
+        """
+        self.fetcher = fetcher or FeedFetcher(max_concurrency=16, timeout=15)
+        self.parser = parser or StreamingFeedParser(stop_after_seen=0)
+        self.min_abstract_words = min_abstract_words
+
+    def validate(self, feeds, cancel_token=None):
+        """
+        Validate feeds concurrently
+
+        Args:
+            feeds (list): Feed dicts with 'name' and 'url' keys
+            cancel_token (CancellationToken, optional): Stops starting new downloads once cancelled
+
+        Returns:
+            list: One report dict per feed, in feed order, with 'feed', 'ok', 'error', 'items',
+                'with_abstracts' and 'needs_scraping' keys
+
+        Raises:
+            CancelledError: If cancel_token is cancelled
+        """
+        reports = []
+        for result in self.fetcher.fetch_all(feeds, cancel_token, conditional=False):
+            report = {"feed": result["feed"], "ok": False, "error": result["error"], "items": 0, "with_abstracts": 0, "needs_scraping": False}
+            if result["content"] is not None:
+                try:
+                    for entry in self.parser.iter_entries(result["content"], result["feed"]["name"]):
+                        report["items"] += 1
+                        if len(entry["abstract"].split()) >= self.min_abstract_words:
+                            report["with_abstracts"] += 1
+                except ET.ParseError as e:
+                    report["error"] = f"Not a valid feed: {e}"
+                else:
+                    if report["items"]:
+                        report["ok"] = True
+                        report["needs_scraping"] = report["with_abstracts"] < report["items"] / 2
+                    else:
+                        report["error"] = "No items found"
+            reports.append(report)
+
+        valid = sum(1 for report in reports if report["ok"])
+        print(f"Feed validation: {valid} of {len(reports)} feeds valid, {sum(1 for report in reports if report['needs_scraping'])} need abstract scraping.")
+        return reports
@@ -0,0 +1,193 @@
+import atexit
+import glob
+import gzip
+import itertools
+import json
+import os
+import queue
+import shutil
+import threading
+import uuid
+from datetime import datetime
+
+
+class JSONLLogger:
+    """
+    Buffered, non-blocking structured logger writing one JSON record per line.
+
+    log() only puts the record on a queue, so callers on the GUI thread never
+    wait for serialization or disk I/O. A background thread serializes records
+    in batches and appends them to logs/<basename>.jsonl. When the file grows past
+    max_bytes it is rotated to a timestamped name and gzip-compressed; only the
+    newest backup_count rotated files are kept.
+
+    Every record carries the logger's session id and a sequence number that
+    restarts with each session, so "session:seq" identifies a record across the
+    active and rotated files of every run of the app.
+
+    With a BlobStore, large strings in records (documents, payload blocks) are
+    stored once by hash and the record keeps a reference; see log_reader to
+    reassemble full records.
+    """
+
+    def __init__(self, directory="logs", basename="cogito", max_bytes=10 * 1024 * 1024,
+                 backup_count=20, compress=True, flush_interval=1.0, max_queue=10000, blob_store=None):
+        """
+        Args:
+            directory (str): Directory of the log files
+            basename (str): Log file name without extension
+            max_bytes (int): Size at which the active file is rotated
+            backup_count (int): Number of rotated files kept
+            compress (bool): Gzip rotated files
+            flush_interval (float): Maximum seconds a record waits in the buffer before being written
+            max_queue (int): Records buffered before new records are dropped
+            blob_store (BlobStore, optional): Store for large record strings
+        """
+        self.directory = directory
+        self.basename = basename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.path = os.path.join(directory, f"{basename}.jsonl")
+        self.blob_store = blob_store
+        self.stats = {"logged": 0, "written": 0, "dropped": 0, "rotations": 0}
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.session = uuid.uuid4().hex[:12]  # Distinguishes this process's records from other runs'
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        """Start the writer thread (called automatically by the first log)."""
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._writer, name="cogito-log-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, kind, **fields):
+        """
+        Queue a structured record without blocking
+
+        Args:
+            kind (str): Record type, e.g. "api_call" or "compliance"
+            **fields: JSON-serializable record fields
+
+        Returns:
+            str: Path of the active log file the record is written to, or None if dropped
+        """
+        if self._closed:
+            return None
+        self.start()
+
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "session": self.session, "seq": next(self._sequence), "kind": kind}
+        record.update(fields)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+            return None
+        with self._lock:
+            self.stats["logged"] += 1
+        return self.path
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued record has been written (up to timeout seconds)."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write the remaining records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _writer(self):
+        """Drain the queue in batches, appending them to the active file."""
+        os.makedirs(self.directory, exist_ok=True)
+        running = True
+        while running:
+            batch = []
+            waiters = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            # Take everything already queued so it goes out in one write
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch):
+        """Serialize and append a batch of records, rotating the file when it is full."""
+        lines = []
+        for record in batch:
+            try:
+                if self.blob_store:
+                    record = self.blob_store.externalize(record)
+                lines.append(json.dumps(record, ensure_ascii=False, default=str))
+            except (TypeError, ValueError, OSError) as e:
+                lines.append(json.dumps({"ts": record.get("ts"), "kind": "log_error", "error": str(e)}))
+
+        try:
+            with open(self.path, "a", encoding="utf-8") as log_file:
+                log_file.write("\n".join(lines) + "\n")
+            with self._lock:
+                self.stats["written"] += len(lines)
+            if os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Error writing log file: {e}")
+
+    def log_files(self):
+        """Get the rotated and active log files, oldest first."""
+        rotations = sorted(glob.glob(os.path.join(self.directory, f"{self.basename}.*.jsonl*")))
+        if os.path.exists(self.path):
+            rotations.append(self.path)
+        return rotations
+
+    def _rotate(self):
+        """Move the active file aside, compress it and prune old rotations."""
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
+        rotated = os.path.join(self.directory, f"{self.basename}.{stamp}.jsonl")
+        os.replace(self.path, rotated)
+
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+
+        with self._lock:
+            self.stats["rotations"] += 1
+
+        rotations = sorted(glob.glob(os.path.join(self.directory, f"{self.basename}.*.jsonl*")))
+        for old in rotations[:-self.backup_count] if self.backup_count else rotations:
+            os.remove(old)
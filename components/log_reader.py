@@ -0,0 +1,152 @@
+"""
+Reader for the structured Cogito logs.
+
+Lists log records (active and rotated files) and reassembles full records on
+demand by reading back the documents stored in the blob store.
+
+Examples:
+    python -m components.log_reader --kind api_call --last 5
+    python -m components.log_reader --seq 3f9a1c0b2d4e:42 --full
+    python -m components.log_reader --gc
+"""
+import argparse
+import gzip
+import json
+import os
+from .blob_store import BlobStore
+from .jsonl_logger import JSONLLogger
+
+
+def iter_records(logger):
+    """
+    Yield every record of a logger's files, oldest first
+
+    Args:
+        logger (JSONLLogger): Logger whose directory and basename locate the files
+    """
+    for path in logger.log_files():
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as log_file:
+            for line in log_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Skipping malformed log line in {path}")
+
+
+def record_id(record):
+    """Identity of a record across sessions: "session:seq" (records older than sessions have "-" as session)."""
+    return f"{record.get('session') or '-'}:{record.get('seq')}"
+
+
+def parse_record_id(value):
+    """
+    Parse a --seq argument, either "session:seq" or a bare sequence number
+
+    Returns:
+        tuple: (session or None, seq)
+    """
+    session, _, seq = value.rpartition(":")
+    try:
+        return session or None, int(seq)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected SESSION:SEQ or SEQ, got {value!r}")
+
+
+def find_records(logger, kind=None, seq=None, since=None, session=None):
+    """
+    Filter log records
+
+    Args:
+        kind (str, optional): Only records of this kind
+        seq (int, optional): Only records with this sequence number (one per session)
+        since (str, optional): Only records with an ISO timestamp at or after this one
+        session (str, optional): Only records of this logger session (a prefix is enough)
+
+    Returns:
+        list: Matching records, oldest first
+    """
+    records = []
+    for record in iter_records(logger):
+        if kind and record.get("kind") != kind:
+            continue
+        if seq is not None and record.get("seq") != seq:
+            continue
+        if session and not (record.get("session") or "-").startswith(session):
+            continue
+        if since and record.get("ts", "") < since:
+            continue
+        records.append(record)
+    return records
+
+
+def summarize(record, blob_store):
+    """One-line summary of a record, with blob references shown by short hash."""
+    refs = list(blob_store.references(record))
+    fields = [key for key in record if key not in ("ts", "session", "seq", "kind")]
+    summary = f"{record.get('ts')} #{record_id(record)} {record.get('kind')}: {', '.join(fields)}"
+    if refs:
+        summary += f" ({len(refs)} blobs: {', '.join(ref.split(':', 1)[-1][:10] for ref in refs)})"
+    return summary
+
+
+def collect_garbage(logger, blob_store, grace_seconds=3600):
+    """
+    Delete blobs that no remaining log record references
+
+    Args:
+        grace_seconds (float): Keep blobs written or reused this recently (see BlobStore.remove_unreferenced)
+
+    Returns:
+        int: Number of blobs deleted
+    """
+    referenced = set()
+    for record in iter_records(logger):
+        referenced.update(blob_store.references(record))
+    return blob_store.remove_unreferenced(referenced, grace_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read Cogito structured logs")
+    parser.add_argument("--directory", default="logs", help="Log directory")
+    parser.add_argument("--kind", help="Only records of this kind (e.g. api_call, compliance)")
+    parser.add_argument("--seq", type=parse_record_id, help="Only the record with this id (SESSION:SEQ, as listed), or this sequence number")
+    parser.add_argument("--session", help="Only records of this session (id or prefix)")
+    parser.add_argument("--since", help="Only records at or after this ISO timestamp")
+    parser.add_argument("--last", type=int, default=20, help="Show the last N matching records")
+    parser.add_argument("--full", action="store_true", help="Print full records with their documents reassembled")
+    parser.add_argument("--gc", action="store_true", help="Delete blobs no log record references")
+    parser.add_argument("--gc-grace", type=float, default=3600, help="With --gc, keep blobs written or reused within this many seconds")
+    args = parser.parse_args()
+
+    logger = JSONLLogger(directory=args.directory)
+    blob_store = BlobStore(directory=os.path.join(args.directory, "blobs"))
+
+    if args.gc:
+        print(f"Deleted {collect_garbage(logger, blob_store, args.gc_grace)} unreferenced blobs.")
+        return
+
+    seq_session, seq = args.seq or (None, None)
+    records = find_records(logger, kind=args.kind, seq=seq, since=args.since, session=seq_session or args.session)
+    sessions = {record.get("session") for record in records}
+    if seq is not None and len(sessions) > 1:
+        # Sequence numbers restart with every session, so a bare one can name several records
+        print(f"Sequence number {seq} exists in {len(sessions)} sessions; pass one of these ids to --seq:")
+        for record in records:
+            print(summarize(record, blob_store))
+        return
+    records = records[-args.last:]
+    for record in records:
+        if args.full:
+            print(json.dumps(blob_store.resolve(record), indent=2, ensure_ascii=False))
+        else:
+            print(summarize(record, blob_store))
+    if not records:
+        print("No matching log records.")
+
+
+if __name__ == "__main__":
+    main()
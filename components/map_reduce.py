@@ -0,0 +1,202 @@
+import contextvars
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .cancellation import CancelledError
+
+
+class MapReduceGenerator:
+    """
+    Reduces context that does not fit the model window for an Execute generation:
+    - Map: concurrent per-chunk extraction calls over the PDFProcessor chunks
+    - Collapse: re-summarize the notes while they are still too large
+    - Reduce: the notes become the context of one final blog generation
+
+    Notes are cached per (model, prompt, chunk) in a bounded LRU cache. A run where
+    some chunks fail is failed rather than drafted from partial notes, and re-running
+    it only pays for the chunks that did not complete.
+    """
+
+    def __init__(self, agent, max_workers=4, max_collapse_rounds=3, cache_size=512):
+        """
+        Initialize the map-reduce generator
+
+        Args:
+            agent (Agent): Agent used for payload preparation and LLM calls
+            max_workers (int): Maximum number of concurrent map calls
+            max_collapse_rounds (int): Maximum number of note re-summarization rounds
+            cache_size (int): Number of chunk notes kept in the cache, least recently used dropped first
+        """
+        self.agent = agent
+        self.max_workers = max_workers
+        self.max_collapse_rounds = max_collapse_rounds
+        self.cache_size = cache_size
+        self.notes_cache = OrderedDict()  # cache key -> extracted notes
+        self._cache_lock = threading.Lock()  # Batch workers share one generator
+
+    def reduce_context(self, chunks, prompt, model, api_key, notes_budget, cancel_token=None):
+        """
+        Reduce oversized context to notes for the final generation
+
+        Args:
+            chunks (list): List of (source_name, chunk_text) tuples
+            prompt (str): User-defined prompt
+            model (str): Selected model
+            api_key (str): API key for the provider
+            notes_budget (int): Token budget left for the reduced notes in the final call
+            cancel_token (CancellationToken, optional): Cancels the pending and in-flight map calls
+
+        Returns:
+            str: The reduced context, or None if no notes could be produced
+
+        Raises:
+            RuntimeError: If some, but not all, chunks or note groups could not be extracted
+            CancelledError: If the token is cancelled
+        """
+        print(f"Map-reduce: mapping {len(chunks)} chunks with up to {self.max_workers} workers...")
+        notes = self._map(chunks, prompt, model, api_key, cancel_token)
+        if not notes:
+            print("Map-reduce: no notes were produced, aborting.")
+            return None
+        self._check_complete(notes, len(chunks), "chunks")
+
+        rounds = 0
+        while self._count_tokens(notes) > notes_budget and rounds < self.max_collapse_rounds:
+            rounds += 1
+            print(f"Map-reduce: notes exceed budget ({self._count_tokens(notes)} > {notes_budget}), collapse round {rounds}...")
+            previous_tokens = self._count_tokens(notes)
+            groups = self._group_notes(notes, notes_budget)
+            notes = self._map(groups, prompt, model, api_key, cancel_token)
+            if not notes:
+                print("Map-reduce: collapse produced no notes, aborting.")
+                return None
+            self._check_complete(notes, len(groups), "note groups")
+            if self._count_tokens(notes) >= previous_tokens:
+                print("Map-reduce: collapse did not shrink the notes, continuing with the current notes.")
+                break
+
+        return "\n\n".join(f"--- Notes from {source} ---\n{text}" for source, text in notes)
+
+    def _check_complete(self, notes, expected, unit):
+        """
+        Fail the run if some map calls produced no notes, instead of drafting from part of the context
+
+        Raises:
+            RuntimeError: If fewer than expected notes were produced
+        """
+        if len(notes) < expected:
+            raise RuntimeError(
+                f"Map-reduce: {expected - len(notes)} of {expected} {unit} could not be extracted, so the draft "
+                f"would miss part of the context. The {len(notes)} extracted notes are cached; run again to retry only the failed ones."
+            )
+
+    def _map(self, chunks, prompt, model, api_key, cancel_token=None):
+        """
+        Extract notes from each chunk concurrently, reusing cached notes
+
+        Args:
+            chunks (list): List of (source_name, chunk_text) tuples
+
+        Returns:
+            list: (source_name, notes) tuples in the original chunk order, without the chunks that failed
+        """
+        results = [None] * len(chunks)
+        pending = {}
+
+        for index, (source, chunk) in enumerate(chunks):
+            key = self._cache_key(model, prompt, chunk)
+            with self._cache_lock:
+                if key in self.notes_cache:
+                    self.notes_cache.move_to_end(key)
+                    results[index] = (source, self.notes_cache[key])
+                    continue
+            pending[index] = (source, chunk, key)
+
+        if pending:
+            print(f"Map-reduce: {len(chunks) - len(pending)} chunks reused from cache, {len(pending)} to extract.")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Each call runs in a copy of the caller's context, so its tracing span joins the run's trace
+                futures = {
+                    executor.submit(contextvars.copy_context().run, self._extract_notes, chunk, prompt, model, api_key, cancel_token): index
+                    for index, (source, chunk, key) in pending.items()
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    source, _, key = pending[index]
+                    try:
+                        notes = future.result()
+                    except CancelledError:
+                        # Drop the chunks that have not started; running calls abort on the token
+                        for other in futures:
+                            other.cancel()
+                        print("Map-reduce: cancelled.")
+                        raise
+                    except Exception as e:
+                        print(f"Map-reduce: extraction failed for a chunk of {source}: {e}")
+                        notes = None
+                    if notes:
+                        with self._cache_lock:
+                            self.notes_cache[key] = notes
+                            if len(self.notes_cache) > self.cache_size:
+                                self.notes_cache.popitem(last=False)
+                        results[index] = (source, notes)
+
+        missing = sum(1 for result in results if result is None)
+        if missing:
+            print(f"Map-reduce: {missing} chunks failed.")
+
+        return [result for result in results if result is not None]
+
+    def _extract_notes(self, chunk, prompt, model, api_key, cancel_token=None):
+        """Run one map call and return the extracted notes text."""
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        payload = self.agent.prepare_map_payload(chunk, prompt, model)
+        response = self.agent._call_llm_api(payload, api_key, model, cancel_token=cancel_token)
+        if not response:
+            return None
+        return self.agent.extract_blog_content(response)
+
+    def _group_notes(self, notes, notes_budget):
+        """
+        Group notes into chunks that each fit half of the notes budget
+
+        Args:
+            notes (list): (source_name, notes) tuples
+            notes_budget (int): Token budget for the reduced notes
+
+        Returns:
+            list: (source_name, grouped_text) tuples
+        """
+        group_budget = max(notes_budget // 2, 1)
+        groups = []
+        current_sources = []
+        current_text = ""
+
+        for source, text in notes:
+            entry = f"--- Notes from {source} ---\n{text}"
+            if current_text and self._count_tokens([(source, current_text + entry)]) > group_budget:
+                groups.append((", ".join(current_sources), current_text.strip()))
+                current_sources = []
+                current_text = ""
+            if source not in current_sources:
+                current_sources.append(source)
+            current_text += entry + "\n\n"
+
+        if current_text:
+            groups.append((", ".join(current_sources), current_text.strip()))
+
+        return groups
+
+    def _count_tokens(self, notes):
+        """Estimate the token count of a list of (source_name, text) tuples."""
+        return sum(self.agent._estimate_token_count(text) for _, text in notes)
+
+    def _cache_key(self, model, prompt, chunk):
+        """Build the notes cache key for a chunk."""
+        digest = hashlib.sha256()
+        for part in (model or "", prompt or "", chunk):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
@@ -61,6 +61,12 @@ class MenuWidget(QWidget):
         self.debug_checkbox.setFixedHeight(22)
         self.debug_checkbox.setFixedWidth(120)
         layout.addWidget(self.debug_checkbox)
+
+        # Profiles each Execute and research run to logs/ while checked
+        self.profiling_checkbox = QCheckBox("Profiling Mode")
+        self.profiling_checkbox.setFixedHeight(22)
+        self.profiling_checkbox.setFixedWidth(120)
+        layout.addWidget(self.profiling_checkbox)
         
         # Add stretch to push buttons to the top
         layout.addStretch(1)
@@ -0,0 +1,292 @@
+import argparse
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+
+class MockFeedServer:
+    """
+    Local stand-in for journal RSS feeds, for offline research runs and fetcher tests.
+
+    Serves /feeds/<name>.xml as RSS 2.0 with ETag and Last-Modified headers and
+    answers conditional requests with 304 Not Modified while a feed is unchanged.
+    Feeds are changed with add_items(), and the response latency is configurable, so
+    concurrency limits and caching can be observed in the stats.
+
+    Each item also has an article page at /articles/<name>/<n> carrying its abstract
+    in a citation_abstract meta tag, and /robots.txt serves robots_txt, for exercising
+    the abstract scraper.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=100, robots_txt="User-agent: *\nAllow: /\n"):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free port
+            latency_ms (int): Delay before each response
+            robots_txt (str): Body of /robots.txt
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.robots_txt = robots_txt
+        self.feeds = {}  # name -> {"items": [...], "modified": timestamp}
+        self.stats = {"requests": 0, "full": 0, "not_modified": 0, "articles": 0, "robots": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Root URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def feed_url(self, name):
+        """URL of a feed."""
+        return f"{self.base_url}/feeds/{name}.xml"
+
+    def add_items(self, name, count, abstract_words=150, feed_abstracts=True):
+        """
+        Append generated articles to a feed (creating it), which changes its ETag
+
+        Args:
+            name (str): Feed name
+            count (int): Number of articles to add
+            abstract_words (int): Words per generated abstract
+            feed_abstracts (bool): Include the abstracts in the feed; otherwise they are only on the article pages
+
+        Returns:
+            list: The new items
+        """
+        with self._lock:
+            feed = self.feeds.setdefault(name, {"items": [], "modified": 0})
+            start = len(feed["items"])
+            items = [
+                {
+                    "title": f"{name} article {number}",
+                    "link": f"{self.base_url}/articles/{name}/{number}",
+                    "guid": f"{name}-{number}",
+                    "doi": f"10.5555/{name}.{number}",
+                    "description": " ".join(f"finding{(number + word) % 97}" for word in range(abstract_words)),
+                    "published": formatdate(time.time() - (count - index) * 60, usegmt=True),
+                    "in_feed": feed_abstracts
+                }
+                for index, number in enumerate(range(start, start + count))
+            ]
+            feed["items"].extend(items)
+            # HTTP dates have one-second resolution, so every change moves Last-Modified forward
+            feed["modified"] = max(int(time.time()), feed["modified"] + 1)
+        return items
+
+    def render_feed(self, name):
+        """
+        Render a feed as RSS 2.0, newest item first
+
+        Returns:
+            tuple: (body bytes, ETag, Last-Modified), or None if the feed does not exist
+        """
+        with self._lock:
+            feed = self.feeds.get(name)
+            if feed is None:
+                return None
+            items = list(reversed(feed["items"]))
+            modified = feed["modified"]
+
+        entries = "".join(
+            "<item>"
+            f"<title>{escape(item['title'])}</title>"
+            f"<link>{escape(item['link'])}</link>"
+            f"<guid isPermaLink=\"false\">{escape(item['guid'])}</guid>"
+            f"<dc:identifier>doi:{escape(item['doi'])}</dc:identifier>"
+            f"<pubDate>{item['published']}</pubDate>"
+            + (f"<description>{escape('<p>' + item['description'] + '</p>')}</description>" if item["in_feed"] else "")
+            + "</item>"
+            for item in items
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+            f"<title>{escape(name)}</title><link>{self.base_url}</link>"
+            f"{entries}</channel></rss>"
+        ).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        return body, etag, formatdate(modified, usegmt=True)
+
+    def render_article(self, name, number):
+        """
+        Render an article page, with the abstract in its head and a long full text body
+
+        Returns:
+            bytes: The page, or None if the article does not exist
+        """
+        with self._lock:
+            items = self.feeds.get(name, {}).get("items", [])
+            item = items[number] if 0 <= number < len(items) else None
+        if item is None:
+            return None
+        full_text = "<p>" + " ".join(["Full text paragraph."] * 200) + "</p>"
+        return (
+            "<!DOCTYPE html><html><head>"
+            f"<title>{escape(item['title'])}</title>"
+            f"<meta name=\"citation_title\" content=\"{escape(item['title'])}\">"
+            f"<meta name=\"citation_doi\" content=\"{escape(item['doi'])}\">"
+            f"<meta name=\"citation_abstract\" content=\"{escape(item['description'])}\">"
+            "<meta name=\"description\" content=\"Publisher site description\">"
+            f"</head><body><h1>{escape(item['title'])}</h1>{full_text * 50}</body></html>"
+        ).encode("utf-8")
+
+    def start(self):
+        """Start serving in a background thread."""
+        server = self
+
+        class Handler(MockFeedRequestHandler):
+            mock = server
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-feed-server", daemon=True)
+        self._thread.start()
+        print(f"Mock feed server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _enter_request(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+
+    def _leave_request(self, outcome):
+        with self._lock:
+            self._in_flight -= 1
+            if outcome in self.stats:
+                self.stats[outcome] += 1
+
+
+class MockFeedRequestHandler(BaseHTTPRequestHandler):
+    """Serves the mock feeds, honouring conditional request headers."""
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Clients that only need a page head close the connection early
+            pass
+
+    def do_GET(self):
+        self.mock._enter_request()
+        outcome = None
+        try:
+            time.sleep(self.mock.latency_ms / 1000)
+            outcome = self._route()
+        finally:
+            self.mock._leave_request(outcome)
+
+    def _route(self):
+        """Answer the request and return the stats key of its outcome."""
+        path = self.path.split("?")[0]
+        if path == "/robots.txt":
+            self._send(200, self.mock.robots_txt.encode("utf-8"), "text/plain")
+            return "robots"
+        if path.startswith("/articles/"):
+            return self._article(path)
+        if not (path.startswith("/feeds/") and path.endswith(".xml")):
+            self._send(404, b"Not found", "text/plain")
+            return None
+
+        rendered = self.mock.render_feed(path[len("/feeds/"):-len(".xml")])
+        if rendered is None:
+            self._send(404, b"Unknown feed", "text/plain")
+            return None
+        body, etag, last_modified = rendered
+
+        if self._not_modified(etag, last_modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return "not_modified"
+
+        self._send(200, body, "application/rss+xml; charset=utf-8", {"ETag": etag, "Last-Modified": last_modified})
+        return "full"
+
+    def _article(self, path):
+        """Serve an article page."""
+        try:
+            _, _, name, number = path.split("/", 3)
+            body = self.mock.render_article(name, int(number))
+        except ValueError:
+            body = None
+        if body is None:
+            self._send(404, b"Unknown article", "text/plain")
+            return None
+        self._send(200, body, "text/html; charset=utf-8")
+        return "articles"
+
+    def _not_modified(self, etag, last_modified):
+        """Evaluate If-None-Match (preferred) or If-Modified-Since."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Cogito mock feed server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8809)
+    parser.add_argument("--latency-ms", type=int, default=100)
+    parser.add_argument("--feeds", type=int, default=5, help="Number of feeds to serve")
+    parser.add_argument("--items", type=int, default=20, help="Articles per feed")
+    args = parser.parse_args()
+
+    server = MockFeedServer(host=args.host, port=args.port, latency_ms=args.latency_ms).start()
+    for index in range(args.feeds):
+        server.add_items(f"journal{index}", args.items)
+        print(server.feed_url(f"journal{index}"))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
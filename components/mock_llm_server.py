@@ -0,0 +1,560 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockLLMServer:
+    """
+    Local stand-in for the provider chat endpoints, for offline runs and load tests.
+
+    Serves the OpenAI-compatible /v1/chat/completions, Anthropic /v1/messages and
+    Gemini /v1beta/models/<model>:generateContent (and streaming) endpoints with:
+    - configurable time-to-first-token and output token throughput
+    - simulated prefix caching (cached input tokens skip the prefill delay)
+    - error injection (HTTP 500) and per-minute rate limits (HTTP 429 + Retry-After)
+    - forced function calls, answered with arguments generated from the tool's JSON schema
+      and streamed as argument deltas
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=200, prefill_ms_per_1k_tokens=20,
+                 tokens_per_second=80, output_tokens=200, error_rate=0.0, rate_limit_rpm=None, seed=None):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free port
+            latency_ms (int): Base latency before the first output token
+            prefill_ms_per_1k_tokens (int): Extra first-token latency per 1000 uncached input tokens
+            tokens_per_second (int): Output token throughput
+            output_tokens (int): Output tokens per response (capped by the request's max tokens)
+            error_rate (float): Fraction of requests answered with HTTP 500
+            rate_limit_rpm (int, optional): Requests per minute before answering HTTP 429
+            seed (int, optional): Random seed for reproducible error injection
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.prefill_ms_per_1k_tokens = prefill_ms_per_1k_tokens
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rpm = rate_limit_rpm
+        self.random = random.Random(seed)
+
+        self.stats = {"requests": 0, "errors_injected": 0, "rate_limited": 0, "streamed": 0}
+        self._lock = threading.Lock()
+        self._request_times = deque()
+        self._prefix_cache = {}  # cache key -> previously seen prompt text
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Root URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread."""
+        server = self
+
+        class Handler(MockLLMRequestHandler):
+            mock = server
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        print(f"Mock LLM server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def configure_providers(self):
+        """Point every provider adapter at this server."""
+        from . import providers
+        for name in providers.ADAPTER_CLASSES:
+            suffix = "/v1beta" if name == "gemini" else "/v1"
+            providers.set_base_url(name, self.base_url + suffix)
+
+    def reset_providers(self):
+        """Point every provider adapter back at its public API."""
+        from . import providers
+        for name in providers.ADAPTER_CLASSES:
+            providers.set_base_url(name, None)
+
+    def __enter__(self):
+        self.start()
+        self.configure_providers()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.reset_providers()
+        self.stop()
+
+    def admit(self):
+        """
+        Decide how to answer the next request
+
+        Returns:
+            tuple: (status, retry_after) where status is 'ok', 'rate_limited' or 'error'
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+
+            if self.rate_limit_rpm:
+                while self._request_times and now - self._request_times[0] > 60:
+                    self._request_times.popleft()
+                if len(self._request_times) >= self.rate_limit_rpm:
+                    self.stats["rate_limited"] += 1
+                    retry_after = max(1, int(60 - (now - self._request_times[0])) + 1)
+                    return "rate_limited", retry_after
+                self._request_times.append(now)
+
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats["errors_injected"] += 1
+                return "error", None
+
+        return "ok", None
+
+    def cached_prefix_tokens(self, cache_key, prompt_text):
+        """
+        Simulate provider prefix caching
+
+        Args:
+            cache_key (str): Cache routing key (explicit breakpoint prefix or prompt_cache_key)
+            prompt_text (str): Full prompt text of the request
+
+        Returns:
+            int: Input tokens served from cache
+        """
+        if not cache_key:
+            return 0
+        with self._lock:
+            previous = self._prefix_cache.get(cache_key)
+            self._prefix_cache[cache_key] = prompt_text
+        if previous is None:
+            return 0
+
+        common = 0
+        for a, b in zip(previous, prompt_text):
+            if a != b:
+                break
+            common += 1
+        return count_tokens(prompt_text[:common])
+
+    def first_token_delay(self, uncached_input_tokens):
+        """Seconds to wait before the first output token."""
+        return (self.latency_ms + self.prefill_ms_per_1k_tokens * uncached_input_tokens / 1000) / 1000
+
+    def output_words(self, prompt_text, max_tokens):
+        """Build the mock output as a list of word tokens."""
+        count = min(self.output_tokens, max_tokens or self.output_tokens)
+        vocabulary = re.findall(r"[A-Za-z]{4,}", prompt_text)[-200:] or ["mock"]
+        words = ["[MOCK]"]
+        while len(words) < count:
+            words.append(vocabulary[len(words) % len(vocabulary)])
+        return words
+
+
+    def tool_arguments(self, schema, prompt_text, max_tokens):
+        """
+        Build mock tool call arguments from the tool's JSON schema, split into streamed chunks
+
+        Arrays get enough items to roughly fill the output token budget; integer fields of
+        array items hold the item's 1-based position.
+
+        Returns:
+            list: Argument JSON text chunks (one per output token)
+        """
+        budget = min(self.output_tokens, max_tokens or self.output_tokens)
+        vocabulary = re.findall(r"[A-Za-z]{4,}", prompt_text)[-200:] or ["mock"]
+        counter = iter(range(10 ** 9))
+
+        def build(node, position=None):
+            node_type = node.get("type")
+            if "enum" in node:
+                return node["enum"][next(counter) % len(node["enum"])]
+            if node_type == "object":
+                return {name: build(child, position) for name, child in node.get("properties", {}).items()}
+            if node_type == "array":
+                return [build(node.get("items", {}), number) for number in range(1, max(1, budget // 40) + 1)]
+            if node_type == "integer":
+                # Integers of array items are their list numbers, like the indexes models echo back
+                return position if position is not None else next(counter) % 10
+            if node_type == "number":
+                return round((next(counter) % 100) / 10, 1)
+            if node_type == "boolean":
+                return next(counter) % 2 == 0
+            start = next(counter)
+            return "[MOCK] " + " ".join(vocabulary[(start + i) % len(vocabulary)] for i in range(6))
+
+        arguments = json.dumps(build(schema or {"type": "object"}))
+        return [arguments[i:i + 8] for i in range(0, len(arguments), 8)]
+
+
+def count_tokens(text):
+    """Approximate token count, matching the PDFProcessor heuristic."""
+    return int(len(text.split()) * 1.25)
+
+
+class MockLLMRequestHandler(BaseHTTPRequestHandler):
+    """Routes provider requests to the matching mock protocol."""
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        if self.path.startswith("/v1/chat/completions"):
+            protocol = OpenAIProtocol(body)
+        elif self.path.startswith("/v1/messages"):
+            protocol = AnthropicProtocol(body)
+        elif self.path.startswith("/v1beta/models/"):
+            protocol = GeminiProtocol(body, stream=":streamGenerateContent" in self.path)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+            return
+
+        status, retry_after = self.mock.admit()
+        if status == "rate_limited":
+            self._send_json(429, {"error": {"type": "rate_limit_error", "message": "Rate limit exceeded"}},
+                            headers={"Retry-After": str(retry_after)})
+            return
+        if status == "error":
+            self._send_json(500, {"error": {"type": "api_error", "message": "Injected server error"}})
+            return
+
+        prompt_text = protocol.prompt_text()
+        input_tokens = count_tokens(prompt_text)
+        cache_key, cache_prefix = protocol.cache_key()
+        cached_tokens = min(self.mock.cached_prefix_tokens(cache_key, cache_prefix), input_tokens)
+        tool = protocol.forced_tool()
+        if tool:
+            words = self.mock.tool_arguments(tool[1], prompt_text, protocol.max_tokens())
+        else:
+            words = self.mock.output_words(prompt_text, protocol.max_tokens())
+        usage = {"input": input_tokens, "output": len(words), "cached": cached_tokens}
+
+        time.sleep(self.mock.first_token_delay(input_tokens - cached_tokens))
+        interval = 1 / self.mock.tokens_per_second if self.mock.tokens_per_second else 0
+
+        if protocol.stream:
+            with self.mock._lock:
+                self.mock.stats["streamed"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                if tool:
+                    events = protocol.tool_stream_events(tool[0], words, usage, interval)
+                else:
+                    events = protocol.stream_events(words, usage, interval)
+                for event in events:
+                    self.wfile.write(event.encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # Client cancelled the stream
+                pass
+        else:
+            time.sleep(interval * len(words))
+            if tool:
+                self._send_json(200, protocol.tool_response(tool[0], "".join(words), usage))
+            else:
+                self._send_json(200, protocol.response(" ".join(words), usage))
+
+    def _send_json(self, status, data, headers=None):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _sse(data, event=None):
+    """Format one server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def _forced_tool(tools, tool_choice_name, name_key="name", schema_key="parameters"):
+    """Find the (name, schema) of the forced tool among native tool definitions."""
+    for tool in tools or []:
+        if tool.get(name_key) == tool_choice_name:
+            return tool_choice_name, tool.get(schema_key)
+    return None
+
+
+def _text_of(content):
+    """Flatten a native message content (string or block list) to text."""
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content)
+    return content or ""
+
+
+class OpenAIProtocol:
+    """OpenAI-compatible chat completions request/response shapes."""
+
+    def __init__(self, body):
+        self.body = body
+        self.stream = bool(body.get("stream"))
+
+    def prompt_text(self):
+        return "".join(_text_of(message.get("content")) for message in self.body.get("messages", []))
+
+    def max_tokens(self):
+        return self.body.get("max_completion_tokens") or self.body.get("max_tokens")
+
+    def cache_key(self):
+        # Automatic prefix caching, routed by prompt_cache_key when present
+        return self.body.get("prompt_cache_key") or self.body.get("model"), self.prompt_text()
+
+    def forced_tool(self):
+        name = ((self.body.get("tool_choice") or {}).get("function") or {}).get("name")
+        return _forced_tool([tool.get("function", {}) for tool in self.body.get("tools", [])], name)
+
+    def tool_response(self, name, arguments, usage):
+        data = self.response(None, usage)
+        data["choices"][0]["message"]["tool_calls"] = [
+            {"id": "call_mock", "type": "function", "function": {"name": name, "arguments": arguments}}
+        ]
+        data["choices"][0]["finish_reason"] = "tool_calls"
+        return data
+
+    def tool_stream_events(self, name, chunks, usage, interval):
+        first = {"index": 0, "id": "call_mock", "type": "function", "function": {"name": name, "arguments": ""}}
+        yield _sse({"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"tool_calls": [first]}, "finish_reason": None}]})
+        for chunk in chunks:
+            delta = {"tool_calls": [{"index": 0, "function": {"arguments": chunk}}]}
+            yield _sse({"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            time.sleep(interval)
+        yield _sse({"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]})
+        yield _sse({"object": "chat.completion.chunk", "choices": [], "usage": self.response("", usage)["usage"]})
+        yield "data: [DONE]\n\n"
+
+    def response(self, text, usage):
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "model": self.body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": usage["input"],
+                "completion_tokens": usage["output"],
+                "total_tokens": usage["input"] + usage["output"],
+                "prompt_tokens_details": {"cached_tokens": usage["cached"]}
+            }
+        }
+
+    def stream_events(self, words, usage, interval):
+        for index, word in enumerate(words):
+            delta = {"content": (" " if index else "") + word}
+            yield _sse({"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            time.sleep(interval)
+        yield _sse({"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        yield _sse({"object": "chat.completion.chunk", "choices": [], "usage": self.response("", usage)["usage"]})
+        yield "data: [DONE]\n\n"
+
+
+class AnthropicProtocol:
+    """Anthropic messages request/response shapes."""
+
+    def __init__(self, body):
+        self.body = body
+        self.stream = bool(body.get("stream"))
+
+    def prompt_text(self):
+        system = _text_of(self.body.get("system"))
+        return system + "".join(_text_of(message.get("content")) for message in self.body.get("messages", []))
+
+    def max_tokens(self):
+        return self.body.get("max_tokens")
+
+    def cache_key(self):
+        # Explicit caching: the prefix up to the last cache_control breakpoint
+        prefix = _text_of(self.body.get("system"))
+        breakpoint_prefix = None
+        for message in self.body.get("messages", []):
+            content = message.get("content")
+            blocks = content if isinstance(content, list) else [{"text": content or ""}]
+            for block in blocks:
+                prefix += block.get("text", "")
+                if block.get("cache_control"):
+                    breakpoint_prefix = prefix
+        if breakpoint_prefix is None:
+            return None, ""
+        return hashlib.sha256(breakpoint_prefix.encode("utf-8")).hexdigest(), breakpoint_prefix
+
+    def forced_tool(self):
+        name = (self.body.get("tool_choice") or {}).get("name")
+        return _forced_tool(self.body.get("tools"), name, schema_key="input_schema")
+
+    def tool_response(self, name, arguments, usage):
+        data = self.response("", usage)
+        data["content"] = [{"type": "tool_use", "id": "toolu_mock", "name": name, "input": json.loads(arguments)}]
+        data["stop_reason"] = "tool_use"
+        return data
+
+    def tool_stream_events(self, name, chunks, usage, interval):
+        start_usage = dict(self._usage(usage), output_tokens=1)
+        yield _sse({"type": "message_start", "message": {"id": "msg_mock", "type": "message", "role": "assistant",
+                                                          "model": self.body.get("model"), "content": [],
+                                                          "usage": start_usage}}, "message_start")
+        block = {"type": "tool_use", "id": "toolu_mock", "name": name, "input": {}}
+        yield _sse({"type": "content_block_start", "index": 0, "content_block": block}, "content_block_start")
+        for chunk in chunks:
+            delta = {"type": "input_json_delta", "partial_json": chunk}
+            yield _sse({"type": "content_block_delta", "index": 0, "delta": delta}, "content_block_delta")
+            time.sleep(interval)
+        yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        yield _sse({"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": usage["output"]}}, "message_delta")
+        yield _sse({"type": "message_stop"}, "message_stop")
+
+    def response(self, text, usage):
+        return {
+            "id": "msg_mock",
+            "type": "message",
+            "role": "assistant",
+            "model": self.body.get("model"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": self._usage(usage)
+        }
+
+    def _usage(self, usage):
+        cache_key, prefix = self.cache_key()
+        creation = count_tokens(prefix) if cache_key and not usage["cached"] else 0
+        return {
+            "input_tokens": max(usage["input"] - usage["cached"] - creation, 0),
+            "output_tokens": usage["output"],
+            "cache_read_input_tokens": usage["cached"],
+            "cache_creation_input_tokens": creation
+        }
+
+    def stream_events(self, words, usage, interval):
+        start_usage = dict(self._usage(usage), output_tokens=1)
+        yield _sse({"type": "message_start", "message": {"id": "msg_mock", "type": "message", "role": "assistant",
+                                                          "model": self.body.get("model"), "content": [],
+                                                          "usage": start_usage}}, "message_start")
+        yield _sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        for index, word in enumerate(words):
+            delta = {"type": "text_delta", "text": (" " if index else "") + word}
+            yield _sse({"type": "content_block_delta", "index": 0, "delta": delta}, "content_block_delta")
+            time.sleep(interval)
+        yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        yield _sse({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": usage["output"]}}, "message_delta")
+        yield _sse({"type": "message_stop"}, "message_stop")
+
+
+class GeminiProtocol:
+    """Gemini generateContent request/response shapes."""
+
+    def __init__(self, body, stream=False):
+        self.body = body
+        self.stream = stream
+
+    def prompt_text(self):
+        system = "".join(part.get("text", "") for part in self.body.get("systemInstruction", {}).get("parts", []))
+        return system + "".join(
+            part.get("text", "") for content in self.body.get("contents", []) for part in content.get("parts", [])
+        )
+
+    def max_tokens(self):
+        return self.body.get("generationConfig", {}).get("maxOutputTokens")
+
+    def cache_key(self):
+        # Implicit caching on repeated prefixes
+        return "gemini", self.prompt_text()
+
+    def forced_tool(self):
+        names = self.body.get("toolConfig", {}).get("functionCallingConfig", {}).get("allowedFunctionNames") or [None]
+        declarations = [d for tool in self.body.get("tools", []) for d in tool.get("functionDeclarations", [])]
+        return _forced_tool(declarations, names[0])
+
+    def tool_response(self, name, arguments, usage):
+        data = self.response("", usage)
+        data["candidates"][0]["content"]["parts"] = [{"functionCall": {"name": name, "args": json.loads(arguments)}}]
+        return data
+
+    def tool_stream_events(self, name, chunks, usage, interval):
+        # Gemini streams function calls whole, in a single event
+        time.sleep(interval * len(chunks))
+        yield _sse(self.tool_response(name, "".join(chunks), usage))
+
+    def response(self, text, usage, finish_reason="STOP"):
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": finish_reason}],
+            "usageMetadata": {
+                "promptTokenCount": usage["input"],
+                "candidatesTokenCount": usage["output"],
+                "cachedContentTokenCount": usage["cached"]
+            }
+        }
+
+    def stream_events(self, words, usage, interval):
+        for index, word in enumerate(words):
+            finish_reason = "STOP" if index == len(words) - 1 else None
+            event = self.response((" " if index else "") + word, usage, finish_reason)
+            if finish_reason is None:
+                del event["candidates"][0]["finishReason"]
+            yield _sse(event)
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Cogito mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=int, default=80)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rpm", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rpm=args.rate_limit_rpm
+    ).start()
+    print(f"Point the app at it with COGITO_OPENAI_BASE_URL={server.base_url}/v1 "
+          f"COGITO_ANTHROPIC_BASE_URL={server.base_url}/v1 COGITO_GEMINI_BASE_URL={server.base_url}/v1beta")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
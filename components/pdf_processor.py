@@ -1,15 +1,26 @@
 import os
 import re
 import PyPDF2  # Use PyPDF2 instead of PyMuPDF
-import nltk
-from nltk.tokenize import sent_tokenize
 from datetime import datetime
+from .cancellation import CancelledError
+from .telemetry import telemetry
+
+_sent_tokenize = None
+
+
+def sent_tokenize(text):
+    """Split text into sentences with NLTK, imported on first use since it is slow to load."""
+    global _sent_tokenize
+    if _sent_tokenize is None:
+        import nltk
+        # Download NLTK data if not already present
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+        from nltk.tokenize import sent_tokenize as _sent_tokenize
+    return _sent_tokenize(text)
 
-# Download NLTK data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
 
 class PDFProcessor:
     """
@@ -21,9 +32,16 @@ class PDFProcessor:
     - Metadata extraction
     """
     
-    def __init__(self):
-        """Initialize the PDF processor"""
+    def __init__(self, cancel_token=None):
+        """
+        Initialize the PDF processor
+
+        Args:
+            cancel_token (CancellationToken, optional): Checked between files and pages;
+                processing raises CancelledError once it is cancelled
+        """
         self.processed_pdfs = {}  # Store processed PDF content
+        self.cancel_token = cancel_token
         
     def process_pdf(self, file_path):
         """
@@ -35,6 +53,7 @@ class PDFProcessor:
         Returns:
             dict: Dictionary with processed content and metadata
         """
+        self._check_cancelled()
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
             
@@ -42,17 +61,23 @@ class PDFProcessor:
         file_name = os.path.basename(file_path)
         file_size = os.path.getsize(file_path) / 1024  # KB
         
-        # Extract text
-        raw_text = self._extract_text(file_path)
-        
-        # Clean text
-        cleaned_text = self._clean_text(raw_text)
-        
-        # Chunk text
-        chunks = self._chunk_text(cleaned_text)
-        
-        # Count tokens (approximation)
-        token_count = self._estimate_token_count(cleaned_text)
+        with telemetry.span("pdf_process", file=file_name, size_kb=round(file_size)):
+            # Extract text
+            with telemetry.span("pdf_extract"):
+                raw_text = self._extract_text(file_path)
+
+            # Clean text
+            with telemetry.span("pdf_clean"):
+                cleaned_text = self._clean_text(raw_text)
+
+            # Chunk text
+            with telemetry.span("pdf_chunk"):
+                chunks = self._chunk_text(cleaned_text)
+
+            # Count tokens (approximation)
+            with telemetry.span("pdf_token_count"):
+                token_count = self._estimate_token_count(cleaned_text)
+        telemetry.increment("cogito_pdf_files_total")
         
         result = {
             'file_path': file_path,
@@ -89,16 +114,24 @@ class PDFProcessor:
                 
                 # Extract text from each page
                 for page_num in range(len(pdf_reader.pages)):
+                    self._check_cancelled()
                     page = pdf_reader.pages[page_num]
                     text += page.extract_text() or ""  # Some pages might return None
                     # Add page markers to help with structure
                     text += f"\n\n--- Page {page_num + 1} ---\n\n"
+        except CancelledError:
+            raise
         except Exception as e:
             print(f"Error extracting text from PDF: {str(e)}")
             text = f"[Error extracting PDF: {str(e)}]"
             
         return text
     
+    def _check_cancelled(self):
+        """Raise CancelledError if the processor's cancellation token has been cancelled."""
+        if self.cancel_token:
+            self.cancel_token.raise_if_cancelled()
+
     def _clean_text(self, text):
         """
         Clean and normalize the extracted text
@@ -257,7 +290,28 @@ class PDFProcessor:
                     break
         
         return combined_text, total_tokens, processed_files
-        
+
+    def get_chunks(self, file_paths):
+        """
+        Get all text chunks from multiple PDFs, tagged with their source file
+
+        Args:
+            file_paths (list): List of PDF file paths
+
+        Returns:
+            list: List of (file_name, chunk_text) tuples in document order
+        """
+        chunks = []
+
+        for file_path in file_paths:
+            if file_path not in self.processed_pdfs:
+                self.process_pdf(file_path)
+            pdf_data = self.processed_pdfs[file_path]
+            for chunk in pdf_data['chunks']:
+                chunks.append((pdf_data['file_name'], chunk))
+
+        return chunks
+
     def log_processed_content(self, file_paths):
         """
         Generate a log of all processed content
@@ -0,0 +1,110 @@
+import queue
+import threading
+
+
+class StagedPipeline:
+    """
+    Runs items through a sequence of stages, each with its own worker pool.
+
+    Stages overlap across items: while one item is in the second stage, the next
+    item can already be in the first. Each stage has its own concurrency limit, and
+    the number of items waiting in or being processed by each stage is reported
+    through a callback so the UI can show queue depths.
+    """
+
+    def __init__(self, stages, on_complete, on_error, on_depth_change=None):
+        """
+        Initialize the pipeline
+
+        Args:
+            stages (list): (name, stage_function, concurrency) tuples, in order. Each stage
+                function receives the item dict and returns it (updated) for the next stage
+            on_complete (callable): Called as on_complete(item) after the last stage
+            on_error (callable): Called as on_error(item, stage_name, error) when a stage fails
+            on_depth_change (callable, optional): Called as on_depth_change(depths) whenever
+                a stage's depth changes, with a {stage_name: count} dict
+        """
+        self.stages = [
+            {"name": name, "function": function, "concurrency": concurrency, "queue": queue.Queue(), "depth": 0}
+            for name, function, concurrency in stages
+        ]
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.on_depth_change = on_depth_change
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """Start the stage workers (called automatically by the first submit)."""
+        if self._threads:
+            return
+        for index, stage in enumerate(self.stages):
+            for number in range(stage["concurrency"]):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"cogito-{stage['name']}-{number + 1}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, item):
+        """
+        Queue an item at the first stage
+
+        Args:
+            item (dict): Item to process
+        """
+        self.start()
+        self._enqueue(0, item)
+
+    def queue_depths(self):
+        """Get the number of items queued or in progress at each stage."""
+        with self._lock:
+            return {stage["name"]: stage["depth"] for stage in self.stages}
+
+    def shutdown(self):
+        """Stop the workers once the items already queued have been processed."""
+        for stage in self.stages:
+            for _ in range(stage["concurrency"]):
+                stage["queue"].put(None)
+        self._threads = []
+
+    def _enqueue(self, index, item):
+        """Put an item on a stage queue and report the new depth."""
+        stage = self.stages[index]
+        with self._lock:
+            stage["depth"] += 1
+        stage["queue"].put(item)
+        self._notify_depths()
+
+    def _worker(self, index):
+        """Process items of one stage until shut down."""
+        stage = self.stages[index]
+        while True:
+            item = stage["queue"].get()
+            if item is None:
+                break
+
+            try:
+                item = stage["function"](item)
+            except Exception as e:
+                print(f"Pipeline: stage '{stage['name']}' failed for '{item.get('label')}': {e}")
+                self.on_error(item, stage["name"], e)
+            else:
+                # Hand over to the next stage before leaving this one, so the
+                # item is never missing from the reported depths
+                if index + 1 < len(self.stages):
+                    self._enqueue(index + 1, item)
+                else:
+                    self.on_complete(item)
+            finally:
+                with self._lock:
+                    stage["depth"] -= 1
+                self._notify_depths()
+
+    def _notify_depths(self):
+        """Report the current depths to the depth callback."""
+        if self.on_depth_change:
+            self.on_depth_change(self.queue_depths())
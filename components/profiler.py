@@ -0,0 +1,108 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RunProfiler:
+    """
+    Captures a cProfile profile and tracemalloc snapshots of one Execute or research run.
+
+    capture() profiles the calling thread (the run's worker thread) and traces every
+    allocation made while the run is active. Each capture is saved under logs/ as a
+    .prof file (open it with pstats or snakeviz) and a .txt summary of the hottest
+    functions and the largest allocation sites. Calls the run hands to thread pools
+    (map-reduce extraction) are not in the profile, but their time shows up as the
+    run waiting on them, and their allocations are in the memory summary.
+    """
+
+    def __init__(self, directory="logs", top=25):
+        """
+        Args:
+            directory (str): Directory of the profile files
+            top (int): Number of functions and allocation sites listed in the summary
+        """
+        self.directory = directory
+        self.top = top
+        self.last_summary_path = None
+        self._lock = threading.Lock()  # tracemalloc is process-wide, so one capture at a time
+
+    @contextmanager
+    def capture(self, label):
+        """
+        Profile the enclosed run
+
+        Args:
+            label (str): Run name used in the file names, e.g. "execute"
+
+        Yields:
+            bool: True if this run is profiled, False if another capture was already running
+        """
+        if not self._lock.acquire(blocking=False):
+            print(f"Profiling: another run is being profiled, skipping '{label}'.")
+            yield False
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        started_at = datetime.now()
+        profile.enable()
+        try:
+            yield True
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                self._save(label, started_at, profile, before, after, current, peak)
+            finally:
+                self._lock.release()
+
+    def _save(self, label, started_at, profile, before, after, current, peak):
+        """Write the raw profile and its text summary."""
+        stamp = started_at.strftime("%Y-%m-%d_%H-%M-%S")
+        base = os.path.join(self.directory, f"profile_{re.sub(r'[^A-Za-z0-9_-]+', '_', label)}_{stamp}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(base + ".prof")
+            with open(base + ".txt", "w", encoding="utf-8") as summary_file:
+                summary_file.write(self.summarize(label, started_at, profile, before, after, current, peak))
+        except OSError as e:
+            print(f"Error saving profile: {e}")
+            return
+        self.last_summary_path = base + ".txt"
+        print(f"Profiling: saved {base}.prof and summary {base}.txt")
+
+    def summarize(self, label, started_at, profile, before, after, current, peak):
+        """
+        Build the text summary of a capture
+
+        Returns:
+            str: Hot functions by own and cumulative time, then memory growth by allocation site
+        """
+        summary = f"Profile of {label} run started {started_at.isoformat(timespec='seconds')}\n"
+        summary += "=" * 80 + "\n\n"
+
+        for sort_key, title in (("tottime", "own time"), ("cumulative", "cumulative time")):
+            stream = io.StringIO()
+            stats = pstats.Stats(profile, stream=stream)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(self.top)
+            summary += f"Top {self.top} functions by {title}:\n{stream.getvalue()}\n"
+
+        summary += f"Memory: {current / 1024:.1f} KB traced at the end, peak {peak / 1024:.1f} KB\n"
+        summary += f"Top {self.top} allocation sites by growth during the run:\n"
+        exclude = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+        for stat in after.filter_traces(exclude).compare_to(before.filter_traces(exclude), "lineno")[:self.top]:
+            summary += f"  {stat}\n"
+        return summary
@@ -0,0 +1,647 @@
+import json
+import os
+import threading
+import time
+import requests
+from .cancellation import CancelledError
+
+
+class ProviderError(Exception):
+    """Raised when a model cannot be served by any provider adapter."""
+
+
+class ModelSpec:
+    """Describes how a model display name maps onto a provider API."""
+
+    def __init__(self, display_name, provider, api_model, context_window, reasoning=False):
+        """
+        Args:
+            display_name (str): Name shown in the model combo boxes
+            provider (str): Provider adapter name, or None if the model has no public API
+            api_model (str): Model identifier expected by the provider API
+            context_window (int): Context window in tokens
+            reasoning (bool): Whether the model uses reasoning-model request rules
+        """
+        self.display_name = display_name
+        self.provider = provider
+        self.api_model = api_model
+        self.context_window = context_window
+        self.reasoning = reasoning
+
+
+# Model display names used in the workspaces, mapped to their provider APIs
+MODEL_REGISTRY = {spec.display_name: spec for spec in [
+    ModelSpec("Claude 3 Opus", "anthropic", "claude-3-opus-20240229", 200000),
+    ModelSpec("Claude 3.5 Haiku", "anthropic", "claude-3-5-haiku-20241022", 150000),
+    ModelSpec("Claude 3.5 Sonnet", "anthropic", "claude-3-5-sonnet-20241022", 180000),
+    ModelSpec("Claude 3.7 Sonnet", "anthropic", "claude-3-7-sonnet-20250219", 180000),
+    ModelSpec("Claude 4 Opus", "anthropic", "claude-opus-4-20250514", 200000),
+    ModelSpec("Claude 4 Sonnet", "anthropic", "claude-sonnet-4-20250514", 180000),
+    ModelSpec("Cursor Small", None, "cursor-small", 32000),
+    ModelSpec("Deepseek R1", "deepseek", "deepseek-reasoner", 64000),
+    ModelSpec("Deepseek V3", "deepseek", "deepseek-chat", 128000),
+    ModelSpec("Gemini 2.0 Pro (exp)", "gemini", "gemini-2.0-pro-exp-02-05", 32000),
+    ModelSpec("Gemini 2.5 Flash", "gemini", "gemini-2.5-flash", 1000000),
+    ModelSpec("Gemini 2.5 Pro", "gemini", "gemini-2.5-pro", 1000000),
+    ModelSpec("GPT 4.1", "openai", "gpt-4.1", 128000),
+    ModelSpec("GPT 4.5 Preview", "openai", "gpt-4.5-preview", 256000),
+    ModelSpec("GPT-4o", "openai", "gpt-4o", 128000),
+    ModelSpec("GPT-4o mini", "openai", "gpt-4o-mini", 128000),
+    ModelSpec("Grok 2", "xai", "grok-2-1212", 128000),
+    ModelSpec("Grok 3 Beta", "xai", "grok-3-beta", 128000),
+    ModelSpec("Grok 3 Mini Beta", "xai", "grok-3-mini-beta", 64000),
+    ModelSpec("o1", "openai", "o1", 128000, reasoning=True),
+    ModelSpec("o1 Mini", "openai", "o1-mini", 64000, reasoning=True),
+    ModelSpec("o3", "openai", "o3", 128000, reasoning=True),
+    ModelSpec("o3-mini", "openai", "o3-mini", 64000, reasoning=True),
+    ModelSpec("o4-mini", "openai", "o4-mini", 64000, reasoning=True),
+]}
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Raw API model id prefixes, for models passed by id rather than display name
+_PREFIX_PROVIDERS = [
+    ("claude", "anthropic"),
+    ("gemini", "gemini"),
+    ("deepseek", "deepseek"),
+    ("grok", "xai"),
+    ("gpt", "openai"),
+    ("o1", "openai"),
+    ("o3", "openai"),
+    ("o4", "openai"),
+]
+
+
+def get_model_spec(model):
+    """
+    Resolve a model display name or raw API model id to its ModelSpec
+
+    Args:
+        model (str): Model display name (e.g. "GPT-4o") or API id (e.g. "gpt-4o")
+
+    Returns:
+        ModelSpec: The resolved model spec
+    """
+    if model in MODEL_REGISTRY:
+        return MODEL_REGISTRY[model]
+
+    for spec in MODEL_REGISTRY.values():
+        if spec.api_model == model:
+            return spec
+
+    model_id = (model or "").lower()
+    for prefix, provider in _PREFIX_PROVIDERS:
+        if model_id.startswith(prefix):
+            return ModelSpec(model, provider, model, DEFAULT_CONTEXT_WINDOW, reasoning=prefix.startswith("o"))
+
+    return ModelSpec(model, None, model, DEFAULT_CONTEXT_WINDOW)
+
+
+def get_context_window(model):
+    """Get the context window in tokens for a model display name or API id."""
+    return get_model_spec(model).context_window
+
+
+def split_messages(messages):
+    """
+    Split OpenAI-style messages into the system prompt and the conversation turns
+
+    Returns:
+        tuple: (system_text, [(role, blocks), ...]) where blocks come from content_blocks()
+    """
+    system_parts = []
+    turns = []
+    for message in messages:
+        if message.get("role") == "system":
+            system_parts.append(message_text(message.get("content")))
+        else:
+            turns.append((message.get("role", "user"), content_blocks(message.get("content"))))
+    return "\n\n".join(system_parts), turns
+
+
+def content_blocks(content):
+    """
+    Normalize a message content into text blocks
+
+    Content is either a plain string or a list of {"type": "text", "text": ..., "cache": bool}
+    blocks, where "cache" marks the end of a prefix worth caching provider-side.
+    """
+    if isinstance(content, list):
+        return [{"text": block.get("text", ""), "cache": bool(block.get("cache"))} for block in content]
+    return [{"text": content or "", "cache": False}]
+
+
+def message_text(content):
+    """Flatten a message content (plain string or list of text blocks) into text."""
+    return "".join(block["text"] for block in content_blocks(content))
+
+
+class ProviderAdapter:
+    """
+    Base class for provider adapters.
+
+    The rest of the app builds OpenAI-shaped payloads ({model, messages,
+    temperature, max_tokens} plus an optional prompt-caching cache_key). Each adapter translates them into the provider's
+    native endpoint, auth scheme and request schema, and normalizes responses to:
+
+        {
+            "choices": [{"message": {"content": ...}, "finish_reason": ...}],
+            "provider": ..., "model": ...,
+            "usage": {"input_tokens", "output_tokens", "cached_input_tokens", "cache_creation_input_tokens"},
+            "latency": {"total_ms", "ttft_ms", "retries"}
+        }
+
+    A payload may also declare function-calling tools as {"tools": [{"name", "description",
+    "parameters"}], "tool_choice": name}. The named tool is forced, and the response content
+    (and every streamed delta) is the JSON text of the tool call arguments.
+    """
+    name = None
+    default_base_url = None
+
+    def __init__(self, base_url=None):
+        """
+        Args:
+            base_url (str, optional): Override of the API base URL, e.g. a local mock server.
+                Defaults to the COGITO_<NAME>_BASE_URL environment variable, then the public API.
+        """
+        env_base_url = os.environ.get(f"COGITO_{self.name.upper()}_BASE_URL")
+        self.base_url = (base_url or env_base_url or self.default_base_url).rstrip("/")
+
+    def endpoint(self, spec, stream=False):
+        """Return the full endpoint URL for a model."""
+        raise NotImplementedError
+
+    def build_headers(self, api_key):
+        """Return the auth and content headers."""
+        raise NotImplementedError
+
+    def build_body(self, payload, spec, stream=False):
+        """Translate an OpenAI-shaped payload into the native request body."""
+        raise NotImplementedError
+
+    def parse_response(self, data):
+        """
+        Parse a native non-streaming response
+
+        Returns:
+            tuple: (text, finish_reason, usage)
+        """
+        raise NotImplementedError
+
+    def parse_stream_event(self, event, state):
+        """
+        Parse one decoded server-sent event of a streaming response
+
+        Args:
+            event (dict): Decoded JSON data of the event
+            state (dict): Accumulator shared across events ('finish_reason', 'usage')
+
+        Returns:
+            str: Text delta carried by the event, or "" if none
+        """
+        raise NotImplementedError
+
+    def complete(self, payload, api_key, spec, timeout=60, on_delta=None, max_retries=2, cancel_token=None):
+        """
+        Send a payload to the provider and return the normalized response
+
+        Rate-limited (429) and server error (5xx) responses are retried with backoff,
+        honoring the Retry-After header when the provider sends one.
+
+        Args:
+            payload (dict): OpenAI-shaped payload
+            api_key (str): Provider API key
+            spec (ModelSpec): Resolved model spec
+            timeout (int): Request timeout in seconds
+            on_delta (callable, optional): When given, the response is streamed and
+                on_delta(text) is called for every text delta as it arrives
+            max_retries (int): Retries for rate-limited and server error responses
+            cancel_token (CancellationToken, optional): Cancelling it aborts the connection,
+                stops streaming and raises CancelledError
+
+        Returns:
+            dict: Normalized response
+        """
+        stream = on_delta is not None
+        url = self.endpoint(spec, stream=stream)
+        body = self.build_body(payload, spec, stream=stream)
+        headers = self.build_headers(api_key)
+
+        start = time.perf_counter()
+        ttft_ms = None
+        for attempt in range(max_retries + 1):
+            response = self._post(url, body, headers, timeout, stream, cancel_token)
+            if attempt < max_retries and (response.status_code == 429 or response.status_code >= 500):
+                delay = self._retry_delay(response, attempt)
+                print(f"{self.name} returned HTTP {response.status_code}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})...")
+                response.close()
+                if cancel_token is None:
+                    time.sleep(delay)
+                elif cancel_token.wait(delay):
+                    raise CancelledError("LLM request cancelled")
+                continue
+            break
+
+        # Closing the response from the cancelling thread unblocks a pending read
+        close_on_cancel = cancel_token.add_callback(response.close) if cancel_token else None
+        try:
+            response.raise_for_status()
+
+            if stream:
+                state = {"finish_reason": None, "usage": {}}
+                parts = []
+                for event in self._iter_sse(response):
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    delta = self.parse_stream_event(event, state)
+                    if delta:
+                        if ttft_ms is None:
+                            ttft_ms = (time.perf_counter() - start) * 1000
+                        parts.append(delta)
+                        on_delta(delta)
+                text, finish_reason, usage = "".join(parts), state["finish_reason"], state["usage"]
+            else:
+                text, finish_reason, usage = self.parse_response(response.json())
+        except CancelledError:
+            raise
+        except Exception:
+            if cancel_token and cancel_token.is_cancelled:
+                raise CancelledError("LLM request cancelled")
+            raise
+        finally:
+            if close_on_cancel:
+                cancel_token.remove_callback(close_on_cancel)
+            response.close()
+
+        total_ms = (time.perf_counter() - start) * 1000
+        normalized = self._normalize(spec, text, finish_reason, usage, total_ms, ttft_ms)
+        normalized["latency"]["retries"] = attempt
+        return normalized
+
+    def _post(self, url, body, headers, timeout, stream, cancel_token=None):
+        """
+        POST a request body, returning as soon as the response headers arrive
+
+        With a cancellation token the request is sent from a helper thread, so the caller
+        is released as soon as the token is cancelled, even while waiting for headers;
+        a response that arrives after cancellation is closed by the helper.
+
+        Raises:
+            CancelledError: If the token is cancelled before the headers arrive
+        """
+        if cancel_token is None:
+            return requests.post(url, json=body, headers=headers, timeout=timeout, stream=stream)
+
+        cancel_token.raise_if_cancelled()
+        result = {}
+        done = threading.Event()
+
+        def send():
+            try:
+                result["response"] = requests.post(url, json=body, headers=headers, timeout=timeout, stream=True)
+            except Exception as e:
+                result["error"] = e
+            finally:
+                done.set()
+                if cancel_token.is_cancelled and "response" in result:
+                    result["response"].close()
+
+        threading.Thread(target=send, name=f"cogito-{self.name}-request", daemon=True).start()
+        if not cancel_token.wait_for(done):
+            raise CancelledError("LLM request cancelled")
+        if "error" in result:
+            raise result["error"]
+        return result["response"]
+
+    def _retry_delay(self, response, attempt, max_delay=30):
+        """Seconds to wait before retrying: Retry-After when given, exponential backoff otherwise."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return min(float(retry_after), max_delay)
+        except (TypeError, ValueError):
+            return min(0.5 * 2 ** attempt, max_delay)
+
+    def _iter_sse(self, response):
+        """Yield the decoded JSON data of each server-sent event."""
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                yield json.loads(data)
+            except json.JSONDecodeError:
+                print(f"Skipping malformed stream event from {self.name}: {data[:80]}")
+
+    def _normalize(self, spec, text, finish_reason, usage, total_ms, ttft_ms):
+        """Build the normalized response dict."""
+        return {
+            "choices": [{"message": {"role": "assistant", "content": text}, "finish_reason": finish_reason}],
+            "provider": self.name,
+            "model": spec.api_model,
+            "usage": {
+                "input_tokens": usage.get("input_tokens", 0),
+                "output_tokens": usage.get("output_tokens", 0),
+                "cached_input_tokens": usage.get("cached_input_tokens", 0),
+                "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0),
+            },
+            "latency": {
+                "total_ms": round(total_ms, 1),
+                "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+            },
+        }
+
+
+class OpenAIAdapter(ProviderAdapter):
+    """OpenAI Chat Completions API, also used by OpenAI-compatible providers.
+
+    OpenAI caches long prompt prefixes automatically; the payload's cache_key is sent as
+    prompt_cache_key so runs sharing a prefix are routed to the same cache.
+    """
+    name = "openai"
+    default_base_url = "https://api.openai.com/v1"
+    supports_prompt_cache_key = True
+
+    def endpoint(self, spec, stream=False):
+        return f"{self.base_url}/chat/completions"
+
+    def build_headers(self, api_key):
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def build_body(self, payload, spec, stream=False):
+        messages = [
+            {"role": message["role"], "content": message_text(message.get("content"))}
+            for message in payload["messages"]
+        ]
+        body = {"model": spec.api_model, "messages": messages}
+        if self.supports_prompt_cache_key and payload.get("cache_key"):
+            body["prompt_cache_key"] = payload["cache_key"]
+
+        if spec.reasoning:
+            # Reasoning models take developer instructions and reject temperature/max_tokens
+            for message in messages:
+                if message["role"] == "system":
+                    message["role"] = "developer"
+            body["max_completion_tokens"] = payload.get("max_tokens")
+        else:
+            body["temperature"] = payload.get("temperature", 0.7)
+            body["max_tokens"] = payload.get("max_tokens")
+
+        if payload.get("tools"):
+            body["tools"] = [{"type": "function", "function": tool} for tool in payload["tools"]]
+            if payload.get("tool_choice"):
+                body["tool_choice"] = {"type": "function", "function": {"name": payload["tool_choice"]}}
+
+        if stream:
+            body["stream"] = True
+            body["stream_options"] = {"include_usage": True}
+        return body
+
+    def parse_response(self, data):
+        choice = data["choices"][0]
+        message = choice["message"]
+        if message.get("tool_calls"):
+            text = "".join(call["function"].get("arguments") or "" for call in message["tool_calls"])
+        else:
+            text = message.get("content") or ""
+        return text, choice.get("finish_reason"), self._parse_usage(data.get("usage"))
+
+    def parse_stream_event(self, event, state):
+        if event.get("usage"):
+            state["usage"] = self._parse_usage(event["usage"])
+        if not event.get("choices"):
+            return ""
+        choice = event["choices"][0]
+        if choice.get("finish_reason"):
+            state["finish_reason"] = choice["finish_reason"]
+        delta = choice.get("delta", {})
+        if delta.get("tool_calls"):
+            return "".join(call.get("function", {}).get("arguments") or "" for call in delta["tool_calls"])
+        return delta.get("content") or ""
+
+    def _parse_usage(self, usage):
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "cached_input_tokens": details.get("cached_tokens", 0),
+        }
+
+
+class DeepSeekAdapter(OpenAIAdapter):
+    """DeepSeek API (OpenAI-compatible, prefix caching is automatic)."""
+    name = "deepseek"
+    default_base_url = "https://api.deepseek.com/v1"
+    supports_prompt_cache_key = False
+
+    def _parse_usage(self, usage):
+        parsed = super()._parse_usage(usage)
+        parsed["cached_input_tokens"] = (usage or {}).get("prompt_cache_hit_tokens", parsed["cached_input_tokens"])
+        return parsed
+
+
+class XAIAdapter(OpenAIAdapter):
+    """xAI Grok API (OpenAI-compatible, prefix caching is automatic)."""
+    name = "xai"
+    default_base_url = "https://api.x.ai/v1"
+    supports_prompt_cache_key = False
+
+
+class AnthropicAdapter(ProviderAdapter):
+    """Anthropic Messages API.
+
+    Caching is explicit: the block marked "cache" gets a cache_control breakpoint, which
+    caches the system prompt and every block up to and including it.
+    """
+    name = "anthropic"
+    default_base_url = "https://api.anthropic.com/v1"
+    api_version = "2023-06-01"
+
+    def endpoint(self, spec, stream=False):
+        return f"{self.base_url}/messages"
+
+    def build_headers(self, api_key):
+        return {
+            "x-api-key": api_key,
+            "anthropic-version": self.api_version,
+            "Content-Type": "application/json"
+        }
+
+    def build_body(self, payload, spec, stream=False):
+        system, turns = split_messages(payload["messages"])
+        body = {
+            "model": spec.api_model,
+            "max_tokens": payload.get("max_tokens"),
+            "temperature": payload.get("temperature", 0.7),
+            "messages": [
+                {"role": role, "content": [self._build_block(block) for block in blocks]}
+                for role, blocks in turns
+            ]
+        }
+        if system:
+            body["system"] = system
+        if payload.get("tools"):
+            body["tools"] = [
+                {"name": tool["name"], "description": tool.get("description", ""), "input_schema": tool["parameters"]}
+                for tool in payload["tools"]
+            ]
+            if payload.get("tool_choice"):
+                body["tool_choice"] = {"type": "tool", "name": payload["tool_choice"]}
+        if stream:
+            body["stream"] = True
+        return body
+
+    def _build_block(self, block):
+        native = {"type": "text", "text": block["text"]}
+        if block["cache"]:
+            native["cache_control"] = {"type": "ephemeral"}
+        return native
+
+    def parse_response(self, data):
+        blocks = data.get("content", [])
+        tool_uses = [block for block in blocks if block.get("type") == "tool_use"]
+        if tool_uses:
+            text = "".join(json.dumps(block.get("input", {})) for block in tool_uses)
+        else:
+            text = "".join(block.get("text", "") for block in blocks if block.get("type") == "text")
+        return text, data.get("stop_reason"), self._parse_usage(data.get("usage"))
+
+    def parse_stream_event(self, event, state):
+        event_type = event.get("type")
+        if event_type == "message_start":
+            state["usage"] = self._parse_usage(event.get("message", {}).get("usage"))
+        elif event_type == "message_delta":
+            state["finish_reason"] = event.get("delta", {}).get("stop_reason")
+            state["usage"]["output_tokens"] = event.get("usage", {}).get("output_tokens", 0)
+        elif event_type == "content_block_delta":
+            delta = event.get("delta", {})
+            if delta.get("type") == "text_delta":
+                return delta.get("text", "")
+            if delta.get("type") == "input_json_delta":
+                return delta.get("partial_json", "")
+        elif event_type == "error":
+            raise requests.exceptions.RequestException(f"Anthropic stream error: {event.get('error')}")
+        return ""
+
+    def _parse_usage(self, usage):
+        usage = usage or {}
+        return {
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "cached_input_tokens": usage.get("cache_read_input_tokens", 0),
+            "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0),
+        }
+
+
+class GeminiAdapter(ProviderAdapter):
+    """Google Gemini generateContent API (implicit prefix caching on 2.5 models)."""
+    name = "gemini"
+    default_base_url = "https://generativelanguage.googleapis.com/v1beta"
+
+    def endpoint(self, spec, stream=False):
+        if stream:
+            return f"{self.base_url}/models/{spec.api_model}:streamGenerateContent?alt=sse"
+        return f"{self.base_url}/models/{spec.api_model}:generateContent"
+
+    def build_headers(self, api_key):
+        return {
+            "x-goog-api-key": api_key,
+            "Content-Type": "application/json"
+        }
+
+    def build_body(self, payload, spec, stream=False):
+        system, turns = split_messages(payload["messages"])
+        body = {
+            "contents": [
+                {
+                    "role": "model" if role == "assistant" else "user",
+                    "parts": [{"text": block["text"]} for block in blocks]
+                }
+                for role, blocks in turns
+            ],
+            "generationConfig": {
+                "temperature": payload.get("temperature", 0.7),
+                "maxOutputTokens": payload.get("max_tokens")
+            }
+        }
+        if system:
+            body["systemInstruction"] = {"parts": [{"text": system}]}
+        if payload.get("tools"):
+            body["tools"] = [{"functionDeclarations": payload["tools"]}]
+            if payload.get("tool_choice"):
+                body["toolConfig"] = {
+                    "functionCallingConfig": {"mode": "ANY", "allowedFunctionNames": [payload["tool_choice"]]}
+                }
+        return body
+
+    def parse_response(self, data):
+        candidate = (data.get("candidates") or [{}])[0]
+        parts = candidate.get("content", {}).get("parts", [])
+        # Gemini sends each function call whole rather than as argument deltas
+        text = "".join(
+            json.dumps(part["functionCall"].get("args", {})) if "functionCall" in part else part.get("text", "")
+            for part in parts
+        )
+        return text, candidate.get("finishReason"), self._parse_usage(data.get("usageMetadata"))
+
+    def parse_stream_event(self, event, state):
+        if event.get("usageMetadata"):
+            state["usage"] = self._parse_usage(event["usageMetadata"])
+        text, finish_reason, _ = self.parse_response(event)
+        if finish_reason:
+            state["finish_reason"] = finish_reason
+        return text
+
+    def _parse_usage(self, usage):
+        usage = usage or {}
+        return {
+            "input_tokens": usage.get("promptTokenCount", 0),
+            "output_tokens": usage.get("candidatesTokenCount", 0),
+            "cached_input_tokens": usage.get("cachedContentTokenCount", 0),
+        }
+
+
+ADAPTER_CLASSES = {
+    adapter_class.name: adapter_class
+    for adapter_class in (OpenAIAdapter, DeepSeekAdapter, XAIAdapter, AnthropicAdapter, GeminiAdapter)
+}
+
+_base_url_overrides = {}
+
+
+def set_base_url(provider, base_url):
+    """Point a provider at another base URL (e.g. a local mock server); None restores the default."""
+    if base_url:
+        _base_url_overrides[provider] = base_url
+    else:
+        _base_url_overrides.pop(provider, None)
+
+
+def get_adapter(provider):
+    """
+    Get an adapter instance for a provider name
+
+    Raises:
+        ProviderError: If no adapter exists for the provider
+    """
+    if provider not in ADAPTER_CLASSES:
+        raise ProviderError(f"No API adapter available for provider: {provider}")
+    return ADAPTER_CLASSES[provider](base_url=_base_url_overrides.get(provider))
+
+
+def resolve(model):
+    """
+    Resolve a model to its spec and adapter
+
+    Raises:
+        ProviderError: If the model has no public API
+    """
+    spec = get_model_spec(model)
+    if not spec.provider:
+        raise ProviderError(f"Model '{model}' has no supported public API")
+    return spec, get_adapter(spec.provider)
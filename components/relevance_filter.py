@@ -0,0 +1,135 @@
+import math
+import re
+from collections import Counter
+import numpy as np
+
+# scipy is optional: sparse matrix products when available, NumPy scatter-adds otherwise
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+class RelevanceFilter:
+    """
+    Local TF-IDF pre-filter that ranks articles against the research areas of interest.
+
+    The research compliance document and research prompt form the query. Every article
+    (title and abstract) becomes a sublinear TF-IDF vector with IDF taken over the
+    articles being ranked, and all of them are scored against the query with a single
+    sparse matrix-vector product (cosine similarity). Only the candidates that pass
+    the threshold, at most top_n of them, are worth an LLM judgment.
+    """
+
+    TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9\-]+")
+    STOP_WORDS = frozenset("""
+        a about above after again against all also am an and any are as at be because been before being below
+        between both but by can could did do does doing down during each few for from further had has have
+        having he her here hers herself him himself his how i if in into is it its itself just may me might
+        more most must my myself no nor not now of off on once only or other our ours ourselves out over own
+        same she should so some such than that the their theirs them themselves then there these they this
+        those through to too under until up upon very was we were what when where which while who whom why
+        will with within without would you your yours yourself yourselves study studies results using used
+        based however among via new et al
+    """.split())
+
+    def __init__(self, top_n=40, threshold=0.05):
+        """
+        Args:
+            top_n (int): Most candidates kept
+            threshold (float): Minimum cosine similarity to the query
+        """
+        self.top_n = top_n
+        self.threshold = threshold
+
+    def tokenize(self, text):
+        """Lowercase word tokens without stop words."""
+        return [token for token in self.TOKEN_PATTERN.findall((text or "").lower()) if token not in self.STOP_WORDS]
+
+    def score(self, query_texts, documents):
+        """
+        Score documents against a query
+
+        Args:
+            query_texts (list): Texts describing the areas of interest (joined into one query)
+            documents (list): Document texts
+
+        Returns:
+            numpy.ndarray: Cosine similarity of each document to the query, in [0, 1]
+        """
+        if not documents:
+            return np.zeros(0)
+
+        rows, columns, weights, vocabulary, idf = self._weights(documents)
+        query_counts = Counter(token for token in self.tokenize(" ".join(query_texts)) if token in vocabulary)
+        if not len(rows) or not query_counts:
+            return np.zeros(len(documents))
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(documents)))
+
+        query = np.zeros(len(vocabulary))
+        for token, count in query_counts.items():
+            query[vocabulary[token]] = (1 + math.log(count)) * idf[vocabulary[token]]
+        query /= np.linalg.norm(query)
+
+        if sparse is not None:
+            matrix = sparse.csr_matrix((weights, (rows, columns)), shape=(len(documents), len(vocabulary)))
+            dots = matrix @ query
+        else:
+            dots = np.bincount(rows, weights=weights * query[columns], minlength=len(documents))
+        return np.divide(dots, norms, out=np.zeros(len(documents)), where=norms > 0)
+
+    def vectors(self, documents):
+        """
+        Dense TF-IDF vectors of a small set of documents, e.g. to compare them with each other
+
+        Returns:
+            numpy.ndarray: One L2-normalized row per document (all zeros for a document without terms)
+        """
+        rows, columns, weights, vocabulary, _ = self._weights(documents)
+        matrix = np.zeros((len(documents), len(vocabulary)))
+        matrix[rows, columns] = weights
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def _weights(self, documents):
+        """
+        Sublinear TF-IDF weights of documents, with smoothed IDF over the documents
+
+        Returns:
+            tuple: (rows, columns, weights, vocabulary, idf) with the nonzero weights as coordinate arrays
+        """
+        vocabulary = {}
+        rows, columns, counts = [], [], []
+        for row, text in enumerate(documents):
+            for token, count in Counter(self.tokenize(text)).items():
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+                counts.append(count)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.float64)
+        document_frequency = np.bincount(columns, minlength=len(vocabulary))
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+        weights = (1 + np.log(counts)) * idf[columns]
+        return rows, columns, weights, vocabulary, idf
+
+    def select(self, articles, query_texts):
+        """
+        Split articles into candidates for the LLM and the rest
+
+        Each article gets a 'relevance_score'. Candidates are the articles scoring at
+        least the threshold, best first, capped at top_n.
+
+        Returns:
+            tuple: (candidates, deferred, rejected) where deferred passed the threshold
+                but did not make the top_n, and rejected did not pass it
+        """
+        scores = self.score(query_texts, [f"{article.get('title', '')}\n{article.get('abstract', '')}" for article in articles])
+        for article, score in zip(articles, scores):
+            article["relevance_score"] = round(float(score), 4)
+
+        order = np.argsort(-scores, kind="stable")
+        passing = [articles[index] for index in order if scores[index] >= self.threshold]
+        rejected = [articles[index] for index in order if scores[index] < self.threshold]
+        return passing[:self.top_n], passing[self.top_n:], rejected
@@ -0,0 +1,200 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .article_store import ArticleStore
+from .cancellation import CancelledError
+from .streaming_json import IncrementalJSONParser
+
+
+class ResearchBatcher:
+    """
+    Judges research candidates in batches of abstracts instead of one request each:
+    - Packing: candidates, best ranked first, fill each request up to the model window
+      left after the research guide and the reserved output, and up to the number of
+      per-article results the research max tokens can hold (capped at max_items)
+    - Each request returns one structured result per article, keyed by its list number
+    - Batches run concurrently; a batch whose call fails or whose results cannot be
+      parsed is split in half and both halves are retried, and articles the model
+      skipped are retried in a batch of their own, up to max_attempts
+    - Judgments are stored as each batch completes; articles of batches that still
+      fail stay unjudged, so the next run picks them up
+    """
+
+    RESULT_TOKENS = 80  # Output tokens reserved per article result
+    REQUEST_OVERHEAD_TOKENS = 500  # System prompt, tool schema and message framing
+
+    def __init__(self, agent, max_workers=4, max_items=20, max_attempts=3):
+        """
+        Initialize the research batcher
+
+        Args:
+            agent (Agent): Agent used for payload preparation, LLM calls and the article store
+            max_workers (int): Maximum number of concurrent batch requests
+            max_items (int): Maximum number of articles per request
+            max_attempts (int): Attempts per article before it is left for the next run
+        """
+        self.agent = agent
+        self.max_workers = max_workers
+        self.max_items = max_items
+        self.max_attempts = max_attempts
+
+    def plan(self, inputs, articles):
+        """
+        Pack articles into batches that each fit one request
+
+        Args:
+            inputs (dict): Research inputs (model, token_limit, max_tokens, compliance, prompt)
+            articles (list): Articles to judge, in the order they should be packed
+
+        Returns:
+            list: Lists of articles; an article too large for any request gets a batch of its own
+        """
+        model = inputs["model"]
+        window = (
+            inputs["token_limit"] - inputs["max_tokens"] - self.REQUEST_OVERHEAD_TOKENS
+            - self.agent._estimate_token_count(self.agent.research_guide_text(inputs), model)
+        )
+        max_items = max(1, min(self.max_items, inputs["max_tokens"] // self.RESULT_TOKENS))
+
+        batches = []
+        batch, used = [], 0
+        for article in articles:
+            tokens = self.agent._estimate_token_count(self.agent.format_research_entry(len(batch) + 1, article), model)
+            if batch and (used + tokens > window or len(batch) >= max_items):
+                batches.append(batch)
+                batch, used = [], 0
+            batch.append(article)
+            used += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def prepare_payload(self, inputs, batch):
+        """Prepare the request of one batch, with its output reservation sized to the batch."""
+        payload = self.agent.prepare_research_payload(inputs, batch)
+        payload["max_tokens"] = min(inputs["max_tokens"], self.RESULT_TOKENS * len(batch) + 200)
+        return payload
+
+    def score(self, inputs, articles, on_suggestion=None, cancel_token=None):
+        """
+        Judge articles with concurrent batched requests
+
+        Args:
+            inputs (dict): Research inputs
+            articles (list): Articles to judge, best candidates first
+            on_suggestion (callable, optional): Called from worker threads with each suggestion as soon as it is parsed
+            cancel_token (CancellationToken, optional): Cancels the pending and in-flight batches
+
+        Returns:
+            tuple: (suggestions, number of articles judged)
+
+        Raises:
+            CancelledError: If the token is cancelled
+        """
+        with self.agent.telemetry.span("payload_assembly", articles=len(articles)):
+            batches = self.plan(inputs, articles)
+        print(f"Research: judging {len(articles)} articles in {len(batches)} batches with up to {self.max_workers} workers...")
+
+        query_hash = ArticleStore.query_hash(inputs["compliance"], inputs["prompt"])
+        suggestions = []
+        judged = 0
+        unjudged = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+
+            def submit(batch, attempt):
+                # Each batch runs in a copy of the caller's context, so its spans join the run's trace
+                future = executor.submit(contextvars.copy_context().run, self._score_batch, inputs, batch, on_suggestion, cancel_token)
+                futures[future] = (batch, attempt)
+
+            for batch in batches:
+                submit(batch, 1)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch, attempt = futures.pop(future)
+                    try:
+                        outcome = future.result()
+                    except CancelledError:
+                        for other in futures:
+                            other.cancel()
+                        print("Research: cancelled.")
+                        raise
+                    except Exception as e:
+                        print(f"Research: batch of {len(batch)} articles failed: {e}")
+                        outcome = None
+
+                    if outcome is None:
+                        if attempt >= self.max_attempts:
+                            unjudged += len(batch)
+                        elif len(batch) > 1:
+                            middle = len(batch) // 2
+                            print(f"Research: splitting a failed batch of {len(batch)} articles and retrying.")
+                            submit(batch[:middle], attempt + 1)
+                            submit(batch[middle:], attempt + 1)
+                        else:
+                            submit(batch, attempt + 1)
+                        continue
+
+                    batch_suggestions, batch_judged, skipped = outcome
+                    self.agent.article_store.record_judgments(batch_judged, batch_suggestions, query_hash)
+                    suggestions.extend(batch_suggestions)
+                    judged += len(batch_judged)
+                    if skipped:
+                        if attempt >= self.max_attempts:
+                            unjudged += len(skipped)
+                        else:
+                            submit(skipped, attempt + 1)
+
+        if unjudged:
+            print(f"Research: {unjudged} articles could not be judged and will be retried on the next run.")
+        return suggestions, judged
+
+    def _score_batch(self, inputs, batch, on_suggestion=None, cancel_token=None):
+        """
+        Judge one batch
+
+        Returns:
+            tuple: (suggestions, judged articles, articles without a result), or None if no
+                usable result was returned
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        parser = IncrementalJSONParser()
+        results = {}
+        suggestions = []
+
+        def on_delta(text):
+            for result in parser.feed(text):
+                index = result.get("index") if isinstance(result, dict) else None
+                if not isinstance(index, int) or not 1 <= index <= len(batch) or index in results:
+                    continue
+                results[index] = result
+                if result.get("relevant"):
+                    suggestion = self._suggestion(batch[index - 1], result)
+                    suggestions.append(suggestion)
+                    if on_suggestion:
+                        on_suggestion(suggestion)
+
+        with self.agent.telemetry.span("research_batch", articles=len(batch)):
+            payload = self.prepare_payload(inputs, batch)
+            response = self.agent._call_llm_api(payload, inputs["api_key"], inputs["model"], on_delta=on_delta, cancel_token=cancel_token)
+        if not results:
+            return None
+        if not response:
+            # Results streamed before the failure stand (their cards are already shown); the rest is retried
+            print(f"Research: batch request failed after {len(results)} of {len(batch)} results.")
+        judged = [article for index, article in enumerate(batch, 1) if index in results]
+        skipped = [article for index, article in enumerate(batch, 1) if index not in results]
+        return suggestions, judged, skipped
+
+    @staticmethod
+    def _suggestion(article, result):
+        """Build the suggestion card of an article judged relevant."""
+        return {
+            "id": article["id"],
+            "title": article["title"],
+            "link": article["link"],
+            "action": result.get("action") or "",
+            "justification": result.get("justification") or ""
+        }
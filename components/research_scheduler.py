@@ -0,0 +1,187 @@
+import random
+import threading
+import time
+from .cancellation import CancellationToken, CancelledError
+
+
+class ResearchScheduler:
+    """
+    Keeps researching in the background on per-feed intervals, for the minimized tray mode.
+
+    - Every feed is a job due every interval_minutes (a feed key, default_interval
+      otherwise), with +/- jitter so feeds added together do not fire in lockstep
+    - A feed that cannot be read, or a run that fails, backs off exponentially from
+      retry_delay up to max_backoff; the next success resets it
+    - Feeds that fall due within coalesce_window of each other, or while a run is in
+      flight, are coalesced into the next single run, and runs never overlap a manual
+      run (Agent.research_lock)
+    - Runs happen on a worker thread and their suggestions go to on_suggestions
+    """
+
+    def __init__(self, agent, default_interval=3600, jitter=0.1, retry_delay=300, max_backoff=6 * 3600, coalesce_window=60,
+                 on_suggestions=None):
+        """
+        Initialize the research scheduler
+
+        Args:
+            agent (Agent): Agent whose run_research is scheduled
+            default_interval (float): Seconds between runs of a feed without its own interval
+            jitter (float): Relative random spread applied to every delay
+            retry_delay (float): Seconds before the first retry of a failed feed
+            max_backoff (float): Longest retry delay, in seconds
+            coalesce_window (float): Feeds due within this many seconds join a run that is starting
+            on_suggestions (callable, optional): Called from the worker thread with the suggestions of each run that has some
+        """
+        self.agent = agent
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.coalesce_window = coalesce_window
+        self.on_suggestions = on_suggestions
+        self.inputs = None
+        self.jobs = {}  # feed url -> job dict
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running_run = False
+        self._cancel_token = None
+
+    @property
+    def is_running(self):
+        """Whether the scheduler thread is active."""
+        return self._thread is not None
+
+    def start(self, inputs):
+        """
+        Start scheduling, or update the inputs and feeds of a running scheduler
+
+        Args:
+            inputs (dict): Research inputs snapshot (see Agent.collect_research_inputs);
+                each feed in inputs['feeds'] becomes a job, due right away when new
+        """
+        with self._condition:
+            self.inputs = inputs
+            feeds = {feed["url"]: feed for feed in inputs["feeds"]}
+            for url in list(self.jobs):
+                if url not in feeds:
+                    del self.jobs[url]
+            now = time.time()
+            for url, feed in feeds.items():
+                if url in self.jobs:
+                    self.jobs[url]["feed"] = feed
+                else:
+                    self.jobs[url] = {"feed": feed, "next_run": now, "failures": 0, "last_run": None, "last_error": None, "running": False}
+
+            if self._thread is None:
+                self._cancel_token = CancellationToken()
+                self._thread = threading.Thread(target=self._loop, args=(self._cancel_token,), name="cogito-research-scheduler", daemon=True)
+                self._thread.start()
+                print(f"Research scheduler started for {len(self.jobs)} feeds.")
+            self._condition.notify_all()
+
+    def stop(self):
+        """Stop scheduling and cancel the run in flight."""
+        with self._condition:
+            if self._thread is None:
+                return
+            self._cancel_token.cancel()
+            self._thread = None
+            self._condition.notify_all()
+        print("Research scheduler stopped.")
+
+    def run_now(self):
+        """Make every feed due immediately."""
+        with self._condition:
+            now = time.time()
+            for job in self.jobs.values():
+                job["next_run"] = min(job["next_run"], now)
+            self._condition.notify_all()
+
+    def status(self):
+        """
+        Get the schedule of each feed
+
+        Returns:
+            list: Dicts with 'name', 'next_run', 'last_run', 'failures' and 'last_error', soonest first
+        """
+        with self._condition:
+            rows = [
+                {
+                    "name": job["feed"]["name"],
+                    "next_run": job["next_run"],
+                    "last_run": job["last_run"],
+                    "failures": job["failures"],
+                    "last_error": job["last_error"]
+                }
+                for job in self.jobs.values()
+            ]
+        return sorted(rows, key=lambda row: row["next_run"])
+
+    def _loop(self, cancel_token):
+        """Wait for due feeds and hand them to a worker, one run at a time."""
+        while not cancel_token.is_cancelled:
+            with self._condition:
+                now = time.time()
+                idle = [job for job in self.jobs.values() if not job["running"]]
+                if self._running_run or not any(job["next_run"] <= now for job in idle):
+                    timeout = None if self._running_run or not idle else max(0.0, min(job["next_run"] for job in idle) - now)
+                    self._condition.wait(timeout)
+                    continue
+                due = [job for job in idle if job["next_run"] <= now + self.coalesce_window]
+                for job in due:
+                    job["running"] = True
+                self._running_run = True
+                inputs = dict(self.inputs, feeds=[job["feed"] for job in due])
+
+            threading.Thread(
+                target=self._run,
+                args=(inputs, due, cancel_token),
+                name="cogito-scheduled-research",
+                daemon=True
+            ).start()
+
+    def _run(self, inputs, jobs, cancel_token):
+        """Run research over the due feeds and reschedule them."""
+        error = None
+        suggestions = []
+        try:
+            with self.agent.research_lock:
+                cancel_token.raise_if_cancelled()
+                print(f"Scheduled research: {len(jobs)} feeds due.")
+                with self.agent.telemetry.span("scheduled_research", feeds=len(jobs)):
+                    suggestions = self.agent.run_research(inputs, cancel_token=cancel_token)
+                feed_errors = dict(self.agent.feed_errors)
+        except CancelledError:
+            feed_errors = {}
+        except Exception as e:
+            print(f"Scheduled research failed: {e}")
+            error = str(e)
+            feed_errors = {}
+
+        with self._condition:
+            now = time.time()
+            for job in jobs:
+                job["running"] = False
+                job["last_run"] = now
+                job_error = error or feed_errors.get(job["feed"]["name"])
+                job["last_error"] = job_error
+                if job_error:
+                    job["failures"] += 1
+                    job["next_run"] = now + self._spread(min(self.max_backoff, self.retry_delay * 2 ** (job["failures"] - 1)))
+                else:
+                    job["failures"] = 0
+                    job["next_run"] = now + self._spread(self._interval(job["feed"]))
+            self._running_run = False
+            self._condition.notify_all()
+
+        if suggestions and self.on_suggestions and not cancel_token.is_cancelled:
+            self.on_suggestions(suggestions)
+
+    def _interval(self, feed):
+        """Seconds between runs of a feed."""
+        minutes = feed.get("interval_minutes")
+        return minutes * 60 if minutes else self.default_interval
+
+    def _spread(self, delay):
+        """Apply the jitter to a delay."""
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
@@ -9,6 +9,7 @@ from PySide6.QtCore import Qt
 import os
 from datetime import datetime
 from .base_workspace import BaseWorkspace
+from .feed_store import FeedStore
 
 class ResearchWorkspace(BaseWorkspace):
     """
@@ -16,6 +17,7 @@ class ResearchWorkspace(BaseWorkspace):
     """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.feed_store = FeedStore()  # Feeds persist across restarts in data/feeds.json
         self._setup_research_ui()
         
     def _setup_research_ui(self):
@@ -72,6 +74,21 @@ class ResearchWorkspace(BaseWorkspace):
         
         # Add grid layout to main layout
         layout.addLayout(grid_layout)
+
+        # Background research keeps running on a schedule while the window is minimized to the tray
+        background_layout = QHBoxLayout()
+        self.background_checkbox = QCheckBox("Research in background every")
+        self.background_checkbox.toggled.connect(self._handle_background_research)
+        self.background_interval = QSpinBox()
+        self.background_interval.setRange(5, 24 * 60)
+        self.background_interval.setSingleStep(15)
+        self.background_interval.setValue(60)
+        self.background_interval.setSuffix(" min")
+        self.background_interval.editingFinished.connect(self._refresh_background_research)
+        background_layout.addWidget(self.background_checkbox)
+        background_layout.addWidget(self.background_interval)
+        background_layout.addStretch()
+        layout.addLayout(background_layout)
         
         # Add stretch to push content to the top
         layout.addStretch()
@@ -130,10 +147,21 @@ class ResearchWorkspace(BaseWorkspace):
         # Add button to add the feed
         add_btn = QPushButton("Add Feed")
         add_btn.clicked.connect(self._add_rss_feed)
+
+        # Bulk import (validated before the feeds are added) and export as OPML
+        opml_layout = QHBoxLayout()
+        import_btn = QPushButton("Import OPML")
+        import_btn.setToolTip("Add the feeds of an OPML file after checking them")
+        import_btn.clicked.connect(self._import_opml)
+        export_btn = QPushButton("Export OPML")
+        export_btn.clicked.connect(self._export_opml)
+        opml_layout.addWidget(import_btn)
+        opml_layout.addWidget(export_btn)
         
         # Add form to layout
         layout.addLayout(form_layout)
         layout.addWidget(add_btn)
+        layout.addLayout(opml_layout)
         
         # Create table for displaying RSS feeds
         self.rss_table = QTableWidget(0, 4)  # rows, columns
@@ -144,8 +172,13 @@ class ResearchWorkspace(BaseWorkspace):
         layout.addWidget(QLabel("Current RSS Feeds:"))
         layout.addWidget(self.rss_table)
         
-        # Add some example data
-        self._add_example_rss_feeds()
+        # Restore the saved feeds; the examples only seed a first start
+        saved_feeds = self.feed_store.load()
+        if saved_feeds is None:
+            self._add_example_rss_feeds()
+        else:
+            for feed in saved_feeds:
+                self._insert_feed_row(feed)
         
         return widget
         
@@ -266,10 +299,10 @@ class ResearchWorkspace(BaseWorkspace):
         form_layout.addRow("Model:", self.research_model_combo)
         
         # API Key
-        self.research_api_key = QLineEdit()
-        self.research_api_key.setPlaceholderText("Enter your API key")
-        self.research_api_key.setEchoMode(QLineEdit.Password)
-        form_layout.addRow("API Key:", self.research_api_key)
+        self.research_api_key_input = QLineEdit()
+        self.research_api_key_input.setPlaceholderText("Enter your API key")
+        self.research_api_key_input.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("API Key:", self.research_api_key_input)
         
         # Temperature
         temp_layout = QHBoxLayout()
@@ -291,11 +324,11 @@ class ResearchWorkspace(BaseWorkspace):
         form_layout.addRow("Temperature:", temp_layout)
         
         # Max tokens
-        self.research_max_tokens = QSpinBox()
-        self.research_max_tokens.setRange(100, 100000)
-        self.research_max_tokens.setSingleStep(100)
-        self.research_max_tokens.setValue(4000)
-        form_layout.addRow("Max Tokens:", self.research_max_tokens)
+        self.research_max_tokens_input = QSpinBox()
+        self.research_max_tokens_input.setRange(100, 100000)
+        self.research_max_tokens_input.setSingleStep(100)
+        self.research_max_tokens_input.setValue(4000)
+        form_layout.addRow("Max Tokens:", self.research_max_tokens_input)
         
         # Add form layout to main layout
         layout.addLayout(form_layout)
@@ -308,6 +341,7 @@ class ResearchWorkspace(BaseWorkspace):
         
         # Add save button
         save_btn = QPushButton("Save Configuration")
+        save_btn.clicked.connect(self._save_research_configuration)
         layout.addWidget(save_btn)
         
         # Add stretch
@@ -322,35 +356,86 @@ class ResearchWorkspace(BaseWorkspace):
         url = self.rss_link.text()
         
         if name and topic and url:
-            row = self.rss_table.rowCount()
-            self.rss_table.insertRow(row)
-            
-            # Create items
-            self.rss_table.setItem(row, 0, QTableWidgetItem(name))
-            self.rss_table.setItem(row, 1, QTableWidgetItem(topic))
-            self.rss_table.setItem(row, 2, QTableWidgetItem(url))
-            
-            # Create action buttons
-            delete_btn = QPushButton("Delete")
-            delete_btn.clicked.connect(lambda: self._delete_rss_feed(row))
-            
-            # Create widget to hold buttons
-            button_widget = QWidget()
-            button_layout = QHBoxLayout(button_widget)
-            button_layout.addWidget(delete_btn)
-            button_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Add widget to table
-            self.rss_table.setCellWidget(row, 3, button_widget)
+            self.add_feeds([{"name": name, "topic": topic, "url": url}])
             
             # Clear input fields
             self.journal_name.clear()
             self.journal_topic.clear()
             self.rss_link.clear()
+
+    def add_feeds(self, feeds):
+        """Add feeds to the table, skipping URLs already present, and save the list"""
+        known = {feed["url"] for feed in self.get_rss_feeds()}
+        for feed in feeds:
+            if feed["url"] not in known:
+                known.add(feed["url"])
+                self._insert_feed_row(feed)
+        self._feeds_changed()
+
+    def _insert_feed_row(self, feed):
+        """Append a table row for a feed dict, keeping the whole dict on the row"""
+        row = self.rss_table.rowCount()
+        self.rss_table.insertRow(row)
+        
+        # Create items
+        name_item = QTableWidgetItem(feed["name"])
+        name_item.setData(Qt.UserRole, feed)
+        self.rss_table.setItem(row, 0, name_item)
+        self.rss_table.setItem(row, 1, QTableWidgetItem(feed.get("topic", "")))
+        self.rss_table.setItem(row, 2, QTableWidgetItem(feed["url"]))
+        
+        # Create action buttons
+        delete_btn = QPushButton("Delete")
+        
+        # Create widget to hold buttons
+        button_widget = QWidget()
+        button_layout = QHBoxLayout(button_widget)
+        button_layout.addWidget(delete_btn)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        # Look the row up on click, since deleting earlier rows shifts it
+        delete_btn.clicked.connect(lambda: self._delete_rss_feed(self.rss_table.indexAt(button_widget.pos()).row()))
+        
+        # Add widget to table
+        self.rss_table.setCellWidget(row, 3, button_widget)
     
     def _delete_rss_feed(self, row):
         """Delete an RSS feed from the table"""
+        if row < 0:
+            return
         self.rss_table.removeRow(row)
+        self._feeds_changed()
+
+    def _feeds_changed(self):
+        """Save the feed list and hand it to a running background schedule"""
+        self.feed_store.save(self.get_rss_feeds())
+        self._refresh_background_research()
+
+    def _import_opml(self):
+        """Import the feeds of an OPML file; the agent validates them before they are added"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Feeds from OPML", "", "OPML Files (*.opml *.xml);;All Files (*)"
+        )
+        if not file_path:
+            return
+        if self.agent:
+            self.agent.handle_import_opml(self, file_path)
+            return
+        try:
+            self.add_feeds(self.feed_store.parse_opml(file_path))
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Could not import OPML file: {str(e)}")
+
+    def _export_opml(self):
+        """Export the configured feeds to an OPML file"""
+        feeds = self.get_rss_feeds()
+        if not feeds:
+            QMessageBox.warning(self, "Error", "No RSS feeds to export")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Feeds to OPML", "cogito_feeds.opml", "OPML Files (*.opml)"
+        )
+        if file_path and self.feed_store.write_opml(file_path, feeds):
+            QMessageBox.information(self, "Export Complete", f"Exported {len(feeds)} feeds to {file_path}")
     
     def _add_example_rss_feeds(self):
         """Add example RSS feeds to the table"""
@@ -360,11 +445,7 @@ class ResearchWorkspace(BaseWorkspace):
             ("PNAS", "Multidisciplinary", "https://www.pnas.org/action/showFeed?type=etoc&feed=rss&jc=pnas")
         ]
         
-        for name, topic, url in example_feeds:
-            self.journal_name.setText(name)
-            self.journal_topic.setText(topic)
-            self.rss_link.setText(url)
-            self._add_rss_feed()
+        self.add_feeds([{"name": name, "topic": topic, "url": url} for name, topic, url in example_feeds])
     
     def _select_research_compliance_document(self):
         """Open file dialog to select research compliance document"""
@@ -383,12 +464,43 @@ class ResearchWorkspace(BaseWorkspace):
             except Exception as e:
                 self.research_compliance_preview.setText(f"Error reading file: {str(e)}")
     
+    def _save_research_configuration(self):
+        """Store the research prompt definition for research runs"""
+        content = self.research_prompt_text.toPlainText()
+        if not content:
+            QMessageBox.warning(self, "Error", "Please enter a research prompt")
+            return
+
+        self.research_prompt_content = content
+        self.research_model = self.research_model_combo.currentText()
+        self.research_api_key = self.research_api_key_input.text()
+        self.research_temperature = self.research_temp_value.value()
+        self.research_max_tokens = self.research_max_tokens_input.value()
+        QMessageBox.information(self, "Success", "Research configuration saved successfully")
+        self._refresh_background_research()
+
+    def get_rss_feeds(self):
+        """Get the configured RSS feeds as a list of {name, topic, url, ...} dicts"""
+        feeds = []
+        for row in range(self.rss_table.rowCount()):
+            name_item = self.rss_table.item(row, 0)
+            # Extra keys of the feed (interval, validation results) ride along on the name cell
+            feed = dict(name_item.data(Qt.UserRole) or {})
+            feed["name"] = name_item.text()
+            feed["topic"] = self.rss_table.item(row, 1).text()
+            feed["url"] = self.rss_table.item(row, 2).text()
+            feeds.append(feed)
+        return feeds
+
     def _handle_research(self):
-        """Handle the research button click - implement RSS scraping logic"""
+        """Handle the research button click - run the research loop through the agent"""
         print("Research button clicked - Starting RSS scraping process")
-        
-        # Here we would implement the actual RSS scraping and research logic
-        # For now, just display a message
+
+        if self.agent:
+            self.agent.handle_research(self)
+            return
+
+        # Without an agent, just describe the process
         QMessageBox.information(
             self, 
             "Research Process", 
@@ -402,6 +514,21 @@ class ResearchWorkspace(BaseWorkspace):
             "7. Research completed!"
         )
 
+    def _handle_background_research(self, checked):
+        """Start or stop scheduled background research through the agent"""
+        if not self.agent:
+            return
+        if not self.agent.handle_background_research(self, checked, self.background_interval.value()):
+            # Preconditions are missing; leave the box unchecked without toggling again
+            self.background_checkbox.blockSignals(True)
+            self.background_checkbox.setChecked(False)
+            self.background_checkbox.blockSignals(False)
+
+    def _refresh_background_research(self):
+        """Give a running background schedule the current configuration, feeds and interval"""
+        if self.agent and self.background_checkbox.isChecked():
+            self.agent.handle_background_research(self, True, self.background_interval.value())
+
     def _log_rss_feed_setup(self):
         """Log RSS feed setup"""
         if not hasattr(self, 'rss_table') or self.rss_table.rowCount() == 0:
@@ -409,12 +536,7 @@ class ResearchWorkspace(BaseWorkspace):
             return
             
         # Collect all RSS feeds from the table
-        feeds = []
-        for row in range(self.rss_table.rowCount()):
-            name = self.rss_table.item(row, 0).text()
-            topic = self.rss_table.item(row, 1).text()
-            url = self.rss_table.item(row, 2).text()
-            feeds.append({"name": name, "topic": topic, "url": url})
+        feeds = self.get_rss_feeds()
             
         # Create log content
         log_content = f"RSS Feeds - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
@@ -455,7 +577,7 @@ class ResearchWorkspace(BaseWorkspace):
             content = self.research_prompt_text.toPlainText()
             model = self.research_model_combo.currentText()
             temperature = self.research_temp_value.value()
-            max_tokens = self.research_max_tokens.value()
+            max_tokens = self.research_max_tokens_input.value()
             
             log_content = f"Model: {model}\n"
             log_content += f"Temperature: {temperature}\n"
@@ -0,0 +1,127 @@
+import copy
+import threading
+from .cancellation import CancellationToken, CancelledError
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls onto one underlying call.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    with the same key while it is in flight wait for it and receive a copy of
+    its result instead of making a call of their own. Once the call finishes
+    the key is released, so later calls run again - this is de-duplication of
+    in-flight work, not a result cache.
+
+    The call runs under a token of its own, which is cancelled once every caller
+    sharing it - the leader and all waiters - has cancelled; until then it keeps running
+    for the callers that still want the result. A cancelled caller stops waiting right
+    away, except the leader, which runs the call and raises CancelledError when it ends.
+    If the call is cancelled anyway, waiters that were not cancelled themselves retry,
+    one of them becoming the new leader.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> in-flight call state
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    def do(self, key, function, cancel_token=None):
+        """
+        Run function once for all concurrent callers with the same key
+
+        Args:
+            key (str): Identity of the call (e.g. a payload hash)
+            function (callable): Function making the call, given the call's own CancellationToken
+            cancel_token (CancellationToken, optional): Withdraws this caller from the call
+
+        Returns:
+            tuple: (result, coalesced) - coalesced is True when this caller waited on
+                another caller's call. Exceptions of the call are raised to every waiter.
+        """
+        while True:
+            with self._lock:
+                self.stats["calls"] += 1
+                call = self._calls.get(key)
+                if call is None:
+                    call = {"done": threading.Event(), "result": None, "error": None, "waiters": 0, "callers": 0, "token": CancellationToken()}
+                    self._calls[key] = call
+                    leader = True
+                    self.stats["executed"] += 1
+                else:
+                    call["waiters"] += 1
+                    leader = False
+                    self.stats["coalesced"] += 1
+                call["callers"] += 1
+            withdraw = self._watch(call, cancel_token)
+
+            if leader:
+                break
+
+            try:
+                if cancel_token is None:
+                    call["done"].wait()
+                elif not cancel_token.wait_for(call["done"]):
+                    raise CancelledError("LLM request cancelled")
+            finally:
+                if withdraw:
+                    cancel_token.remove_callback(withdraw)
+            if isinstance(call["error"], CancelledError):
+                # The leader was cancelled, not this caller: try again
+                with self._lock:
+                    self.stats["calls"] -= 1
+                    self.stats["coalesced"] -= 1
+                continue
+            if call["error"] is not None:
+                raise call["error"]
+            # Each waiter gets its own copy so callers can't mutate each other's result
+            return copy.deepcopy(call["result"]), True
+
+        result = None
+        try:
+            result = function(call["token"])
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            if withdraw:
+                cancel_token.remove_callback(withdraw)
+            with self._lock:
+                del self._calls[key]  # No new waiters can join after this
+                if call["waiters"]:
+                    # Waiters copy from a snapshot the leader can't mutate
+                    call["result"] = copy.deepcopy(result)
+            call["done"].set()
+        if cancel_token is not None and cancel_token.is_cancelled:
+            # The call outlived this caller's cancellation for the sake of its waiters
+            raise CancelledError("LLM request cancelled")
+        return result, False
+
+    def _watch(self, call, cancel_token):
+        """
+        Withdraw a caller from a call when its token is cancelled, cancelling the call with the last one
+
+        Returns:
+            callable: The registered callback, or None without a token
+        """
+        if cancel_token is None:
+            return None
+
+        def withdraw():
+            with self._lock:
+                call["callers"] -= 1
+                abandoned = call["callers"] == 0 and not call["done"].is_set()
+            if abandoned:
+                call["token"].cancel()
+
+        return cancel_token.add_callback(withdraw)
+
+    def in_flight(self):
+        """Get the number of distinct calls currently in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self):
+        """Get a snapshot of the call counters, including the calls currently in flight."""
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
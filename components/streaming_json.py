@@ -0,0 +1,93 @@
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Extracts completed objects from a JSON array while it is still being streamed.
+
+    Feed it the text deltas of a structured-output or tool-call response, such as
+    the arguments of {"suggestions": [{...}, {...}]}. As soon as an object that is
+    an element of an array closes, it is decoded and returned, so callers can act
+    on each element without waiting for the rest of the response. Only the outermost
+    array elements are emitted; objects nested inside an element stay part of it.
+    Text outside the JSON document (prose, Markdown code fences) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._position = 0  # Next buffer index to scan
+        self._stack = []  # Open containers: '{' or '['
+        self._in_string = False
+        self._escaped = False
+        self._element_start = None  # Buffer index of the array element being read
+        self._element_depth = None  # Stack depth at which that element opened
+        self.emitted = 0
+
+    def feed(self, text):
+        """
+        Add a text delta and return the array elements it completed
+
+        Args:
+            text (str): Next chunk of the streamed response
+
+        Returns:
+            list: Decoded objects completed by this chunk, in order
+        """
+        self.buffer += text
+        completed = []
+
+        for index in range(self._position, len(self.buffer)):
+            char = self.buffer[index]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"' and self._stack:
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._element_start is None and self._stack and self._stack[-1] == "[":
+                    self._element_start = index
+                    self._element_depth = len(self._stack)
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if char == "}" and self._element_start is not None and len(self._stack) == self._element_depth:
+                    element = self._decode(self.buffer[self._element_start:index + 1])
+                    if element is not None:
+                        completed.append(element)
+                    self._element_start = None
+                    self._element_depth = None
+
+        self._position = len(self.buffer)
+        self.emitted += len(completed)
+        return completed
+
+    def _decode(self, text):
+        """Decode one element, or None if it is not valid JSON."""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"Skipping malformed streamed JSON element: {e}")
+            return None
+
+    def result(self):
+        """
+        Decode the whole document once the stream has ended
+
+        Returns:
+            The decoded JSON document, or None if the buffer holds no complete document
+        """
+        start = min((i for i in (self.buffer.find("{"), self.buffer.find("[")) if i >= 0), default=-1)
+        if start < 0:
+            return None
+        try:
+            document, _ = json.JSONDecoder().raw_decode(self.buffer[start:])
+            return document
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,267 @@
+import bisect
+import contextvars
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .jsonl_logger import JSONLLogger
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed bucket bounds, in the Prometheus layout.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Get (upper bound, cumulative count) pairs, ending with +Inf."""
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return list(zip(bounds, itertools.accumulate(self.counts)))
+
+
+class Telemetry:
+    """
+    Tracing spans, latency histograms and counters for the Execute, batch and research pipelines.
+
+    Wrap a stage in `with telemetry.span("pdf.extract", file=name):`. A span opened while no
+    other span is active starts a new trace (one run); nested spans, including spans opened
+    in worker threads that copied the context, become its children. Every span's duration
+    is observed in the cogito_stage_duration_seconds histogram, labelled by stage.
+
+    Finished traces are kept in memory for the in-app panel, appended to logs/traces.jsonl,
+    and the metrics are rewritten to logs/metrics.prom in the Prometheus text format. Both
+    exports happen off the calling thread, so a trace finished on the GUI thread does not
+    wait for disk I/O. The same text is served over HTTP by serve_metrics().
+    """
+
+    STAGE_HISTOGRAM = "cogito_stage_duration_seconds"
+
+    def __init__(self, directory="logs", max_traces=20):
+        """
+        Args:
+            directory (str): Directory of the trace and metrics files
+            max_traces (int): Number of finished traces kept in memory
+        """
+        self.directory = directory
+        self.metrics_path = os.path.join(directory, "metrics.prom")
+        self.trace_logger = JSONLLogger(directory=directory, basename="traces")
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self._traces = deque(maxlen=max_traces)
+        self._current = contextvars.ContextVar("cogito_span", default=None)
+        self._trace_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = None
+        # One writer keeps metrics file rewrites in order; a pending rewrite covers later traces too
+        self._metrics_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cogito-metrics-writer")
+        self._metrics_scheduled = False
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Time a pipeline stage
+
+        Args:
+            name (str): Stage name, e.g. "pdf.extract" or "llm.call"
+            **attributes: Details stored with the span (file name, model, ...)
+
+        Yields:
+            dict: The span, whose "attributes" may be extended while it runs
+        """
+        parent = self._current.get()
+        span = {
+            "name": name,
+            "attributes": attributes,
+            "start": time.time(),
+            "duration_ms": None,
+            "status": "ok",
+            "children": []
+        }
+        if parent is None:
+            span["trace_id"] = next(self._trace_ids)
+        else:
+            with self._lock:
+                parent["children"].append(span)
+
+        token = self._current.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span["status"] = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._current.reset(token)
+            span["duration_ms"] = round(elapsed * 1000, 2)
+            self.observe(self.STAGE_HISTOGRAM, elapsed, stage=name)
+            if parent is None:
+                self._finish_trace(span)
+
+    def current_span(self):
+        """Get the span active in this context, or None."""
+        return self._current.get()
+
+    def increment(self, name, value=1, **labels):
+        """Add to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record a histogram observation (seconds for latencies)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def recent_traces(self):
+        """Get the finished traces, newest first."""
+        with self._lock:
+            return list(reversed(self._traces))
+
+    def breakdown(self, trace):
+        """
+        Flatten a trace into per-stage rows for display
+
+        Returns:
+            list: (depth, name, duration_ms, status) tuples in start order
+        """
+        rows = []
+
+        def visit(span, depth):
+            rows.append((depth, span["name"], span["duration_ms"], span["status"]))
+            for child in sorted(span["children"], key=lambda child: child["start"]):
+                visit(child, depth + 1)
+
+        visit(trace, 0)
+        return rows
+
+    def render_prometheus(self):
+        """Render every counter and histogram in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            histograms = [(key, histogram.cumulative(), histogram.count, histogram.sum) for key, histogram in histograms]
+
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), buckets, count, total in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{self._format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self):
+        """Write the current metrics to logs/metrics.prom (for a node-exporter textfile collector)."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{self.metrics_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(self.render_prometheus())
+            os.replace(temp_path, self.metrics_path)
+        except OSError as e:
+            print(f"Error writing metrics file: {e}")
+
+    def serve_metrics(self, port=9464, host="127.0.0.1"):
+        """
+        Serve the metrics at http://host:port/metrics from a background thread
+
+        Returns:
+            int: The port the endpoint listens on, or None if it could not start
+        """
+        if self._server:
+            return self._server.server_address[1]
+
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"Could not start the metrics endpoint on port {port}: {e}")
+            return None
+        threading.Thread(target=self._server.serve_forever, name="cogito-metrics", daemon=True).start()
+        print(f"Serving metrics at http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server.server_address[1]
+
+    def stop_metrics(self):
+        """Stop the metrics endpoint."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _finish_trace(self, trace):
+        """Keep a finished trace, export it and refresh the metrics file."""
+        with self._lock:
+            self._traces.append(trace)
+        self.trace_logger.log("trace", trace=trace)
+        with self._lock:
+            if self._metrics_scheduled:
+                return
+            self._metrics_scheduled = True
+        self._metrics_writer.submit(self._write_scheduled_metrics)
+
+    def _write_scheduled_metrics(self):
+        """Rewrite the metrics file on the writer thread."""
+        with self._lock:
+            self._metrics_scheduled = False
+        self.write_metrics()
+
+    @staticmethod
+    def _format_labels(labels):
+        """Format label pairs as {name="value",...}."""
+        if not labels:
+            return ""
+        pairs = []
+        for name, value in labels:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+
+# Shared instance, so components without a reference to the Agent (PDFProcessor) report to the same place
+telemetry = Telemetry()
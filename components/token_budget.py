@@ -0,0 +1,216 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# tiktoken is optional: exact counts for OpenAI models, close approximations elsewhere
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+class BudgetExceededError(Exception):
+    """Raised when a request cannot fit the model window even after trimming."""
+
+    def __init__(self, message, plan):
+        super().__init__(message)
+        self.plan = plan
+
+
+class TokenCounter:
+    """
+    Counts tokens for prompt sections.
+
+    Uses the tiktoken encoding of the model when tiktoken is installed (exact for
+    OpenAI models), and falls back to the word-based approximation used by
+    PDFProcessor otherwise. Counts are cached by content hash, since the same
+    large compliance and context documents are counted on every run.
+    """
+
+    def __init__(self, cache_size=256):
+        """
+        Args:
+            cache_size (int): Number of (encoding, text) counts kept in the cache
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._encodings = {}
+        self._lock = threading.Lock()  # Batch workers share one counter
+
+    def count(self, text, model=None):
+        """
+        Count the tokens of a text
+
+        Args:
+            text (str): Text to count
+            model (str, optional): Model API id, used to pick the encoding
+
+        Returns:
+            int: Token count
+        """
+        if not text:
+            return 0
+
+        encoding_name = self._encoding_name(model)
+        key = (encoding_name, hashlib.sha1(text.encode("utf-8")).hexdigest())
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            encoding = self._get_encoding(encoding_name)
+
+        if encoding is not None:
+            count = len(encoding.encode(text, disallowed_special=()))
+        else:
+            count = int(len(text.split()) * 1.25)
+
+        with self._lock:
+            self._cache[key] = count
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def is_exact(self, model=None):
+        """Whether counts for this model come from the model's own tokenizer."""
+        return tiktoken is not None and (model or "").startswith(("gpt", "o1", "o3", "o4"))
+
+    def _encoding_name(self, model):
+        """Pick the tiktoken encoding for a model API id."""
+        if tiktoken is None:
+            return None
+        model = model or ""
+        if model.startswith(("gpt-3.5", "gpt-4")) and not model.startswith(("gpt-4o", "gpt-4.1", "gpt-4.5")):
+            return "cl100k_base"
+        return "o200k_base"
+
+    def _get_encoding(self, encoding_name):
+        """Load (once) and return a tiktoken encoding."""
+        if encoding_name is None:
+            return None
+        if encoding_name not in self._encodings:
+            self._encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+        return self._encodings[encoding_name]
+
+
+class BudgetPlanner:
+    """
+    Fits prompt sections into a model's context window before a request is sent.
+
+    Each section has a priority; when the sections plus the reserved output tokens
+    exceed the window, trimmable sections are cut from their end, lowest priority
+    (highest number) first, until the request fits.
+    """
+
+    TRIM_MARKER = "\n\n[... trimmed to fit the model context window ...]"
+
+    def __init__(self, token_counter):
+        """
+        Args:
+            token_counter (TokenCounter): Counter used for all section counts
+        """
+        self.token_counter = token_counter
+
+    def plan(self, sections, context_window, reserved_output, model=None, message_overhead=16):
+        """
+        Plan a request budget, trimming sections if needed
+
+        Args:
+            sections (list): Dicts with 'name', 'text', 'priority' and 'trimmable' keys
+            context_window (int): Model context window in tokens
+            reserved_output (int): Tokens reserved for the response (max_tokens)
+            model (str, optional): Model API id for token counting
+            message_overhead (int): Tokens reserved for chat message framing
+
+        Returns:
+            dict: Budget plan with per-section counts, the (possibly trimmed) texts and
+                whether the request fits
+        """
+        planned = []
+        for section in sections:
+            tokens = self.token_counter.count(section["text"], model)
+            planned.append({
+                "name": section["name"],
+                "text": section["text"],
+                "priority": section["priority"],
+                "trimmable": section["trimmable"],
+                "original_tokens": tokens,
+                "tokens": tokens,
+                "trimmed": False
+            })
+
+        input_budget = context_window - reserved_output - message_overhead
+        overflow = sum(section["tokens"] for section in planned) - input_budget
+
+        for section in sorted(planned, key=lambda s: s["priority"], reverse=True):
+            if overflow <= 0:
+                break
+            if not section["trimmable"] or section["tokens"] == 0:
+                continue
+            target = max(section["tokens"] - overflow, 0)
+            section["text"] = self.trim_to_tokens(section["text"], target, model)
+            section["tokens"] = self.token_counter.count(section["text"], model)
+            section["trimmed"] = True
+            overflow = sum(s["tokens"] for s in planned) - input_budget
+
+        total_input = sum(section["tokens"] for section in planned)
+        return {
+            "model": model,
+            "exact": self.token_counter.is_exact(model),
+            "context_window": context_window,
+            "reserved_output": reserved_output,
+            "message_overhead": message_overhead,
+            "input_budget": input_budget,
+            "total_input": total_input,
+            "remaining": input_budget - total_input,
+            "fits": total_input <= input_budget,
+            "sections": planned
+        }
+
+    def trim_to_tokens(self, text, max_tokens, model=None):
+        """
+        Cut a text from its end so that it fits a token budget
+
+        Keeps whole paragraphs where possible and falls back to cutting characters
+        inside the first paragraph that does not fit.
+
+        Args:
+            text (str): Text to trim
+            max_tokens (int): Token budget, including the trim marker
+            model (str, optional): Model API id for token counting
+
+        Returns:
+            str: The trimmed text, or "" if not even the marker fits
+        """
+        if self.token_counter.count(text, model) <= max_tokens:
+            return text
+
+        budget = max_tokens - self.token_counter.count(self.TRIM_MARKER, model)
+        if budget <= 0:
+            return ""
+
+        paragraphs = re.split(r"(?<=\n\n)", text)
+
+        # Binary search the number of leading paragraphs that fit
+        low, high = 0, len(paragraphs)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.token_counter.count("".join(paragraphs[:middle]), model) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        kept = "".join(paragraphs[:low])
+
+        # Fill the rest of the budget with part of the next paragraph
+        if low < len(paragraphs):
+            remainder = paragraphs[low]
+            low_chars, high_chars = 0, len(remainder)
+            while low_chars < high_chars:
+                middle = (low_chars + high_chars + 1) // 2
+                if self.token_counter.count(kept + remainder[:middle], model) <= budget:
+                    low_chars = middle
+                else:
+                    high_chars = middle - 1
+            kept += remainder[:low_chars]
+
+        return kept.rstrip() + self.TRIM_MARKER
@@ -0,0 +1,179 @@
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+from .cancellation import CancelledError
+
+
+class TopicClusterer:
+    """
+    Groups the relevant articles of a research run by topic, one blog-post suggestion per topic.
+
+    - Clustering is local: average-linkage agglomerative clustering over the articles'
+      TF-IDF vectors (title and abstract, see RelevanceFilter.vectors), merging the two
+      closest clusters while their average cosine similarity is at least similarity and
+      the merged cluster holds at most max_size articles
+    - Every cluster of two or more articles is summarized into a single suggestion by one
+      LLM call, and these calls run concurrently
+    - Single articles, and clusters whose call fails, keep their per-article suggestions
+    """
+
+    SUMMARY_MAX_TOKENS = 400  # Output tokens of one cluster suggestion
+
+    def __init__(self, agent, similarity=0.2, max_size=6, max_workers=4):
+        """
+        Initialize the topic clusterer
+
+        Args:
+            agent (Agent): Agent used for vectors, payload preparation and LLM calls
+            similarity (float): Minimum average cosine similarity of two clusters to merge them
+            max_size (int): Most articles summarized into one suggestion
+            max_workers (int): Maximum number of concurrent summary requests
+        """
+        self.agent = agent
+        self.similarity = similarity
+        self.max_size = max_size
+        self.max_workers = max_workers
+
+    def cluster(self, articles):
+        """
+        Group articles by topic
+
+        Args:
+            articles (list): Article dicts with 'title' and 'abstract' keys
+
+        Returns:
+            list: Lists of articles, largest cluster first; articles keep their input order within a cluster
+        """
+        return [[articles[index] for index in indexes] for indexes in self.cluster_indexes(articles)]
+
+    def cluster_indexes(self, articles):
+        """
+        Group articles by topic, as positions in the article list
+
+        Returns:
+            list: Lists of indexes into articles, largest cluster first, ascending within a cluster
+        """
+        if len(articles) < 2:
+            return [list(range(len(articles)))]
+        vectors = self.agent.relevance_filter.vectors([f"{article.get('title', '')}\n{article.get('abstract', '')}" for article in articles])
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, -np.inf)
+
+        members = [[index] for index in range(len(articles))]
+        active = np.ones(len(articles), dtype=bool)
+        while True:
+            row, column = np.unravel_index(np.argmax(similarity), similarity.shape)
+            if similarity[row, column] < self.similarity:
+                break
+            if len(members[row]) + len(members[column]) > self.max_size:
+                similarity[row, column] = similarity[column, row] = -np.inf
+                continue
+            # Average linkage: the merged cluster's similarity is the size-weighted mean of both
+            merged = (similarity[row] * len(members[row]) + similarity[column] * len(members[column])) / (len(members[row]) + len(members[column]))
+            merged[~active] = -np.inf
+            # Pairs set aside for exceeding max_size stay apart
+            merged[np.isneginf(similarity[row]) | np.isneginf(similarity[column])] = -np.inf
+            similarity[row], similarity[:, row] = merged, merged
+            similarity[row, row] = -np.inf
+            similarity[column], similarity[:, column] = -np.inf, -np.inf
+            members[row] += members[column]
+            members[column] = []
+            active[column] = False
+
+        return sorted((sorted(indexes) for indexes in members if indexes), key=len, reverse=True)
+
+    def summarize(self, inputs, articles, suggestions, cancel_token=None):
+        """
+        Merge the suggestions of related articles into one suggestion per topic
+
+        Args:
+            inputs (dict): Research inputs
+            articles (list): The judged articles
+            suggestions (list): Per-article suggestions of the articles judged relevant, each with
+                its article's 'id'; suggestions without a known id are passed through
+            cancel_token (CancellationToken, optional): Cancels the summary requests
+
+        Returns:
+            list: Cluster suggestions, with an 'articles' list of the sources' titles and links,
+                followed by the suggestions of articles without related ones
+
+        Raises:
+            CancelledError: If the token is cancelled
+        """
+        by_id = {article["id"]: article for article in articles}
+        # Positions in suggestions of the ones that can be clustered, and their articles
+        positions = [position for position, suggestion in enumerate(suggestions) if suggestion.get("id") in by_id]
+        relevant = [by_id[suggestions[position]["id"]] for position in positions]
+        if len(relevant) < 2:
+            return suggestions
+
+        with self.agent.telemetry.span("topic_clustering", articles=len(relevant)) as span:
+            clusters = [[positions[index] for index in indexes] for indexes in self.cluster_indexes(relevant)]
+            span["attributes"]["clusters"] = len(clusters)
+        topics = [cluster for cluster in clusters if len(cluster) > 1]
+        if not topics:
+            return suggestions
+        print(f"Research: {len(relevant)} relevant articles form {len(clusters)} topics; summarizing {len(topics)} of them...")
+
+        summaries = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run, self._summarize_cluster, inputs,
+                    [by_id[suggestions[position]["id"]] for position in cluster], cancel_token
+                ): index
+                for index, cluster in enumerate(topics)
+            }
+            for future in as_completed(futures):
+                try:
+                    summaries[futures[future]] = future.result()
+                except CancelledError:
+                    for other in futures:
+                        other.cancel()
+                    raise
+                except Exception as e:
+                    print(f"Research: topic summary failed: {e}")
+
+        merged = []
+        for index, cluster in enumerate(topics):
+            if summaries.get(index):
+                merged.append(summaries[index])
+            else:
+                # Without a summary the articles are suggested one by one
+                merged.extend(suggestions[position] for position in cluster)
+        clustered = {position for cluster in topics for position in cluster}
+        merged.extend(suggestion for position, suggestion in enumerate(suggestions) if position not in clustered)
+        return merged
+
+    def _summarize_cluster(self, inputs, cluster, cancel_token=None):
+        """
+        Ask for one blog-post suggestion drawing on a cluster of articles
+
+        Returns:
+            dict: The suggestion, or None if the call failed or returned no title
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        with self.agent.telemetry.span("topic_summary", articles=len(cluster)):
+            payload = self.agent.prepare_topic_payload(inputs, cluster)
+            payload["max_tokens"] = min(inputs["max_tokens"], self.SUMMARY_MAX_TOKENS)
+            response = self.agent._call_llm_api(payload, inputs["api_key"], inputs["model"], cancel_token=cancel_token)
+        if not response:
+            print(f"Research: topic summary request failed; keeping the {len(cluster)} article suggestions.")
+            return None
+        content = self.agent.extract_blog_content(response)
+        try:
+            result = json.loads(content) if content else None
+        except json.JSONDecodeError:
+            result = None
+        if not isinstance(result, dict) or not result.get("title"):
+            print(f"Research: topic summary could not be read ({(content or '')[:80]!r}); keeping the {len(cluster)} article suggestions.")
+            return None
+        return {
+            "title": result["title"],
+            "link": cluster[0]["link"],
+            "action": result.get("action") or "",
+            "justification": result.get("justification") or "",
+            "articles": [{"id": article["id"], "title": article["title"], "link": article["link"]} for article in cluster]
+        }
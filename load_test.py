@@ -0,0 +1,197 @@
+"""
+Load test for the Execute and research pipelines against the local mock LLM server.
+
+Example:
+    python load_test.py --requests 50 --concurrency 8 --model "Claude 4 Sonnet" --error-rate 0.05
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from components.mock_llm_server import MockLLMServer
+from components.agent import Agent
+from components import providers
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def synthetic_text(label, words):
+    """Build a deterministic document of roughly `words` words."""
+    vocabulary = ["training", "muscle", "velocity", "adaptation", "protocol", "athlete", "fatigue", "power", "strength", "recovery"]
+    return f"{label}: " + " ".join(vocabulary[i % len(vocabulary)] for i in range(words))
+
+
+def payload_index(args, index):
+    """Map a request index onto one of --distinct payloads, so duplicates can be coalesced."""
+    return index % args.distinct if args.distinct else index
+
+
+def run_execute(agent, args, index):
+    """Run one Execute generation and return its response."""
+    index = payload_index(args, index)
+    inputs = {
+        "prompt": f"Write article #{index} about the uploaded study for coaches.",
+        "context": synthetic_text(f"Study {index}", args.context_words),
+        "compliance": synthetic_text("Compliance", args.compliance_words),
+        "proofread": synthetic_text("Proof-read guide", 300),
+        "model": args.model,
+        "api_key": "mock-key",
+        "chunks": [],
+        "token_limit": providers.get_context_window(args.model)
+    }
+    return agent.generate_draft(inputs)
+
+
+def run_research(agent, args, index):
+    """Run one batched research judgment request over a set of abstracts and return its response."""
+    index = payload_index(args, index)
+    inputs = {
+        "prompt": "Suggest blog posts about new strength training research for coaches.",
+        "compliance": synthetic_text("Areas of interest and scope", args.compliance_words),
+        "model": args.model,
+        "api_key": "mock-key",
+        "temperature": 0.2,
+        "max_tokens": 4000,
+        "token_limit": providers.get_context_window(args.model)
+    }
+    articles = [
+        {"title": f"Article {index}-{item}", "link": f"https://example.org/{index}/{item}", "feed": "Synthetic", "abstract": synthetic_text(f"Abstract {index}-{item}", 200)}
+        for item in range(args.abstracts_per_call)
+    ]
+    batch = agent.research_batcher.plan(inputs, articles)[0]
+    return agent._call_llm_api(agent.research_batcher.prepare_payload(inputs, batch), "mock-key", args.model)
+
+
+def run_scenario(name, job, agent, args):
+    """
+    Run a scenario with a bounded worker pool and collect per-request metrics
+
+    Returns:
+        dict: Scenario report
+    """
+    latencies = []
+    ttfts = []
+    output_tokens = 0
+    input_tokens = 0
+    cached_tokens = 0
+    retries = 0
+    failures = 0
+
+    start = time.perf_counter()
+    # Agent prints a line per step; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = {}
+            for index in range(args.requests):
+                futures[executor.submit(job, agent, args, index)] = time.perf_counter()
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except Exception:
+                    response = None
+                if not response or "usage" not in response:
+                    failures += 1
+                    continue
+                latencies.append(response["latency"]["total_ms"])
+                if response["latency"]["ttft_ms"] is not None:
+                    ttfts.append(response["latency"]["ttft_ms"])
+                retries += response["latency"].get("retries", 0)
+                output_tokens += response["usage"]["output_tokens"]
+                input_tokens += response["usage"]["input_tokens"] + response["usage"]["cached_input_tokens"]
+                cached_tokens += response["usage"]["cached_input_tokens"]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "scenario": name,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "succeeded": len(latencies),
+        "failed": failures,
+        "retries": retries,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "output_tokens_per_s": round(output_tokens / elapsed, 1) if elapsed else None,
+        "cached_input_ratio": round(cached_tokens / input_tokens, 3) if input_tokens else 0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None
+        },
+        "ttft_ms": {
+            "p50": percentile(ttfts, 50),
+            "p90": percentile(ttfts, 90),
+            "p99": percentile(ttfts, 99)
+        }
+    }
+
+
+def print_report(report):
+    """Print a scenario report as a readable block."""
+    print(f"\n=== {report['scenario']} ===")
+    print(f"Requests: {report['succeeded']}/{report['requests']} succeeded, {report['failed']} failed, {report['retries']} retries")
+    print(f"Elapsed: {report['elapsed_s']} s at concurrency {report['concurrency']}")
+    print(f"Throughput: {report['throughput_rps']} req/s, {report['output_tokens_per_s']} output tokens/s")
+    print(f"Cached input ratio: {report['cached_input_ratio']}")
+    latency = report["latency_ms"]
+    print(f"Latency ms: p50={latency['p50']} p90={latency['p90']} p99={latency['p99']} max={latency['max']}")
+    ttft = report["ttft_ms"]
+    if ttft["p50"] is not None:
+        print(f"Time to first token ms: p50={ttft['p50']} p90={ttft['p90']} p99={ttft['p99']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Cogito pipelines against the mock LLM server")
+    parser.add_argument("--scenario", choices=["execute", "research", "all"], default="all")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model", default="GPT-4o")
+    parser.add_argument("--context-words", type=int, default=3000)
+    parser.add_argument("--compliance-words", type=int, default=1500)
+    parser.add_argument("--abstracts-per-call", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--tokens-per-second", type=int, default=200)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rpm", type=int, default=None)
+    parser.add_argument("--distinct", type=int, default=None, help="Number of distinct payloads (repeats are coalesced while in flight)")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rpm=args.rate_limit_rpm,
+        seed=0
+    )
+    scenarios = {"execute": run_execute, "research": run_research}
+    selected = list(scenarios) if args.scenario == "all" else [args.scenario]
+
+    reports = []
+    with server:
+        agent = Agent(None)
+        for name in selected:
+            reports.append(run_scenario(name, scenarios[name], agent, args))
+
+    if args.json:
+        print(json.dumps({"reports": reports, "server": server.stats, "llm_calls": agent.get_llm_call_stats()}, indent=2))
+    else:
+        for report in reports:
+            print_report(report)
+        print(f"\nMock server: {server.stats}")
+        print(f"LLM calls: {agent.get_llm_call_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +0,0 @@
-# Logs package 
\ No newline at end of file
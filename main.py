@@ -1,5 +1,6 @@
+import os
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QSplitter, QWidget, QVBoxLayout, QLabel, QStackedWidget, QHBoxLayout, QCheckBox
+from PySide6.QtWidgets import QApplication, QMainWindow, QSplitter, QWidget, QVBoxLayout, QLabel, QStackedWidget, QHBoxLayout, QCheckBox, QSystemTrayIcon, QMenu, QStyle
 from PySide6.QtCore import Qt
 from components.menu_widget import MenuWidget
 from components.execute_workspace import ExecuteWorkspace
@@ -49,25 +50,88 @@ class MainWindow(QMainWindow):
         # Initialize Agent with ActionWidget instance
         self.agent = Agent(self.action_widget)
         
+        # Serve the Prometheus metrics endpoint when a port is configured
+        if os.environ.get("COGITO_METRICS_PORT"):
+            self.agent.telemetry.serve_metrics(int(os.environ["COGITO_METRICS_PORT"]))
+
         # Set agent reference in workspaces
         self.execute_workspace.set_agent(self.agent)
         self.research_workspace.set_agent(self.agent)
         
         self.connect_signals()
+        self.setup_tray()
         self.set_mode("execute")
 
     def connect_signals(self):
         # Connect menu buttons to set_mode
         self.menu_widget.execute_clicked.connect(lambda: self.set_mode("execute"))
         self.menu_widget.ongoing_research_clicked.connect(lambda: self.set_mode("ongoing_research"))
+        self.menu_widget.debug_checkbox.toggled.connect(self.agent.set_debug_mode)
+        self.menu_widget.profiling_checkbox.toggled.connect(self.agent.set_profiling_mode)
+
+    def setup_tray(self):
+        """Tray icon that keeps Cogito reachable, and notifying, while background research runs minimized"""
+        self.tray_icon = None
+        self.action_widget.notification_requested.connect(self.show_notification)
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+
+        self.tray_icon = QSystemTrayIcon(self.style().standardIcon(QStyle.SP_FileDialogInfoView), self)
+        self.tray_icon.setToolTip("Cogito")
+        tray_menu = QMenu(self)
+        tray_menu.addAction("Show Cogito", self.show_from_tray)
+        tray_menu.addAction("Research Now", self.research_now)
+        tray_menu.addSeparator()
+        tray_menu.addAction("Quit", self.quit_app)
+        self.tray_icon.setContextMenu(tray_menu)
+        self.tray_icon.activated.connect(lambda reason: self.show_from_tray() if reason == QSystemTrayIcon.Trigger else None)
+        self.tray_icon.messageClicked.connect(self.show_from_tray)
+        self.tray_icon.show()
+
+    def show_notification(self, title, message):
+        """Show a desktop notification through the tray, or flash the taskbar entry without one"""
+        if self.tray_icon:
+            self.tray_icon.showMessage(title, message, QSystemTrayIcon.Information, 10000)
+        else:
+            QApplication.alert(self)
+
+    def show_from_tray(self):
+        """Bring the window back from the tray"""
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def research_now(self):
+        """Run the background schedule immediately, or a regular research run when it is off"""
+        if self.agent.research_scheduler.is_running:
+            self.agent.research_scheduler.run_now()
+        else:
+            self.agent.handle_research(self.research_workspace)
+
+    def quit_app(self):
+        """Stop background research and quit"""
+        self.agent.research_scheduler.stop()
+        QApplication.quit()
+
+    def closeEvent(self, event):
+        # While background research is on, closing the window minimizes to the tray
+        if self.tray_icon and self.agent.research_scheduler.is_running:
+            event.ignore()
+            self.hide()
+            self.tray_icon.showMessage("Cogito", "Research continues in the background. Use the tray icon to reopen or quit.", QSystemTrayIcon.Information, 5000)
+            return
+        self.agent.research_scheduler.stop()
+        event.accept()
 
     def set_mode(self, mode):
         if mode == "execute":
             self.workspace_stack.setCurrentWidget(self.execute_workspace)
             self.action_widget.setVisible(True)
+            self.agent.set_active_workspace("execute")
         elif mode == "ongoing_research":
             self.workspace_stack.setCurrentWidget(self.research_workspace)
             self.action_widget.setVisible(True)  # Make action widget visible for ongoing research
+            self.agent.set_active_workspace("research")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)